@@ -0,0 +1,399 @@
+"""
+Batched Audio Augmentation
+==========================
+Fast replacement for the per-file ``augment_audio`` loop of
+Formative_2_audio.ipynb, which calls ``librosa.effects.pitch_shift`` on each
+clip and writes the result to data/augmented/.
+
+Produces the same two variants per clip:
+1. ``<name>_pitch`` - pitch shifted by ``n_steps`` semitones
+   (phase-vocoder time stretch followed by resampling, as in librosa)
+2. ``<name>_noise`` - additive Gaussian noise (0.005 * N(0, 1))
+
+Speedups over the per-file loop:
+- Clips of similar length are bucketed, zero-padded and processed as one
+  batch, so the STFT, phase vocoder and inverse STFT are vectorized over the
+  whole bucket (the phase vocoder is also vectorized over time).
+- Hann windows, inverse-STFT window envelopes and polyphase resampling
+  filters are computed once and reused across clips.
+- Buckets are distributed over a process pool.
+- Noise is drawn from a generator seeded by (seed, clip name), so results do
+  not depend on batching, ordering or worker count.
+
+Usage:
+    python audio_augmentation.py --input-dir data/audio --output-dir data/augmented
+    python audio_augmentation.py --benchmark --clips 64
+"""
+
+import os
+import time
+import zlib
+import logging
+import argparse
+import tempfile
+from fractions import Fraction
+from functools import lru_cache
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import signal
+
+logger = logging.getLogger(__name__)
+
+N_FFT = 2048
+HOP_LENGTH = N_FFT // 4
+
+
+@lru_cache(maxsize=8)
+def _hann_window(n_fft: int) -> np.ndarray:
+    """Periodic Hann window, as used by librosa's STFT."""
+    return signal.get_window('hann', n_fft, fftbins=True).astype(np.float32)
+
+
+@lru_cache(maxsize=32)
+def _istft_envelope(n_frames: int, n_fft: int, hop_length: int) -> np.ndarray:
+    """Overlap-added squared window, used to normalize the inverse STFT."""
+    window_sq = _hann_window(n_fft).astype(np.float64) ** 2
+    envelope = np.zeros(n_fft + hop_length * (n_frames - 1))
+    for t in range(n_frames):
+        envelope[t * hop_length:t * hop_length + n_fft] += window_sq
+    return envelope
+
+
+@lru_cache(maxsize=16)
+def resample_filter(up: int, down: int) -> np.ndarray:
+    """Anti-aliasing FIR filter for polyphase resampling by ``up / down``."""
+    max_rate = max(up, down)
+    return signal.firwin(2 * 10 * max_rate + 1, 1.0 / max_rate, window=('kaiser', 5.0))
+
+
+def _stft(batch: np.ndarray, n_fft: int = N_FFT, hop_length: int = HOP_LENGTH) -> np.ndarray:
+    """Centered STFT of a batch of equal-length clips (B x L -> B x bins x frames)."""
+    padded = np.pad(batch, ((0, 0), (n_fft // 2, n_fft // 2)))
+    frames = np.lib.stride_tricks.sliding_window_view(padded, n_fft, axis=-1)[:, ::hop_length]
+    return np.fft.rfft(frames * _hann_window(n_fft), axis=-1).transpose(0, 2, 1)
+
+
+def _istft(stft: np.ndarray, length: int, n_fft: int = N_FFT,
+           hop_length: int = HOP_LENGTH) -> np.ndarray:
+    """Inverse of ``_stft`` by windowed overlap-add (B x bins x frames -> B x length)."""
+    n_batch, _, n_frames = stft.shape
+    frames = np.fft.irfft(stft.transpose(0, 2, 1), n=n_fft, axis=-1) * _hann_window(n_fft)
+
+    out = np.zeros((n_batch, n_fft + hop_length * (n_frames - 1)))
+    # n_fft is a multiple of the hop, so overlap-add is n_fft / hop shifted block sums
+    for k in range(n_fft // hop_length):
+        block = frames[:, :, k * hop_length:(k + 1) * hop_length].reshape(n_batch, -1)
+        out[:, k * hop_length:k * hop_length + block.shape[1]] += block
+
+    envelope = _istft_envelope(n_frames, n_fft, hop_length)
+    nonzero = envelope > np.finfo(np.float32).tiny
+    out[:, nonzero] /= envelope[nonzero]
+
+    out = out[:, n_fft // 2:]
+    if out.shape[1] < length:
+        out = np.pad(out, ((0, 0), (0, length - out.shape[1])))
+    return out[:, :length]
+
+
+def _phase_vocoder(stft: np.ndarray, rate: float, hop_length: int = HOP_LENGTH) -> np.ndarray:
+    """
+    Time-stretch an STFT by ``rate`` (librosa's phase vocoder, vectorized over time).
+
+    The phase accumulator is a running sum of per-step phase advances, so it
+    is computed with one cumulative sum instead of a Python loop over frames.
+    """
+    n_bins = stft.shape[1]
+    steps = np.arange(0, stft.shape[-1], rate)
+    phi_advance = np.linspace(0, np.pi * hop_length, n_bins)[:, None]
+
+    padded = np.pad(stft, ((0, 0), (0, 0), (0, 2)))
+    left = padded[..., steps.astype(int)]
+    right = padded[..., steps.astype(int) + 1]
+    alpha = np.mod(steps, 1.0)
+    mag = (1.0 - alpha) * np.abs(left) + alpha * np.abs(right)
+
+    dphase = np.angle(right) - np.angle(left) - phi_advance
+    dphase -= 2.0 * np.pi * np.round(dphase / (2.0 * np.pi))
+    advance = phi_advance + dphase
+    phase = np.angle(stft[..., :1]) + np.concatenate(
+        [np.zeros_like(advance[..., :1]), np.cumsum(advance[..., :-1], axis=-1)], axis=-1
+    )
+    return mag * np.exp(1j * phase)
+
+
+def pitch_shift_batch(batch: np.ndarray, sr: int, n_steps: float = 2) -> np.ndarray:
+    """
+    Pitch-shift a batch of equal-length clips.
+
+    Args:
+        batch: float array (B x L)
+        sr: Sample rate
+        n_steps: Shift in semitones
+
+    Returns:
+        Pitch-shifted batch with the input length and dtype
+    """
+    length = batch.shape[-1]
+    rate = 2.0 ** (-float(n_steps) / 12)
+
+    stretched = _istft(_phase_vocoder(_stft(batch), rate), int(round(length / rate)))
+
+    # Resample from sr / rate to sr with a cached rational polyphase filter
+    ratio = Fraction(rate).limit_denominator(1000)
+    up, down = ratio.numerator, ratio.denominator
+    shifted = signal.resample_poly(stretched, up, down, axis=-1,
+                                   window=resample_filter(up, down))
+
+    if shifted.shape[-1] < length:
+        shifted = np.pad(shifted, ((0, 0), (0, length - shifted.shape[-1])))
+    return shifted[:, :length].astype(batch.dtype)
+
+
+def add_noise(y: np.ndarray, name: str, seed: int = 42, scale: float = 0.005) -> np.ndarray:
+    """
+    Add Gaussian noise with a generator seeded by (seed, clip name).
+
+    Args:
+        y: Audio clip
+        name: Stable clip identifier
+        seed: Base random seed
+        scale: Noise standard deviation
+
+    Returns:
+        Noisy clip
+    """
+    rng = np.random.default_rng((seed, zlib.crc32(name.encode())))
+    return (y + scale * rng.standard_normal(len(y))).astype(y.dtype)
+
+
+def bucket_clips(lengths: Dict[str, int], tolerance: float = 0.1,
+                 max_batch: int = 32) -> List[List[str]]:
+    """
+    Group clips whose lengths are within ``tolerance`` of the bucket's shortest clip.
+
+    Args:
+        lengths: Clip name -> number of samples
+        tolerance: Maximum relative padding per bucket
+        max_batch: Maximum clips per bucket
+
+    Returns:
+        List of buckets (lists of clip names)
+    """
+    buckets, current, base = [], [], None
+    for name in sorted(lengths, key=lengths.get):
+        if current and (lengths[name] > base * (1 + tolerance) or len(current) >= max_batch):
+            buckets.append(current)
+            current = []
+        if not current:
+            base = lengths[name]
+        current.append(name)
+    if current:
+        buckets.append(current)
+    return buckets
+
+
+def _augment_bucket(clips: Dict[str, np.ndarray], sr: int, n_steps: float,
+                    seed: int, noise_scale: float) -> Dict[str, np.ndarray]:
+    """Pitch-shift and add noise to one bucket of same-rate clips."""
+    names = list(clips)
+    max_len = max(len(clips[n]) for n in names)
+    batch = np.zeros((len(names), max_len), dtype=np.float32)
+    for i, name in enumerate(names):
+        batch[i, :len(clips[name])] = clips[name]
+
+    shifted = pitch_shift_batch(batch, sr, n_steps)
+
+    out = {}
+    for i, name in enumerate(names):
+        y = clips[name]
+        out[f"{name}_pitch"] = shifted[i, :len(y)]
+        out[f"{name}_noise"] = add_noise(y, name, seed, noise_scale)
+    return out
+
+
+class AudioAugmenter:
+    """Produces the notebook's ``_pitch`` and ``_noise`` variants in batches."""
+
+    def __init__(self, n_steps: float = 2, noise_scale: float = 0.005, seed: int = 42,
+                 num_workers: Optional[int] = None, bucket_tolerance: float = 0.1,
+                 max_batch: int = 32):
+        """
+        Initialize the augmenter.
+
+        Args:
+            n_steps: Pitch shift in semitones
+            noise_scale: Standard deviation of the additive noise
+            seed: Base random seed for the noise variant
+            num_workers: Worker processes (default: number of CPUs; 1 runs inline)
+            bucket_tolerance: Maximum relative zero-padding within a bucket
+            max_batch: Maximum clips per bucket
+        """
+        self.n_steps = n_steps
+        self.noise_scale = noise_scale
+        self.seed = seed
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.bucket_tolerance = bucket_tolerance
+        self.max_batch = max_batch
+
+    def augment(self, clips: Dict[str, Tuple[np.ndarray, int]]) -> Dict[str, Tuple[np.ndarray, int]]:
+        """
+        Augment a collection of clips.
+
+        Args:
+            clips: Clip name (file stem) -> (samples, sample rate)
+
+        Returns:
+            Variant name ('<name>_pitch' / '<name>_noise') -> (samples, sample rate)
+        """
+        jobs = []
+        for sr in sorted({sr for _, sr in clips.values()}):
+            same_rate = {name: y for name, (y, rate) in clips.items() if rate == sr}
+            lengths = {name: len(y) for name, y in same_rate.items()}
+            for bucket in bucket_clips(lengths, self.bucket_tolerance, self.max_batch):
+                jobs.append(({name: same_rate[name] for name in bucket}, sr))
+
+        args = [(bucket, sr, self.n_steps, self.seed, self.noise_scale) for bucket, sr in jobs]
+        if self.num_workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=self.num_workers) as pool:
+                results = list(pool.map(_augment_bucket, *zip(*args)))
+        else:
+            results = [_augment_bucket(*a) for a in args]
+
+        augmented = {}
+        for (_, sr), result in zip(jobs, results):
+            augmented.update({name: (y, sr) for name, y in result.items()})
+        return augmented
+
+
+def load_clips(input_dir: str) -> Dict[str, Tuple[np.ndarray, int]]:
+    """
+    Load every WAV file in a directory.
+
+    Args:
+        input_dir: Directory of audio files
+
+    Returns:
+        File stem -> (float32 samples, sample rate)
+    """
+    import soundfile as sf
+
+    clips = {}
+    for path in sorted(Path(input_dir).glob('*.wav')):
+        y, sr = sf.read(path, dtype='float32', always_2d=True)
+        clips[path.stem] = (y.mean(axis=1), sr)
+    return clips
+
+
+def synthetic_clips(n_clips: int, sr: int = 22050, seconds: float = 3.0,
+                    seed: int = 0) -> Dict[str, Tuple[np.ndarray, int]]:
+    """
+    Generate harmonic test clips with lengths varying by up to +/-20%.
+
+    Args:
+        n_clips: Number of clips
+        sr: Sample rate
+        seconds: Mean clip duration
+        seed: Random seed
+
+    Returns:
+        Clip name -> (float32 samples, sample rate)
+    """
+    rng = np.random.default_rng(seed)
+    clips = {}
+    for i in range(n_clips):
+        n = int(sr * seconds * rng.uniform(0.8, 1.2))
+        t = np.arange(n) / sr
+        f0 = rng.uniform(100, 300)
+        y = sum(np.sin(2 * np.pi * f0 * h * t) / h for h in range(1, 6))
+        clips[f"speaker{i % 4 + 1}_clip{i}"] = ((0.1 * y).astype(np.float32), sr)
+    return clips
+
+
+def benchmark(clips: Dict[str, Tuple[np.ndarray, int]],
+              num_workers: Optional[int] = None) -> Dict:
+    """
+    Compare clips/sec of the batched augmenter with the notebook's per-file loop.
+
+    The baseline mirrors ``augment_audio``: ``librosa.effects.pitch_shift``
+    plus noise per clip, each written with ``sf.write``. It is skipped if
+    librosa is not installed.
+
+    Args:
+        clips: Clips to augment
+        num_workers: Worker processes for the batched augmenter
+
+    Returns:
+        Dictionary with clips/sec per implementation
+    """
+    results = {'clips': len(clips)}
+
+    start = time.perf_counter()
+    AudioAugmenter(num_workers=num_workers).augment(clips)
+    elapsed = time.perf_counter() - start
+    results['batched_clips_per_sec'] = len(clips) / elapsed
+    logger.info(f"  batched : {elapsed:.2f}s ({results['batched_clips_per_sec']:.1f} clips/s)")
+
+    try:
+        import librosa
+        import soundfile as sf
+    except ImportError:
+        logger.warning("librosa not installed; skipping per-file baseline")
+        return results
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        for name, (y, sr) in clips.items():
+            y_pitch = librosa.effects.pitch_shift(y=y, sr=sr, n_steps=2)
+            sf.write(f"{tmp}/{name}_pitch.wav", y_pitch, sr)
+            y_noise = y + 0.005 * np.random.randn(len(y))
+            sf.write(f"{tmp}/{name}_noise.wav", y_noise, sr)
+        elapsed = time.perf_counter() - start
+    results['per_file_clips_per_sec'] = len(clips) / elapsed
+    logger.info(f"  per-file: {elapsed:.2f}s ({results['per_file_clips_per_sec']:.1f} clips/s)")
+    return results
+
+
+def main():
+    """Main execution function."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser(description='Batched audio augmentation')
+    parser.add_argument('--input-dir', type=str, default='data/audio',
+                        help='Directory of source WAV files')
+    parser.add_argument('--output-dir', type=str, default='data/augmented',
+                        help='Directory to write augmented WAV files')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: number of CPUs)')
+    parser.add_argument('--seed', type=int, default=42,
+                        help='Random seed for the noise variant')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Benchmark against the per-file librosa loop')
+    parser.add_argument('--clips', type=int, default=64,
+                        help='Number of synthetic clips for --benchmark')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        logger.info(f"Benchmarking pitch/noise augmentation on {args.clips} synthetic clips")
+        benchmark(synthetic_clips(args.clips), args.workers)
+        return
+
+    import soundfile as sf
+
+    augmenter = AudioAugmenter(seed=args.seed, num_workers=args.workers)
+    augmented = augmenter.augment(load_clips(args.input_dir))
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for name, (y, sr) in augmented.items():
+        sf.write(output_dir / f"{name}.wav", y, sr)
+    logger.info(f"✓ Wrote {len(augmented)} augmented files to {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Audio Store
+===========
+Shared, decode-once access to the voice pipeline's audio files.
+
+Formative_2_audio.ipynb calls ``librosa.load(filepath, sr=None)`` separately
+in ``visualize_audio``, ``augment_audio`` and ``extract_features``, fully
+decoding every WAV three times. ``AudioStore.load`` replaces those calls:
+
+1. PCM/float WAV data is memory-mapped straight from the file (RIFF header
+   parsed here); other formats fall back to ``soundfile``.
+2. The signal is mixed to mono, converted to float32 and resampled once to a
+   canonical rate with a cached polyphase filter.
+3. The result is cached in memory (LRU) and as a .npy file in the cache
+   directory, which later loads - including from other processes or
+   notebook sessions - memory-map instead of decoding again.
+
+Cache entries are keyed by path, size, modification time and target rate,
+so editing a file invalidates its entry.
+
+Usage:
+    store = AudioStore(target_sr=22050)
+    y, sr = store.load("data/audio/member1_hello.wav")
+"""
+
+import os
+import struct
+import hashlib
+import logging
+from math import gcd
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from cache_utils import LRUCache
+
+logger = logging.getLogger(__name__)
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# (format, bits per sample) -> (on-disk dtype, scale to [-1, 1], offset)
+_WAV_DTYPES = {
+    (WAVE_FORMAT_PCM, 8): ('u1', 1 / 128.0, -128),
+    (WAVE_FORMAT_PCM, 16): ('<i2', 1 / 32768.0, 0),
+    (WAVE_FORMAT_PCM, 32): ('<i4', 1 / 2147483648.0, 0),
+    (WAVE_FORMAT_IEEE_FLOAT, 32): ('<f4', 1.0, 0),
+    (WAVE_FORMAT_IEEE_FLOAT, 64): ('<f8', 1.0, 0),
+}
+
+
+def memmap_wav(path: str) -> Optional[Tuple[np.memmap, int, float, int]]:
+    """
+    Memory-map the sample data of a WAV file without decoding it.
+
+    Args:
+        path: WAV file path
+
+    Returns:
+        Tuple of (frames x channels memmap, sample rate, scale, offset), or
+        None if the file is not a memory-mappable PCM/float WAV
+    """
+    with open(path, 'rb') as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+            return None
+
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                return None
+            chunk_id, chunk_size = struct.unpack('<4sI', chunk)
+            if chunk_id == b'fmt ':
+                body = f.read(chunk_size)
+                format_tag, channels, sample_rate = struct.unpack('<HHI', body[:8])
+                bits = struct.unpack('<H', body[14:16])[0]
+                if format_tag == WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                    format_tag = struct.unpack('<H', body[24:26])[0]
+                fmt = (format_tag, channels, sample_rate, bits)
+            elif chunk_id == b'data':
+                if fmt is None:
+                    return None
+                data_offset = f.tell()
+                break
+            else:
+                f.seek(chunk_size, os.SEEK_CUR)
+            if chunk_size % 2:
+                f.seek(1, os.SEEK_CUR)
+
+    format_tag, channels, sample_rate, bits = fmt
+    spec = _WAV_DTYPES.get((format_tag, bits))
+    if spec is None:
+        return None
+
+    dtype, scale, offset = spec
+    frame_bytes = np.dtype(dtype).itemsize * channels
+    n_frames = min(chunk_size, os.path.getsize(path) - data_offset) // frame_bytes
+    data = np.memmap(path, dtype=dtype, mode='r', offset=data_offset,
+                     shape=(n_frames, channels))
+    return data, sample_rate, scale, offset
+
+
+def resample(y: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+    """
+    Resample a signal with a cached polyphase anti-aliasing filter.
+
+    Args:
+        y: Input signal
+        orig_sr: Source sample rate
+        target_sr: Target sample rate
+
+    Returns:
+        Resampled float32 signal
+    """
+    if orig_sr == target_sr:
+        return y
+    from scipy import signal
+    from audio_augmentation import resample_filter
+
+    divisor = gcd(int(orig_sr), int(target_sr))
+    up, down = int(target_sr) // divisor, int(orig_sr) // divisor
+    return signal.resample_poly(y, up, down, window=resample_filter(up, down)).astype(np.float32)
+
+
+class AudioStore:
+    """Decode-once audio loader with memory and on-disk caches."""
+
+    def __init__(self, target_sr: Optional[int] = 22050,
+                 cache_dir: str = "data/.audio_cache", cache_size: int = 64):
+        """
+        Initialize the audio store.
+
+        Args:
+            target_sr: Canonical sample rate, or None to keep each file's native rate
+            cache_dir: Directory for decoded .npy buffers (None disables it)
+            cache_size: Number of decoded clips kept in memory
+        """
+        self.target_sr = target_sr
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.cache = LRUCache(maxsize=cache_size)
+        self.decodes = 0
+
+    def _cache_key(self, path: Path) -> str:
+        stat = path.stat()
+        ident = f"{path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}|{self.target_sr}"
+        return hashlib.sha256(ident.encode()).hexdigest()[:24]
+
+    def _decode(self, path: Path) -> Tuple[np.ndarray, int]:
+        """Decode a file to mono float32 at the canonical rate."""
+        mapped = memmap_wav(str(path))
+        if mapped is not None:
+            data, sr, scale, offset = mapped
+            if data.shape[1] == 1:
+                y = data[:, 0].astype(np.float32)
+            else:
+                y = data.mean(axis=1, dtype=np.float32)
+            if offset:
+                y += offset
+            y *= scale
+        else:
+            import soundfile as sf
+            samples, sr = sf.read(str(path), dtype='float32', always_2d=True)
+            y = samples.mean(axis=1)
+
+        self.decodes += 1
+        if self.target_sr is not None and sr != self.target_sr:
+            y, sr = resample(y, sr, self.target_sr), self.target_sr
+        return y, sr
+
+    def load(self, filepath: str) -> Tuple[np.ndarray, int]:
+        """
+        Load a clip as mono float32 at the canonical rate.
+
+        The returned array is shared between callers and must not be modified
+        in place (it is read-only when served from the on-disk cache).
+
+        Args:
+            filepath: Audio file path
+
+        Returns:
+            Tuple of (samples, sample rate), like ``librosa.load``
+        """
+        path = Path(filepath)
+        key = self._cache_key(path)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        entry = None
+        if self.cache_dir is not None:
+            npy_path = self.cache_dir / f"{key}.npy"
+            sr_path = self.cache_dir / f"{key}.sr"
+            if npy_path.exists() and sr_path.exists():
+                entry = (np.load(npy_path, mmap_mode='r'), int(sr_path.read_text()))
+
+        if entry is None:
+            y, sr = self._decode(path)
+            if self.cache_dir is not None:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                # Publish atomically so concurrent readers never map a partial file
+                sr_path.write_text(str(sr))
+                tmp_path = self.cache_dir / f"{key}.{os.getpid()}.tmp.npy"
+                np.save(tmp_path, y)
+                os.replace(tmp_path, npy_path)
+                y = np.load(npy_path, mmap_mode='r')
+            entry = (y, sr)
+
+        self.cache.put(key, entry)
+        return entry
@@ -0,0 +1,328 @@
+"""
+On-the-fly Augmentation Engine
+==============================
+Generates augmented training samples lazily, one batch at a time, instead of
+materializing every augmented copy up front (face notebook) or writing them
+to disk (audio notebook).
+
+Each transform works on a whole uint8 batch of shape N x H x W x C with
+vectorized NumPy kernels (no GPU required), reproducing the eight
+augmentations of ``augment_image`` in complete_facial_recognition.ipynb:
+original, rotated_15, rotated_-15, flipped, grayscale, brightness_up,
+brightness_down and blurred. Per-shape state such as rotation sampling grids
+and brightness lookup tables is computed once and reused across batches.
+
+Audio clips (N x L float batches) get the audio notebook's variants from
+``audio_augmentations``: original, pitch (shifted by two semitones with
+audio_augmentation.pitch_shift_batch) and noise. ``pad_clips`` zero-pads
+variable-length clips into one array. The loader then groups clips of
+similar length into each batch and trims the batch to its longest clip.
+
+``AugmentedBatchLoader`` pairs each batch of source samples with one
+augmentation and builds upcoming batches on a prefetching worker pool, so
+throughput scales with cores while disk usage stays flat.
+
+Usage:
+    images = stack_images([row['image'] for _, row in df_images.iterrows()])
+    loader = AugmentedBatchLoader(images, labels, batch_size=32)
+    for batch, batch_labels, augmentation in loader:
+        ...
+
+    clips, lengths = pad_clips([y for y, _ in audio_clips])
+    loader = AugmentedBatchLoader(clips, labels, transforms=audio_augmentations(sr),
+                                  lengths=lengths)
+"""
+
+import os
+import zlib
+import logging
+from functools import lru_cache
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BatchTransform = Callable[[np.ndarray], np.ndarray]
+
+
+@lru_cache(maxsize=32)
+def _rotation_grid(height: int, width: int, channels: int, angle: float):
+    """
+    Precompute bilinear sampling indices and weights for a rotation.
+
+    Matches ``cv2.warpAffine(img, cv2.getRotationMatrix2D((w//2, h//2), angle, 1.0), (w, h))``
+    with a constant black border. Indices address the flattened H*W*C image so
+    each corner is a single contiguous ``np.take`` per batch.
+
+    Returns:
+        Tuple of (4 x H*W*C flat source indices, 4 x H*W*C float32 weights)
+    """
+    cx, cy = width // 2, height // 2
+    a, b = np.cos(np.deg2rad(angle)), np.sin(np.deg2rad(angle))
+    forward = np.array([[a, b, (1 - a) * cx - b * cy],
+                        [-b, a, b * cx + (1 - a) * cy],
+                        [0.0, 0.0, 1.0]])
+    inverse = np.linalg.inv(forward)
+
+    ys, xs = np.mgrid[0:height, 0:width]
+    src_x = inverse[0, 0] * xs + inverse[0, 1] * ys + inverse[0, 2]
+    src_y = inverse[1, 0] * xs + inverse[1, 1] * ys + inverse[1, 2]
+    x0 = np.floor(src_x).astype(np.int64)
+    y0 = np.floor(src_y).astype(np.int64)
+    fx = (src_x - x0).astype(np.float32)
+    fy = (src_y - y0).astype(np.float32)
+
+    indices, weights = [], []
+    for dy, dx, weight in ((0, 0, (1 - fy) * (1 - fx)), (0, 1, (1 - fy) * fx),
+                           (1, 0, fy * (1 - fx)), (1, 1, fy * fx)):
+        y, x = y0 + dy, x0 + dx
+        inside = (y >= 0) & (y < height) & (x >= 0) & (x < width)
+        pixel = np.clip(y, 0, height - 1) * width + np.clip(x, 0, width - 1)
+        indices.append((pixel[..., None] * channels + np.arange(channels)).ravel())
+        weights.append(np.repeat(np.where(inside, weight, 0).ravel(), channels))
+    return np.stack(indices), np.stack(weights).astype(np.float32)
+
+
+@lru_cache(maxsize=32)
+def _scale_abs_lut(alpha: float, beta: float) -> np.ndarray:
+    """Lookup table equivalent to ``cv2.convertScaleAbs(img, alpha=alpha, beta=beta)``."""
+    values = np.abs(np.arange(256, dtype=np.float64) * alpha + beta)
+    return np.clip(np.rint(values), 0, 255).astype(np.uint8)
+
+
+def rotate_batch(batch: np.ndarray, angle: float) -> np.ndarray:
+    """
+    Rotate every image in a batch about its center.
+
+    Args:
+        batch: uint8 array (N x H x W x C)
+        angle: Rotation in degrees (positive is counter-clockwise)
+
+    Returns:
+        Rotated batch
+    """
+    n, height, width, channels = batch.shape
+    indices, weights = _rotation_grid(height, width, channels, float(angle))
+    flat = batch.reshape(n, -1)
+
+    out = np.zeros(flat.shape, dtype=np.float32)
+    for idx, weight in zip(indices, weights):
+        out += np.take(flat, idx, axis=1) * weight
+    return np.clip(np.rint(out), 0, 255).astype(np.uint8).reshape(batch.shape)
+
+
+def flip_batch(batch: np.ndarray) -> np.ndarray:
+    """Mirror every image in a batch horizontally."""
+    return np.ascontiguousarray(batch[:, :, ::-1])
+
+
+def grayscale_batch(batch: np.ndarray) -> np.ndarray:
+    """Convert RGB images to grayscale replicated over three channels."""
+    # Fixed-point BT.601 weights, as used by cv2.COLOR_RGB2GRAY
+    rgb = batch.astype(np.uint32)
+    gray = ((rgb[..., 0] * 4899 + rgb[..., 1] * 9617 + rgb[..., 2] * 1868 + 8192) >> 14)
+    return np.repeat(gray.astype(np.uint8)[..., None], 3, axis=-1)
+
+
+def scale_abs_batch(batch: np.ndarray, alpha: float, beta: float) -> np.ndarray:
+    """Apply ``|alpha * x + beta|`` with saturation through a cached lookup table."""
+    return _scale_abs_lut(float(alpha), float(beta))[batch]
+
+
+def gaussian_blur_batch(batch: np.ndarray) -> np.ndarray:
+    """
+    Apply a 5x5 Gaussian blur (sigma derived from the kernel size).
+
+    Equivalent to ``cv2.GaussianBlur(img, (5, 5), 0)``: the separable
+    [1, 4, 6, 4, 1] / 16 kernel with reflect-101 borders, in integer arithmetic.
+    """
+    kernel = (1, 4, 6, 4, 1)
+    height, width = batch.shape[1:3]
+    # Both passes fit in uint16: 255 * 16 * 16 + 128 < 2**16
+    padded = np.pad(batch, ((0, 0), (2, 2), (2, 2), (0, 0)), mode='reflect').astype(np.uint16)
+
+    horizontal = sum(k * padded[:, :, i:i + width] for i, k in enumerate(kernel))
+    vertical = sum(k * horizontal[:, i:i + height] for i, k in enumerate(kernel))
+    return ((vertical + 128) >> 8).astype(np.uint8)
+
+
+# Augmentations of the face notebook, in the same order and naming
+IMAGE_AUGMENTATIONS: Dict[str, BatchTransform] = {
+    'original': lambda batch: batch,
+    'rotated_15': lambda batch: rotate_batch(batch, 15),
+    'rotated_-15': lambda batch: rotate_batch(batch, -15),
+    'flipped': flip_batch,
+    'grayscale': grayscale_batch,
+    'brightness_up': lambda batch: scale_abs_batch(batch, 1.2, 30),
+    'brightness_down': lambda batch: scale_abs_batch(batch, 0.8, -30),
+    'blurred': gaussian_blur_batch,
+}
+
+
+def audio_augmentations(sr: int, n_steps: float = 2, noise_scale: float = 0.005,
+                        seed: int = 42) -> Dict[str, BatchTransform]:
+    """
+    Augmentations of the audio notebook as batch transforms.
+
+    Args:
+        sr: Sample rate of the clips
+        n_steps: Pitch shift in semitones
+        noise_scale: Standard deviation of the additive noise
+        seed: Base random seed of the noise
+
+    Returns:
+        Named transforms over float batches (N x L)
+    """
+    from audio_augmentation import pitch_shift_batch
+
+    def noise(batch: np.ndarray) -> np.ndarray:
+        # Seeded by content, so noise does not depend on batch order or threads
+        rng = np.random.default_rng((seed, zlib.crc32(np.ascontiguousarray(batch).tobytes())))
+        return (batch + noise_scale * rng.standard_normal(batch.shape)).astype(batch.dtype)
+
+    return {
+        'original': lambda batch: batch,
+        'pitch': lambda batch: pitch_shift_batch(batch, sr, n_steps),
+        'noise': noise,
+    }
+
+
+def pad_clips(clips: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Zero-pad variable-length clips into one batch array.
+
+    Args:
+        clips: Mono clips
+
+    Returns:
+        Tuple of (float32 array N x max length, per-clip lengths)
+    """
+    lengths = np.array([len(y) for y in clips])
+    batch = np.zeros((len(clips), lengths.max(initial=0)), dtype=np.float32)
+    for i, y in enumerate(clips):
+        batch[i, :len(y)] = y
+    return batch, lengths
+
+
+def stack_images(images: Sequence[np.ndarray],
+                 size: Tuple[int, int] = (128, 128)) -> np.ndarray:
+    """
+    Resize images to a common size and stack them into one batch array.
+
+    Args:
+        images: RGB images of arbitrary sizes
+        size: Target (width, height), matching the feature extractor's resize
+
+    Returns:
+        uint8 array (N x H x W x 3)
+    """
+    import cv2
+
+    return np.stack([cv2.resize(img, size) for img in images])
+
+
+class AugmentedBatchLoader:
+    """
+    Batched data loader that augments samples on demand.
+
+    The virtual dataset is every (image, augmentation) pair. Each batch
+    combines up to ``batch_size`` source images with a single augmentation so
+    the transform runs once over the whole batch. The order of batches is
+    shuffled per epoch with a deterministic seed, and up to ``prefetch``
+    batches are built ahead of the consumer by ``num_workers`` threads
+    (NumPy releases the GIL inside the kernels).
+
+    For padded variable-length samples (``lengths``), batches are bucketed by
+    length, trimmed to their longest sample and zeroed past each sample's end
+    after the transform.
+    """
+
+    def __init__(self, images: np.ndarray, labels: Optional[Sequence] = None,
+                 batch_size: int = 32,
+                 transforms: Optional[Dict[str, BatchTransform]] = None,
+                 shuffle: bool = True, seed: int = 42,
+                 num_workers: Optional[int] = None, prefetch: int = 4,
+                 lengths: Optional[Sequence[int]] = None):
+        """
+        Initialize the loader.
+
+        Args:
+            images: Source samples stacked along the first axis
+            labels: Optional per-sample labels
+            batch_size: Maximum number of samples per batch
+            transforms: Named batch transforms (default: IMAGE_AUGMENTATIONS)
+            shuffle: Shuffle samples and batch order every epoch
+            seed: Base random seed
+            num_workers: Worker threads (default: number of CPUs)
+            prefetch: Number of batches built ahead of the consumer
+            lengths: Valid length of each padded sample (see ``pad_clips``)
+        """
+        self.images = images
+        self.labels = np.asarray(labels) if labels is not None else None
+        self.batch_size = max(1, batch_size)
+        self.transforms = transforms if transforms is not None else IMAGE_AUGMENTATIONS
+        self.shuffle = shuffle
+        self.seed = seed
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.prefetch = max(1, prefetch)
+        self.lengths = np.asarray(lengths) if lengths is not None else None
+        self.epoch = 0
+
+    def __len__(self) -> int:
+        """Number of batches per epoch."""
+        per_transform = -(-len(self.images) // self.batch_size)
+        return per_transform * len(self.transforms)
+
+    def _plan(self, epoch: int) -> List[Tuple[str, np.ndarray]]:
+        """Build the (augmentation, sample indices) batch list for an epoch."""
+        rng = np.random.default_rng((self.seed, epoch))
+        tasks = []
+        for name in self.transforms:
+            order = rng.permutation(len(self.images)) if self.shuffle else np.arange(len(self.images))
+            if self.lengths is not None:
+                # Bucket by length so each batch carries little padding
+                order = order[np.argsort(self.lengths[order], kind='stable')]
+            for start in range(0, len(order), self.batch_size):
+                tasks.append((name, np.sort(order[start:start + self.batch_size])))
+        if self.shuffle:
+            tasks = [tasks[i] for i in rng.permutation(len(tasks))]
+        return tasks
+
+    def _build(self, task: Tuple[str, np.ndarray]):
+        """Gather the source samples of a batch and apply its augmentation."""
+        name, indices = task
+        if self.lengths is None:
+            batch = self.transforms[name](self.images[indices])
+        else:
+            lengths = self.lengths[indices]
+            batch = self.transforms[name](self.images[indices, :lengths.max()])
+            batch = np.where(np.arange(batch.shape[1]) < lengths[:, None], batch, 0).astype(batch.dtype)
+        labels = self.labels[indices] if self.labels is not None else None
+        return batch, labels, name
+
+    def __iter__(self) -> Iterator[Tuple[np.ndarray, Optional[np.ndarray], str]]:
+        """
+        Iterate over one epoch.
+
+        Yields:
+            Tuples of (augmented batch, batch labels or None, augmentation name)
+        """
+        tasks = iter(self._plan(self.epoch))
+        self.epoch += 1
+
+        with ThreadPoolExecutor(max_workers=self.num_workers,
+                                thread_name_prefix='augment') as pool:
+            pending = deque()
+            for task in tasks:
+                pending.append(pool.submit(self._build, task))
+                if len(pending) >= self.prefetch:
+                    break
+            while pending:
+                result = pending.popleft().result()
+                task = next(tasks, None)
+                if task is not None:
+                    pending.append(pool.submit(self._build, task))
+                yield result
@@ -0,0 +1,262 @@
+"""
+Authentication Result Records
+=============================
+Compact result objects for ``AuthenticationSystem.authenticate_user``.
+
+Each attempt used to build a nested dictionary with face/voice sub-dicts,
+a user-info projection and preformatted message strings, although most
+attempts are only counted. The records below store the raw values in
+``__slots__`` attributes; messages, the timestamp string and the status are
+rendered on access, and ``to_dict()`` produces the same JSON structure as
+before for reports.
+
+Usage:
+    python auth_result.py --benchmark 100000   # Record vs legacy dict allocation
+"""
+
+import time
+import logging
+import argparse
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# modality -> (success prefix, failure prefix)
+_MESSAGES = {
+    'face': ('Facial recognition successful', 'Facial recognition failed'),
+    'voice': ('Voice verification successful', 'Voice verification failed'),
+}
+VOICE_SKIPPED_MESSAGE = "Voice verification skipped (decided on facial recognition)"
+LOCKED_OUT_MESSAGE = "Not evaluated (too many failed attempts)"
+USER_INFO_FIELDS = ('user_id', 'name', 'email', 'department')
+
+
+class VerificationResult:
+    """Outcome of one modality check."""
+
+    __slots__ = ('modality', 'success', 'confidence', 'threshold', 'skip_reason')
+
+    def __init__(self, modality: str, success: Optional[bool], confidence: Optional[float],
+                 threshold: Optional[float], skip_reason: Optional[str] = None):
+        self.modality = modality
+        self.success = success
+        self.confidence = confidence
+        self.threshold = threshold
+        self.skip_reason = skip_reason
+
+    @classmethod
+    def skipped(cls, modality: str, reason: str) -> 'VerificationResult':
+        """Result of a check that was not run."""
+        return cls(modality, None, None, None, skip_reason=reason)
+
+    @classmethod
+    def skipped_voice(cls) -> 'VerificationResult':
+        """Voice result of an attempt decided on the face score alone."""
+        return cls.skipped('voice', VOICE_SKIPPED_MESSAGE)
+
+    @property
+    def is_skipped(self) -> bool:
+        return self.skip_reason is not None
+
+    @property
+    def message(self) -> str:
+        """Human-readable outcome, rendered on access."""
+        if self.skip_reason is not None:
+            return self.skip_reason
+        passed, failed = _MESSAGES[self.modality]
+        if self.success:
+            return f"{passed} (confidence: {self.confidence:.2%})"
+        return f"{failed} (confidence: {self.confidence:.2%} < {self.threshold:.2%})"
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable form used in reports."""
+        result = {'success': self.success, 'confidence': self.confidence,
+                  'message': self.message}
+        if self.modality == 'voice':
+            result['skipped'] = self.is_skipped
+        return result
+
+
+def project_user_info(user: Dict) -> Dict:
+    """Public profile fields of a registry record."""
+    return {field: user[field] for field in USER_INFO_FIELDS}
+
+
+class AuthenticationResult:
+    """Outcome of one multimodal authentication attempt."""
+
+    __slots__ = ('session_id', 'created', 'user_identifier', 'authenticated', 'face',
+                 'voice', 'combined_confidence', 'products', 'user_info', 'failure_reason',
+                 'scenario')
+
+    def __init__(self, session_id: str, user_identifier: str, authenticated: bool,
+                 face: VerificationResult, voice: VerificationResult,
+                 combined_confidence: float, products: Optional[Dict] = None,
+                 user_info: Optional[Dict] = None, failure_reason: Optional[str] = None,
+                 created: Optional[float] = None):
+        self.session_id = session_id
+        self.created = time.time() if created is None else created
+        self.user_identifier = user_identifier
+        self.authenticated = authenticated
+        self.face = face
+        self.voice = voice
+        self.combined_confidence = combined_confidence
+        self.products = products
+        self.user_info = user_info  # Shared with the decision cache; do not modify
+        self.failure_reason = failure_reason
+        self.scenario = None
+
+    @property
+    def status(self) -> str:
+        return 'AUTHENTICATED' if self.authenticated else 'AUTHENTICATION_FAILED'
+
+    @property
+    def timestamp(self) -> str:
+        return datetime.fromtimestamp(self.created).isoformat()
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable form, structured like the original result dictionary."""
+        result = {
+            'session_id': self.session_id,
+            'timestamp': self.timestamp,
+            'user_identifier': self.user_identifier,
+            'authenticated': self.authenticated,
+            'face_verification': self.face.to_dict(),
+            'voice_verification': self.voice.to_dict(),
+            'combined_confidence': self.combined_confidence,
+            'products': self.products,
+            'status': self.status,
+        }
+        if self.authenticated:
+            if self.user_info is not None:
+                result['user_info'] = self.user_info
+        else:
+            result['failure_reason'] = self.failure_reason
+        if self.scenario is not None:
+            result['scenario'] = self.scenario
+        return result
+
+
+def legacy_result_dict(session_id: str, user_identifier: str, authenticated: bool,
+                       face_confidence: float, voice_confidence: float,
+                       combined_confidence: float, products: Optional[Dict],
+                       user: Optional[Dict], thresholds=(0.85, 0.80)) -> Dict:
+    """Build a result the way ``authenticate_user`` did before (for benchmarking)."""
+    face_ok = face_confidence >= thresholds[0]
+    voice_ok = voice_confidence >= thresholds[1]
+    result = {
+        'session_id': session_id,
+        'timestamp': datetime.now().isoformat(),
+        'user_identifier': user_identifier,
+        'authenticated': authenticated,
+        'face_verification': {
+            'success': face_ok,
+            'confidence': face_confidence,
+            'message': (f"Facial recognition successful (confidence: {face_confidence:.2%})"
+                        if face_ok else
+                        f"Facial recognition failed (confidence: {face_confidence:.2%} "
+                        f"< {thresholds[0]:.2%})")
+        },
+        'voice_verification': {
+            'success': voice_ok,
+            'confidence': voice_confidence,
+            'message': (f"Voice verification successful (confidence: {voice_confidence:.2%})"
+                        if voice_ok else
+                        f"Voice verification failed (confidence: {voice_confidence:.2%} "
+                        f"< {thresholds[1]:.2%})"),
+            'skipped': False
+        },
+        'combined_confidence': combined_confidence,
+        'products': None
+    }
+    if authenticated:
+        result['status'] = 'AUTHENTICATED'
+        result['products'] = products
+        if user is not None:
+            result['user_info'] = project_user_info(user)
+    else:
+        result['status'] = 'AUTHENTICATION_FAILED'
+        result['failure_reason'] = "Facial recognition verification failed"
+    return result
+
+
+def record_result(session_id: str, user_identifier: str, authenticated: bool,
+                  face_confidence: float, voice_confidence: float,
+                  combined_confidence: float, products: Optional[Dict],
+                  user: Optional[Dict], thresholds=(0.85, 0.80)) -> AuthenticationResult:
+    """Build the equivalent record (for benchmarking)."""
+    return AuthenticationResult(
+        session_id, user_identifier, authenticated,
+        VerificationResult('face', face_confidence >= thresholds[0], face_confidence,
+                           thresholds[0]),
+        VerificationResult('voice', voice_confidence >= thresholds[1], voice_confidence,
+                           thresholds[1]),
+        combined_confidence,
+        products if authenticated else None,
+        project_user_info(user) if authenticated else None,
+        None if authenticated else "Facial recognition verification failed")
+
+
+def benchmark(n: int = 100000) -> Dict:
+    """
+    Compare per-attempt allocation and build rate of records and legacy dicts.
+
+    Results are retained in a list, as ``authentication_log`` does, so the
+    traced memory is what each attempt keeps alive.
+
+    Args:
+        n: Number of attempts
+
+    Returns:
+        Dictionary with bytes per attempt and attempts/sec per representation
+    """
+    user = {'user_id': 'USR001', 'name': 'Member One', 'email': 'member1@company.com',
+            'department': 'Engineering', 'customer_id': 'A151'}
+    products = {'top_products': ['Electronics', 'Books', 'Clothing'],
+                'categories': ['Electronics', 'Books', 'Clothing'],
+                'predicted_purchase_probability': 0.61}
+    attempts = [('Member1', i % 3 != 0, 0.95 if i % 3 else 0.30, 0.92 if i % 3 else 0.25,
+                 0.935 if i % 3 else 0.275) for i in range(n)]
+
+    results = {}
+    for name, build in (('legacy_dict', legacy_result_dict), ('record', record_result)):
+        log: List = []
+        tracemalloc.start()
+        for ident, ok, face, voice, combined in attempts:
+            log.append(build('a1b2c3d4e5f60718', ident, ok, face, voice, combined, products, user))
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del log
+
+        log = []
+        start = time.perf_counter()
+        for ident, ok, face, voice, combined in attempts:
+            log.append(build('a1b2c3d4e5f60718', ident, ok, face, voice, combined, products, user))
+        elapsed = time.perf_counter() - start
+        del log
+
+        results[name] = {'bytes_per_attempt': retained / n,
+                         'attempts_per_sec': n / elapsed}
+        logger.info(f"  {name:<12} {retained / n:8.0f} bytes/attempt | "
+                    f"{n / elapsed:12,.0f} attempts/s")
+    return results
+
+
+def main():
+    """Main execution function."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser(description='Authentication result records')
+    parser.add_argument('--benchmark', type=int, metavar='N', default=100000,
+                        help='Number of attempts to build per representation')
+    args = parser.parse_args()
+    benchmark(args.benchmark)
+
+
+if __name__ == "__main__":
+    main()
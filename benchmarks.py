@@ -0,0 +1,386 @@
+"""
+Benchmark Suite
+===============
+Reproducible benchmarks for the system's hot paths:
+
+- ``auth``: ``AuthenticationSystem.authenticate_user`` over a fixed mix of
+  genuine and impostor attempts (100 attempts per scale unit), with the
+  failed-attempt limiter disabled so impostors are fully verified
+- ``face_features``: the face ``extract_features`` descriptor
+  (feature_extraction.extract_image_features, 50 images per scale unit)
+- ``audio_features``: MFCC/rolloff/energy extraction
+  (feature_extraction.extract_audio_features, 50 one-second clips per unit)
+- ``integration``: ``MultimodalIntegrator.integrate`` on the tabular dataset
+  replicated ``scale`` times, with image and audio feature files generated by
+  ``create_sample_image_features`` / ``create_sample_audio_features``
+
+Scale 1 matches the current data sizes; ``--scales 1,10,100,1000`` grows every
+workload up to 1000x. Inputs are generated from fixed seeds during an untimed
+setup. Each benchmark is timed over ``--repeat`` runs (throughput and per-item
+latency use the median) followed by one run under tracemalloc for peak memory.
+
+Results are written as JSON. ``--baseline`` compares them with a stored run
+and exits with status 1 when a benchmark got slower or used more memory than
+``--tolerance`` allows; ``--save-baseline`` stores the current run as the new
+baseline. Baselines are machine-specific and are not committed.
+
+Usage:
+    python benchmarks.py                                  # All benchmarks at scale 1
+    python benchmarks.py --only auth,integration --scales 1,100,1000
+    python benchmarks.py --save-baseline benchmark_baseline.json
+    python benchmarks.py --baseline benchmark_baseline.json --tolerance 0.2
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import statistics
+import tracemalloc
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+IMAGE_POOL = 50
+AUDIO_POOL = 50
+AUDIO_SR = 22050
+SEED = 42
+
+# Bundled data is resolved from the module directory, not the working directory
+REPO_DIR = Path(__file__).resolve().parent
+
+
+class Benchmark(NamedTuple):
+    """A benchmarked workload."""
+    name: str
+    unit: str
+    setup: Callable[[int], Any]
+    run: Callable[[Any], int]
+    teardown: Optional[Callable[[Any], None]] = None
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def register(name: str, unit: str, setup: Callable[[int], Any],
+             teardown: Optional[Callable[[Any], None]] = None):
+    """Register the decorated function as the timed body of a benchmark."""
+    def decorator(run: Callable[[Any], int]):
+        BENCHMARKS[name] = Benchmark(name, unit, setup, run, teardown)
+        return run
+    return decorator
+
+
+# ----------------------------------------------------------------------------
+# Synthetic data generators
+# ----------------------------------------------------------------------------
+
+def synthetic_images(n: int, size: int = 160, seed: int = SEED) -> np.ndarray:
+    """Face-sized RGB images with smooth gradients, shapes and sensor noise."""
+    rng = np.random.default_rng(seed)
+    ys, xs = np.mgrid[0:size, 0:size] / size
+    images = np.empty((n, size, size, 3), dtype=np.uint8)
+    for i in range(n):
+        base = rng.uniform(60, 200, 3)
+        gradient = rng.uniform(-60, 60, (2, 3))
+        img = base + xs[..., None] * gradient[0] + ys[..., None] * gradient[1]
+        cy, cx, r = rng.uniform(0.3, 0.7, 2).tolist() + [rng.uniform(0.15, 0.3)]
+        img[(ys - cy) ** 2 + (xs - cx) ** 2 < r ** 2] *= 0.6
+        img += rng.normal(0, 8, img.shape)
+        images[i] = np.clip(img, 0, 255)
+    return images
+
+
+def synthetic_clips(n: int, sr: int = AUDIO_SR, seconds: float = 1.0,
+                    seed: int = SEED) -> List[np.ndarray]:
+    """Voiced-like clips: harmonic stacks with vibrato plus background noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(sr * seconds)) / sr
+    clips = []
+    for _ in range(n):
+        f0 = rng.uniform(90, 250)
+        phase = 2 * np.pi * f0 * (t + 0.002 * np.sin(2 * np.pi * 5 * t))
+        y = sum(np.sin(k * phase) / k for k in range(1, 6))
+        y = y * np.hanning(len(t)) + rng.normal(0, 0.02, len(t))
+        clips.append((0.3 * y / np.abs(y).max()).astype(np.float32))
+    return clips
+
+
+# ----------------------------------------------------------------------------
+# Benchmarks
+# ----------------------------------------------------------------------------
+
+def _setup_auth(scale: int):
+    logging.disable(logging.WARNING)
+    from main import AuthenticationSystem
+    from scenarios import SCENARIO_PROFILES, is_genuine, sample_scores
+    from sessions import SessionTracker
+
+    system = AuthenticationSystem()
+    # Impostor attempts share one identity, which the attempt limiter would
+    # lock out after max_attempts failures; time full verification instead
+    system.session_tracker = SessionTracker(max_attempts=None,
+                                            attempt_timeout=system.config['attempt_timeout'])
+    users = list(system.registered_users)
+    rng = random.Random(SEED)
+    random.seed(SEED)
+    attempts = []
+    for i in range(100 * scale):
+        scenario = rng.choice(list(SCENARIO_PROFILES))
+        identifier = rng.choice(users) if is_genuine(scenario) else 'UnknownUser'
+        attempts.append((identifier, *sample_scores(scenario, rng)))
+    # Load the recommendation table outside the timed runs
+    system.recommend_products(users[0])
+    return system, attempts
+
+
+def _teardown_auth(state):
+    logging.disable(logging.NOTSET)
+
+
+@register('auth', 'attempts', _setup_auth, _teardown_auth)
+def bench_auth(state) -> int:
+    system, attempts = state
+    for identifier, face, voice in attempts:
+        system.authenticate_user(identifier, face_confidence=face, voice_confidence=voice)
+    system.authentication_log.clear()
+    return len(attempts)
+
+
+def _setup_face_features(scale: int):
+    return synthetic_images(IMAGE_POOL), IMAGE_POOL * scale
+
+
+@register('face_features', 'images', _setup_face_features)
+def bench_face_features(state) -> int:
+    from feature_extraction import extract_image_features
+
+    pool, n = state
+    for i in range(n):
+        extract_image_features(pool[i % len(pool)])
+    return n
+
+
+def _setup_audio_features(scale: int):
+    return synthetic_clips(AUDIO_POOL), AUDIO_POOL * scale
+
+
+@register('audio_features', 'clips', _setup_audio_features)
+def bench_audio_features(state) -> int:
+    from feature_extraction import extract_audio_features
+
+    pool, n = state
+    for i in range(n):
+        extract_audio_features(pool[i % len(pool)], AUDIO_SR)
+    return n
+
+
+def _setup_integration(scale: int):
+    from data_integration import MultimodalIntegrator
+
+    base = Path(tempfile.mkdtemp(prefix='bench_integration_'))
+    tabular = pd.read_csv(REPO_DIR / 'product_recommendation' / 'merged_dataset.csv')
+    tabular = pd.concat([tabular] * scale, ignore_index=True)
+    (base / 'product_recommendation').mkdir()
+    tabular.to_csv(base / 'product_recommendation' / 'merged_dataset.csv', index=False)
+
+    logging.disable(logging.INFO)
+    rng = np.random.default_rng(SEED)
+    generator = MultimodalIntegrator(str(base))
+    (base / 'face_recognition' / 'features').mkdir(parents=True)
+    generator.create_sample_image_features(len(tabular), rng).to_csv(
+        base / 'face_recognition' / 'features' / 'image_features.csv', index=False)
+    generator.create_sample_audio_features(len(tabular), rng).to_csv(
+        base / 'audio_features.csv', index=False)
+    return base, len(tabular)
+
+
+def _teardown_integration(state):
+    logging.disable(logging.NOTSET)
+    shutil.rmtree(state[0], ignore_errors=True)
+
+
+@register('integration', 'rows', _setup_integration, _teardown_integration)
+def bench_integration(state) -> int:
+    from data_integration import MultimodalIntegrator
+
+    base, rows = state
+    integrator = MultimodalIntegrator(str(base))
+    integrator.integrate(output_dir=str(base / 'output'), use_cache=False)
+    return rows
+
+
+# ----------------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------------
+
+def run_benchmark(benchmark: Benchmark, scale: int, repeat: int = 3,
+                  measure_memory: bool = True) -> Dict:
+    """
+    Time one benchmark at one scale.
+
+    Args:
+        benchmark: Benchmark to run
+        scale: Workload scale factor
+        repeat: Number of timed runs
+        measure_memory: Also run once under tracemalloc for peak memory
+
+    Returns:
+        Dictionary with timings, throughput, latency and peak memory
+    """
+    state = benchmark.setup(scale)
+    try:
+        benchmark.run(state)  # Warm-up (imports, caches)
+        times = []
+        items = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            items = benchmark.run(state)
+            times.append(time.perf_counter() - start)
+
+        peak = None
+        if measure_memory:
+            tracemalloc.start()
+            benchmark.run(state)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    finally:
+        if benchmark.teardown is not None:
+            benchmark.teardown(state)
+
+    median = statistics.median(times)
+    return {
+        'benchmark': benchmark.name,
+        'scale': scale,
+        'items': items,
+        'unit': benchmark.unit,
+        'repeat': repeat,
+        'seconds_median': median,
+        'seconds_min': min(times),
+        'throughput': items / median if median else float('inf'),
+        'latency_ms': 1000 * median / items if items else 0.0,
+        'peak_memory_mb': peak / 1e6 if peak is not None else None,
+    }
+
+
+def environment_info() -> Dict:
+    """Describe the machine and library versions a run was recorded on."""
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float = 0.25) -> List[Dict]:
+    """
+    Compare results with a baseline run.
+
+    Args:
+        results: Current run (as written by this script)
+        baseline: Baseline run
+        tolerance: Allowed relative increase in time and peak memory
+
+    Returns:
+        List of regressions (benchmark, scale, metric, baseline, current, ratio)
+    """
+    regressions = []
+    for key, current in results['results'].items():
+        reference = baseline.get('results', {}).get(key)
+        if reference is None:
+            continue
+        for metric in ('seconds_median', 'peak_memory_mb'):
+            old, new = reference.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            if ratio > 1 + tolerance:
+                regressions.append({'benchmark': current['benchmark'], 'scale': current['scale'],
+                                    'metric': metric, 'baseline': old, 'current': new,
+                                    'ratio': ratio})
+    return regressions
+
+
+def main():
+    """Main execution function."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser(description='Benchmark the system hot paths')
+    parser.add_argument('--only', type=str,
+                        help=f"Comma-separated benchmarks ({', '.join(BENCHMARKS)})")
+    parser.add_argument('--scales', type=str, default='1',
+                        help='Comma-separated scale factors (1 = current data sizes)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Timed runs per benchmark')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='Skip the tracemalloc peak-memory run')
+    parser.add_argument('--output', type=str,
+                        help='Result JSON (default: output/benchmarks/benchmark_<timestamp>.json)')
+    parser.add_argument('--baseline', type=str,
+                        help='Baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed relative slowdown / memory growth before flagging')
+    parser.add_argument('--save-baseline', type=str, metavar='PATH',
+                        help='Also store this run as the baseline')
+    args = parser.parse_args()
+
+    names = args.only.split(',') if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    scales = [int(s) for s in args.scales.split(',')]
+
+    results = {'environment': environment_info(), 'results': {}}
+    for name in names:
+        for scale in scales:
+            logger.info(f"Running {name} at {scale}x ...")
+            r = run_benchmark(BENCHMARKS[name], scale, args.repeat, not args.no_memory)
+            results['results'][f'{name}@{scale}'] = r
+            memory = f"{r['peak_memory_mb']:.1f} MB" if r['peak_memory_mb'] is not None else 'n/a'
+            logger.info(f"  {name:<15} {scale:>5}x | {r['items']:>8} {r['unit']:<8} | "
+                        f"{r['seconds_median']:.3f}s | {r['throughput']:,.0f} {r['unit']}/s | "
+                        f"{r['latency_ms']:.3f} ms/item | peak {memory}")
+
+    output = Path(args.output) if args.output else (
+        Path('output') / 'benchmarks' / f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    logger.info(f"[DONE] Results saved: {output}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        logger.info(f"[DONE] Baseline saved: {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for reg in regressions:
+            logger.warning(f"REGRESSION {reg['benchmark']}@{reg['scale']}x {reg['metric']}: "
+                           f"{reg['baseline']:.4g} -> {reg['current']:.4g} ({reg['ratio']:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        logger.info(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,11 +10,19 @@ This script creates an integrated multimodal dataset for the authentication syst
 """
 
 import os
+import json
+import time
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
 from pathlib import Path
 import logging
-from typing import Tuple, Optional
+from typing import Callable, Dict, Tuple, Optional
+
+from quantization import PRECISIONS, cast_features, decode_frame, extraction_dtype, storage_dtype
 
 # Configure logging
 logging.basicConfig(
@@ -23,18 +31,153 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Bump whenever a stage's processing logic changes so stale artifacts are rebuilt
+STAGE_CACHE_VERSION = 3
+
+
+def hash_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 content hash of a file.
+    
+    Args:
+        path: File to hash
+        chunk_size: Read size in bytes
+        
+    Returns:
+        Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class StageCache:
+    """
+    Content-addressed cache of intermediate integration artifacts.
+    
+    Each stage (tabular, image, audio, integration) is stored under a key
+    derived from the hashes of its inputs. A manifest records the key and
+    build time of the latest artifact per stage so reruns can skip stages
+    whose inputs have not changed.
+    """
+    
+    def __init__(self, cache_dir: Path):
+        """
+        Initialize the stage cache.
+        
+        Args:
+            cache_dir: Directory holding the manifest and stage artifacts
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.cache_dir / "manifest.json"
+        self.manifest = self._load_manifest()
+        # Stages may finish concurrently; serialize manifest updates
+        self._lock = threading.Lock()
+    
+    def _load_manifest(self) -> Dict:
+        """Load the stage manifest, starting fresh if it is missing or corrupt."""
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.warning(f"⚠ Ignoring unreadable stage manifest: {e}")
+        return {}
+    
+    def _save_manifest(self):
+        """Persist the stage manifest."""
+        tmp_path = self.cache_dir / f"manifest.{os.getpid()}.tmp.json"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+    
+    @staticmethod
+    def make_key(*parts) -> str:
+        """
+        Build a stage key from its input fingerprints.
+        
+        Args:
+            *parts: Input hashes and parameters the stage depends on
+            
+        Returns:
+            Hex digest identifying the stage inputs
+        """
+        payload = json.dumps([STAGE_CACHE_VERSION, *parts], default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    def artifact_path(self, stage: str) -> Path:
+        """Path of the cached artifact for a stage."""
+        return self.cache_dir / f"{stage}.pkl"
+    
+    def load(self, stage: str, key: str) -> Tuple[Optional[pd.DataFrame], float]:
+        """
+        Load a cached stage artifact if it matches the given key.
+        
+        Args:
+            stage: Stage name
+            key: Expected stage key
+            
+        Returns:
+            Tuple of (artifact or None, recorded build time in seconds)
+        """
+        entry = self.manifest.get(stage)
+        artifact = self.artifact_path(stage)
+        if not entry or entry.get('key') != key or not artifact.exists():
+            return None, 0.0
+        
+        try:
+            return pd.read_pickle(artifact), entry.get('build_seconds', 0.0)
+        except Exception as e:
+            logger.warning(f"⚠ Failed to read cached {stage} artifact: {e}")
+            return None, 0.0
+    
+    def store(self, stage: str, key: str, df: pd.DataFrame, build_seconds: float):
+        """
+        Store a stage artifact and record it in the manifest.
+        
+        Args:
+            stage: Stage name
+            key: Stage key the artifact was built from
+            df: Artifact to cache
+            build_seconds: Time taken to build the artifact
+        """
+        # Publish atomically so a crash or concurrent reader never sees a
+        # partial artifact under a valid key
+        tmp_path = self.cache_dir / f"{stage}.{os.getpid()}.tmp.pkl"
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, self.artifact_path(stage))
+        with self._lock:
+            self.manifest[stage] = {
+                'key': key,
+                'build_seconds': build_seconds,
+                'rows': len(df),
+                'columns': len(df.columns),
+            }
+            self._save_manifest()
+
 
 class MultimodalIntegrator:
     """Handles integration of multiple feature modalities."""
     
-    def __init__(self, base_path: str = "."):
+    def __init__(self, base_path: str = ".", max_workers: int = 3,
+                 precision: str = "float64"):
         """
         Initialize the multimodal integrator.
         
         Args:
             base_path: Root path for the project
+            max_workers: Number of modality chains processed concurrently
+            precision: Precision of the image and audio features (one of
+                quantization.PRECISIONS); uint8 codes are kept in the stage
+                artifacts and decoded to float32 for the merged dataset
         """
         self.base_path = Path(base_path)
+        self.max_workers = max(1, max_workers)
+        storage_dtype(precision)
+        self.precision = precision
         self.product_rec_path = self.base_path / "product_recommendation"
         self.face_rec_path = self.base_path / "face_recognition"
         self.audio_path = self.base_path
@@ -44,6 +187,46 @@ class MultimodalIntegrator:
         self.audio_features = None
         self.integrated_data = None
         
+        self.stage_cache = None
+        self.skipped_stages = []
+        self.rebuilt_stages = []
+        self.time_saved = 0.0
+        # Stages run on pool threads; serialize updates of the stage report
+        self._stats_lock = threading.Lock()
+        
+    def find_tabular_features_path(self) -> Path:
+        """Path of the tabular dataset (may not exist)."""
+        return self.product_rec_path / "merged_dataset.csv"
+    
+    def find_image_features_path(self) -> Optional[Path]:
+        """
+        Locate the image features file.
+        
+        Returns:
+            First existing candidate path or None if not found
+        """
+        # Check multiple possible locations
+        possible_paths = [
+            self.face_rec_path / "features" / "image_features.csv",
+            self.face_rec_path / "image_features.csv",
+            self.base_path / "image_features.csv",
+        ]
+        return next((p for p in possible_paths if p.exists()), None)
+    
+    def find_audio_features_path(self) -> Optional[Path]:
+        """
+        Locate the audio features file.
+        
+        Returns:
+            First existing candidate path or None if not found
+        """
+        # Check multiple possible locations
+        possible_paths = [
+            self.base_path / "audio_features.csv",
+            self.audio_path / "audio_features.csv",
+        ]
+        return next((p for p in possible_paths if p.exists()), None)
+    
     def load_tabular_features(self) -> pd.DataFrame:
         """
         Load tabular features from product recommendation dataset.
@@ -52,7 +235,7 @@ class MultimodalIntegrator:
             DataFrame with tabular features
         """
         try:
-            csv_path = self.product_rec_path / "merged_dataset.csv"
+            csv_path = self.find_tabular_features_path()
             
             if not csv_path.exists():
                 raise FileNotFoundError(f"Tabular dataset not found: {csv_path}")
@@ -68,6 +251,13 @@ class MultimodalIntegrator:
             logger.error(f"✗ Failed to load tabular features: {e}")
             raise
     
+    def _read_feature_csv(self, csv_path: Path) -> pd.DataFrame:
+        """Read a feature CSV with numeric columns parsed at the extraction precision."""
+        header = pd.read_csv(csv_path, nrows=100)
+        numeric_cols = header.select_dtypes(include=[np.number]).columns
+        dtype = extraction_dtype(self.precision)
+        return pd.read_csv(csv_path, dtype={col: dtype for col in numeric_cols})
+    
     def load_image_features(self) -> Optional[pd.DataFrame]:
         """
         Load image features from facial recognition system.
@@ -76,20 +266,13 @@ class MultimodalIntegrator:
             DataFrame with image features or None if not found
         """
         try:
-            # Check multiple possible locations
-            possible_paths = [
-                self.face_rec_path / "features" / "image_features.csv",
-                self.face_rec_path / "image_features.csv",
-                self.base_path / "image_features.csv",
-            ]
-            
-            for csv_path in possible_paths:
-                if csv_path.exists():
-                    df = pd.read_csv(csv_path)
-                    logger.info(f"✓ Loaded image features: {df.shape}")
-                    logger.info(f"  Columns: {list(df.columns[:5])}... ({len(df.columns)} total)")
-                    self.image_features = df
-                    return df
+            csv_path = self.find_image_features_path()
+            if csv_path is not None:
+                df = self._read_feature_csv(csv_path)
+                logger.info(f"✓ Loaded image features: {df.shape}")
+                logger.info(f"  Columns: {list(df.columns[:5])}... ({len(df.columns)} total)")
+                self.image_features = df
+                return df
             
             logger.warning("⚠ Image features file not found (image_features.csv)")
             logger.warning("  Expected location: face_recognition/features/image_features.csv")
@@ -107,19 +290,13 @@ class MultimodalIntegrator:
             DataFrame with audio features or None if not found
         """
         try:
-            # Check multiple possible locations
-            possible_paths = [
-                self.base_path / "audio_features.csv",
-                self.audio_path / "audio_features.csv",
-            ]
-            
-            for csv_path in possible_paths:
-                if csv_path.exists():
-                    df = pd.read_csv(csv_path)
-                    logger.info(f"✓ Loaded audio features: {df.shape}")
-                    logger.info(f"  Columns: {list(df.columns[:5])}... ({len(df.columns)} total)")
-                    self.audio_features = df
-                    return df
+            csv_path = self.find_audio_features_path()
+            if csv_path is not None:
+                df = self._read_feature_csv(csv_path)
+                logger.info(f"✓ Loaded audio features: {df.shape}")
+                logger.info(f"  Columns: {list(df.columns[:5])}... ({len(df.columns)} total)")
+                self.audio_features = df
+                return df
             
             logger.warning("⚠ Audio features file not found (audio_features.csv)")
             return None
@@ -161,17 +338,20 @@ class MultimodalIntegrator:
         logger.info(f"✓ Preprocessed {modality} features")
         return df
     
-    def normalize_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def normalize_features(self, df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
         """
         Normalize numeric features to [0, 1] range.
         
         Args:
             df: Input DataFrame
+            copy: Work on a copy; pass False when ``df`` is already a private
+                intermediate (e.g. the output of ``preprocess_features``)
             
         Returns:
             DataFrame with normalized numeric features
         """
-        df = df.copy()
+        if copy:
+            df = df.copy()
         
         numeric_cols = df.select_dtypes(include=[np.number]).columns
         
@@ -187,21 +367,25 @@ class MultimodalIntegrator:
         logger.info(f"✓ Normalized {len(numeric_cols)} numeric features")
         return df
     
-    def create_sample_image_features(self, n_samples: int = 50) -> pd.DataFrame:
+    def create_sample_image_features(self, n_samples: int = 50,
+                                     rng: Optional[np.random.Generator] = None) -> pd.DataFrame:
         """
         Create sample image features if file doesn't exist.
         This is for demonstration purposes.
         
         Args:
             n_samples: Number of samples to create
+            rng: Random generator (default: the global NumPy random state)
             
         Returns:
             DataFrame with synthetic image features
         """
         logger.info(f"⚠ Creating synthetic image features ({n_samples} samples)")
+        randn = rng.standard_normal if rng is not None else np.random.randn
+        dtype = extraction_dtype(self.precision)
         
         # Create feature columns
-        feature_cols = {f'img_feature_{i}': np.random.randn(n_samples) for i in range(217)}
+        feature_cols = {f'img_feature_{i}': randn(n_samples).astype(dtype) for i in range(217)}
         
         df = pd.DataFrame(feature_cols)
         df['member'] = [f'Member{i%4 + 1}' for i in range(n_samples)]
@@ -215,28 +399,32 @@ class MultimodalIntegrator:
         logger.info(f"✓ Generated synthetic image features: {df.shape}")
         return df
     
-    def create_sample_audio_features(self, n_samples: int = 50) -> pd.DataFrame:
+    def create_sample_audio_features(self, n_samples: int = 50,
+                                     rng: Optional[np.random.Generator] = None) -> pd.DataFrame:
         """
         Create sample audio features if file doesn't exist.
         This is for demonstration purposes.
         
         Args:
             n_samples: Number of samples to create
+            rng: Random generator (default: the global NumPy random state)
             
         Returns:
             DataFrame with synthetic audio features
         """
         logger.info(f"⚠ Creating synthetic audio features ({n_samples} samples)")
+        randn = rng.standard_normal if rng is not None else np.random.randn
+        dtype = extraction_dtype(self.precision)
         
         # Create MFCC features
         feature_cols = {}
         for i in range(1, 14):
-            feature_cols[f'mfcc{i}'] = np.random.randn(n_samples)
+            feature_cols[f'mfcc{i}'] = randn(n_samples).astype(dtype)
         
         df = pd.DataFrame(feature_cols)
         df['filename'] = [f'audio_{i}.wav' for i in range(n_samples)]
-        df['rolloff'] = np.random.randn(n_samples)
-        df['energy'] = np.random.randn(n_samples)
+        df['rolloff'] = randn(n_samples).astype(dtype)
+        df['energy'] = randn(n_samples).astype(dtype)
         df['label'] = [f'Speaker{i%4 + 1}' for i in range(n_samples)]
         
         logger.info(f"✓ Generated synthetic audio features: {df.shape}")
@@ -282,45 +470,68 @@ class MultimodalIntegrator:
         
         return df.reset_index(drop=True)
     
-    def integrate(self, output_dir: str = "output") -> pd.DataFrame:
+    def _run_stage(self, stage: str, key: str,
+                   build: Callable[[], pd.DataFrame]) -> pd.DataFrame:
         """
-        Integrate all modalities into a single dataset.
+        Run a pipeline stage, reusing its cached artifact when inputs are unchanged.
         
         Args:
-            output_dir: Directory to save integrated data
+            stage: Stage name
+            key: Stage key derived from the stage inputs
+            build: Callable producing the stage artifact
             
         Returns:
-            Integrated multimodal DataFrame
+            Stage artifact
         """
-        logger.info("\n" + "="*60)
-        logger.info("MULTIMODAL DATA INTEGRATION")
-        logger.info("="*60 + "\n")
-        
-        # Create output directory
-        output_path = Path(output_dir)
-        output_path.mkdir(exist_ok=True)
-        
-        # Load tabular features (required)
-        logger.info("Step 1: Loading Tabular Features")
-        logger.info("-" * 40)
+        if self.stage_cache is not None:
+            cached, build_seconds = self.stage_cache.load(stage, key)
+            if cached is not None:
+                logger.info(f"✓ Reusing cached {stage} stage (inputs unchanged, "
+                            f"saved ~{build_seconds:.2f}s)")
+                with self._stats_lock:
+                    self.skipped_stages.append(stage)
+                    self.time_saved += build_seconds
+                return cached
+        
+        start = time.perf_counter()
+        df = build()
+        elapsed = time.perf_counter() - start
+        with self._stats_lock:
+            self.rebuilt_stages.append(stage)
+        
+        if self.stage_cache is not None:
+            self.stage_cache.store(stage, key, df, elapsed)
+        return df
+    
+    def _build_tabular_stage(self) -> pd.DataFrame:
+        """Load, preprocess and normalize tabular features."""
         self.load_tabular_features()
         tabular_processed = self.preprocess_features(self.tabular_data, "tabular")
-        tabular_normalized = self.normalize_features(tabular_processed)
-        
-        # Get target size
-        n_samples = len(tabular_normalized)
-        logger.info(f"  Target samples: {n_samples}\n")
-        
-        # Load or create image features
-        logger.info("Step 2: Loading Image Features")
-        logger.info("-" * 40)
+        return self.normalize_features(tabular_processed, copy=False)
+    
+    def _build_image_stage(self, get_n_samples: Callable[[], int]) -> pd.DataFrame:
+        """Load (or synthesize), preprocess and normalize image features."""
         image_loaded = self.load_image_features()
         if image_loaded is None:
-            self.image_features = self.create_sample_image_features(n_samples)
+            self.image_features = self.create_sample_image_features(get_n_samples())
         
         image_processed = self.preprocess_features(self.image_features, "image")
-        image_normalized = self.normalize_features(image_processed)
-        image_aligned = self.align_image_features(image_normalized, n_samples)
+        image_normalized = self.normalize_features(image_processed, copy=False)
+        return cast_features(image_normalized, self.precision)
+    
+    def _build_audio_stage(self, get_n_samples: Callable[[], int]) -> pd.DataFrame:
+        """Load (or synthesize), preprocess and normalize audio features."""
+        audio_loaded = self.load_audio_features()
+        if audio_loaded is None:
+            self.audio_features = self.create_sample_audio_features(get_n_samples())
+        
+        audio_processed = self.preprocess_features(self.audio_features, "audio")
+        audio_normalized = self.normalize_features(audio_processed, copy=False)
+        return cast_features(audio_normalized, self.precision)
+    
+    def _select_image_features(self, df: pd.DataFrame, n_samples: int) -> pd.DataFrame:
+        """Align normalized image features to the target size and keep feature columns."""
+        image_aligned = self.align_image_features(decode_frame(df, self.precision), n_samples)
         
         # Rename image feature columns to avoid conflicts
         image_feature_cols = {col: f'img_{col}' for col in image_aligned.columns 
@@ -328,20 +539,12 @@ class MultimodalIntegrator:
         image_aligned = image_aligned.rename(columns=image_feature_cols)
         
         # Keep only feature columns
-        image_features_only = image_aligned[[col for col in image_aligned.columns 
-                                            if col.startswith('img_')]].reset_index(drop=True)
-        logger.info(f"  Aligned samples: {len(image_features_only)}\n")
-        
-        # Load or create audio features
-        logger.info("Step 3: Loading Audio Features")
-        logger.info("-" * 40)
-        audio_loaded = self.load_audio_features()
-        if audio_loaded is None:
-            self.audio_features = self.create_sample_audio_features(n_samples)
-        
-        audio_processed = self.preprocess_features(self.audio_features, "audio")
-        audio_normalized = self.normalize_features(audio_processed)
-        audio_aligned = self.align_audio_features(audio_normalized, n_samples)
+        return image_aligned[[col for col in image_aligned.columns 
+                              if col.startswith('img_')]]
+    
+    def _select_audio_features(self, df: pd.DataFrame, n_samples: int) -> pd.DataFrame:
+        """Align normalized audio features to the target size and keep feature columns."""
+        audio_aligned = self.align_audio_features(decode_frame(df, self.precision), n_samples)
         
         # Rename audio feature columns to avoid conflicts
         audio_feature_cols = {col: f'audio_{col}' for col in audio_aligned.columns 
@@ -349,19 +552,107 @@ class MultimodalIntegrator:
         audio_aligned = audio_aligned.rename(columns=audio_feature_cols)
         
         # Keep only feature columns
-        audio_features_only = audio_aligned[[col for col in audio_aligned.columns 
-                                            if col.startswith('audio_')]].reset_index(drop=True)
-        logger.info(f"  Aligned samples: {len(audio_features_only)}\n")
+        return audio_aligned[[col for col in audio_aligned.columns 
+                              if col.startswith('audio_')]]
+    
+    def _input_key(self, stage: str, path: Optional[Path],
+                   get_n_samples: Callable[[], int]) -> str:
+        """
+        Build the stage key for an optional modality input.
+        
+        Real inputs are keyed by content and precision only, so they never
+        wait on the tabular chain; synthetic inputs depend on the target
+        sample count.
+        """
+        if path is not None:
+            return StageCache.make_key(stage, hash_file(path), self.precision)
+        return StageCache.make_key(stage, 'synthetic', get_n_samples(), self.precision)
+    
+    def _tabular_chain(self) -> Tuple[str, pd.DataFrame]:
+        """Step 1: tabular load → preprocess → normalize."""
+        tabular_path = self.find_tabular_features_path()
+        if not tabular_path.exists():
+            raise FileNotFoundError(f"Tabular dataset not found: {tabular_path}")
+        key = StageCache.make_key('tabular', hash_file(tabular_path))
+        return key, self._run_stage('tabular', key, self._build_tabular_stage)
+    
+    def _image_chain(self, get_n_samples: Callable[[], int]) -> Tuple[str, pd.DataFrame]:
+        """Step 2: image load → preprocess → normalize → align."""
+        key = self._input_key('image', self.find_image_features_path(), get_n_samples)
+        normalized = self._run_stage('image', key,
+                                     lambda: self._build_image_stage(get_n_samples))
+        return key, self._select_image_features(normalized, get_n_samples())
+    
+    def _audio_chain(self, get_n_samples: Callable[[], int]) -> Tuple[str, pd.DataFrame]:
+        """Step 3: audio load → preprocess → normalize → align."""
+        key = self._input_key('audio', self.find_audio_features_path(), get_n_samples)
+        normalized = self._run_stage('audio', key,
+                                     lambda: self._build_audio_stage(get_n_samples))
+        return key, self._select_audio_features(normalized, get_n_samples())
+    
+    def integrate(self, output_dir: str = "output", use_cache: bool = True) -> pd.DataFrame:
+        """
+        Integrate all modalities into a single dataset.
+        
+        The tabular, image and audio chains run concurrently on a pool of
+        ``max_workers`` threads and only join for the final concatenation.
+        Stages whose inputs are unchanged since the previous run are reused
+        from the stage cache in ``<output_dir>/.cache`` instead of being rebuilt.
+        
+        Args:
+            output_dir: Directory to save integrated data
+            use_cache: Reuse cached stage artifacts when their inputs are unchanged
+            
+        Returns:
+            Integrated multimodal DataFrame
+        """
+        logger.info("\n" + "="*60)
+        logger.info("MULTIMODAL DATA INTEGRATION")
+        logger.info("="*60 + "\n")
+        
+        # Create output directory
+        output_path = Path(output_dir)
+        output_path.mkdir(exist_ok=True)
+        
+        self.stage_cache = StageCache(output_path / ".cache") if use_cache else None
+        self.skipped_stages = []
+        self.rebuilt_stages = []
+        self.time_saved = 0.0
+        
+        # Steps 1-3: modality chains (tabular is required and sets the target size)
+        logger.info(f"Steps 1-3: Loading Tabular, Image and Audio Features "
+                    f"({self.max_workers} worker(s))")
+        logger.info("-" * 40)
+        start = time.perf_counter()
+        
+        # The tabular chain is submitted first, so waiting on it from another
+        # chain cannot deadlock even with a single worker
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix='modality') as pool:
+            tabular_future = pool.submit(self._tabular_chain)
+            get_n_samples = lambda: len(tabular_future.result()[1])
+            image_future = pool.submit(self._image_chain, get_n_samples)
+            audio_future = pool.submit(self._audio_chain, get_n_samples)
+            
+            tabular_key, tabular_normalized = tabular_future.result()
+            image_key, image_features_only = image_future.result()
+            audio_key, audio_features_only = audio_future.result()
+        
+        logger.info(f"  Target samples: {len(tabular_normalized)}")
+        logger.info(f"  Aligned samples: image={len(image_features_only)}, "
+                    f"audio={len(audio_features_only)}")
+        logger.info(f"  Modality chains finished in {time.perf_counter() - start:.2f}s\n")
         
         # Integrate all modalities
         logger.info("Step 4: Integrating Modalities")
         logger.info("-" * 40)
         
-        integrated = pd.concat([
+        integration_key = StageCache.make_key('integration', tabular_key, image_key, audio_key)
+        integrated = self._run_stage('integration', integration_key, lambda: pd.concat([
             tabular_normalized.reset_index(drop=True),
             image_features_only,
             audio_features_only
-        ], axis=1)
+        ], axis=1))
         
         logger.info(f"✓ Integration successful!")
         logger.info(f"  Final shape: {integrated.shape}")
@@ -372,8 +663,11 @@ class MultimodalIntegrator:
         logger.info("-" * 40)
         
         output_file = output_path / "integrated_features.csv"
-        integrated.to_csv(output_file, index=False)
-        logger.info(f"✓ Saved: {output_file}\n")
+        if 'integration' in self.skipped_stages and output_file.exists():
+            logger.info(f"✓ Up to date: {output_file}\n")
+        else:
+            integrated.to_csv(output_file, index=False)
+            logger.info(f"✓ Saved: {output_file}\n")
         
         # Save summary statistics
         self._save_summary(integrated, output_path)
@@ -381,9 +675,23 @@ class MultimodalIntegrator:
         # Save modality-specific mappings
         self._save_modality_info(output_path, image_features_only, audio_features_only)
         
+        self._log_stage_report()
+        
         self.integrated_data = integrated
         return integrated
     
+    def _log_stage_report(self):
+        """Log which stages were rebuilt or reused and the time saved."""
+        if self.stage_cache is None:
+            return
+        
+        logger.info("\n" + "="*60)
+        logger.info("INCREMENTAL BUILD REPORT")
+        logger.info("="*60)
+        logger.info(f"  Rebuilt stages: {', '.join(self.rebuilt_stages) or 'none'}")
+        logger.info(f"  Skipped stages: {', '.join(self.skipped_stages) or 'none'}")
+        logger.info(f"  Estimated time saved: {self.time_saved:.2f}s\n")
+    
     def _save_summary(self, df: pd.DataFrame, output_path: Path):
         """Save summary statistics of integrated data."""
         summary = {
@@ -405,7 +713,7 @@ class MultimodalIntegrator:
             f.write("\n" + "="*60 + "\n")
             f.write("FEATURE BREAKDOWN\n")
             f.write("="*60 + "\n\n")
-            f.write(f"Tabular Features: {len(self.tabular_data.columns)}\n")
+            f.write(f"Tabular Features: {len([c for c in df.columns if not c.startswith(('img_', 'audio_'))])}\n")
             f.write(f"Image Features: {len([c for c in df.columns if c.startswith('img_')])}\n")
             f.write(f"Audio Features: {len([c for c in df.columns if c.startswith('audio_')])}\n")
         
@@ -434,6 +742,11 @@ class MultimodalIntegrator:
             f.write("INTEGRATION METHOD:\n")
             f.write("-" * 40 + "\n")
             f.write("- All modalities normalized to [0, 1] range\n")
+            if self.precision == 'uint8':
+                f.write("- Image and audio features quantized to 8 bits "
+                        "(stored as float32 multiples of 1/255)\n")
+            else:
+                f.write(f"- Image and audio features stored as {self.precision}\n")
             f.write("- Missing values imputed with mean (numeric) or mode (categorical)\n")
             f.write("- Features aligned to same number of samples\n")
             f.write("- Concatenated horizontally (column-wise fusion)\n")
@@ -443,15 +756,44 @@ class MultimodalIntegrator:
 
 def main():
     """Main execution function."""
+    parser = argparse.ArgumentParser(description='Multimodal Data Integration')
+    parser.add_argument(
+        '--output-dir',
+        type=str,
+        default='output',
+        help='Directory to save integrated data'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=3,
+        help='Number of modality chains processed concurrently (default: 3)'
+    )
+    parser.add_argument(
+        '--precision',
+        type=str,
+        choices=PRECISIONS,
+        default='float64',
+        help='Storage precision of image and audio features (default: float64)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Rebuild every stage instead of reusing cached artifacts'
+    )
+    args = parser.parse_args()
+    
     # Get current working directory
     cwd = os.getcwd()
     logger.info(f"Working directory: {cwd}")
     
     # Initialize integrator
-    integrator = MultimodalIntegrator(base_path=cwd)
+    integrator = MultimodalIntegrator(base_path=cwd, max_workers=args.workers,
+                                      precision=args.precision)
     
     # Perform integration
-    integrated_df = integrator.integrate(output_dir="output")
+    integrated_df = integrator.integrate(output_dir=args.output_dir,
+                                         use_cache=not args.no_cache)
     
     # Display integrated data info
     logger.info("\n" + "="*60)
@@ -0,0 +1,108 @@
+"""
+Feature Extraction
+==================
+Per-sample feature extractors used by the notebooks, the benchmarks and
+quantization.py, so every caller runs the same code:
+
+- ``extract_image_features``: the 217-dimensional face descriptor of
+  complete_facial_recognition.ipynb (color histograms, channel statistics,
+  edge density, HOG, Laplacian variance and grayscale statistics)
+- ``extract_audio_features``: the voice descriptor of Formative_2_audio.ipynb
+  (13 mean MFCCs, mean spectral rolloff and energy)
+
+Both notebooks import these functions instead of defining their own, so
+the benchmarked extractors are the ones that produce the feature CSVs.
+``dtype`` selects the emitted precision (float32 for the reduced-precision
+pipeline, see quantization.py); features are computed the same way at every
+precision and cast on output.
+"""
+
+from typing import List, Tuple, Union
+
+import numpy as np
+
+IMAGE_FEATURE_COUNT = 217
+AUDIO_FEATURE_COLUMNS: List[str] = [f'mfcc{i}' for i in range(1, 14)] + ['rolloff', 'energy']
+
+
+def extract_image_features(img: np.ndarray,
+                           resize_shape: Tuple[int, int] = (128, 128),
+                           dtype: Union[str, np.dtype] = np.float64) -> np.ndarray:
+    """
+    Extract features from an image.
+
+    Args:
+        img: RGB image
+        resize_shape: Size the image is resized to before extraction
+        dtype: Dtype of the returned features
+
+    Returns:
+        Feature vector with IMAGE_FEATURE_COUNT features
+    """
+    import cv2
+    from skimage.feature import hog
+
+    features = []
+
+    # Resize image
+    img_resized = cv2.resize(img, resize_shape)
+
+    # Color histograms for each channel
+    for channel in range(3):
+        hist = cv2.calcHist([img_resized], [channel], None, [32], [0, 256])
+        hist = hist.flatten() / hist.sum()
+        features.extend(hist)
+
+    # Statistical features per channel
+    for channel in range(3):
+        channel_data = img_resized[:, :, channel]
+        features.append(np.mean(channel_data))
+        features.append(np.std(channel_data))
+        features.append(np.median(channel_data))
+        features.append(np.min(channel_data))
+        features.append(np.max(channel_data))
+
+    # Grayscale conversion
+    gray = cv2.cvtColor(img_resized, cv2.COLOR_RGB2GRAY)
+
+    # Edge detection
+    edges = cv2.Canny(gray, 100, 200)
+    features.append(np.sum(edges > 0) / edges.size)
+
+    # HOG features
+    hog_features = hog(gray, orientations=9, pixels_per_cell=(8, 8),
+                       cells_per_block=(2, 2), visualize=False)
+    features.extend(hog_features[:100])
+
+    # Texture variance
+    laplacian = cv2.Laplacian(gray, cv2.CV_64F)
+    features.append(np.var(laplacian))
+
+    # Additional grayscale statistics
+    features.append(np.mean(gray))
+    features.append(np.std(gray))
+    features.append(np.median(gray))
+    features.append(np.var(gray))
+
+    return np.array(features, dtype=dtype)
+
+
+def extract_audio_features(y: np.ndarray, sr: int,
+                           dtype: Union[str, np.dtype] = np.float64) -> np.ndarray:
+    """
+    Extract voice features from a clip.
+
+    Args:
+        y: Mono signal
+        sr: Sample rate
+        dtype: Dtype of the returned features
+
+    Returns:
+        Feature vector ordered as AUDIO_FEATURE_COLUMNS
+    """
+    import librosa
+
+    mfccs = np.mean(librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13), axis=1)
+    rolloff = np.mean(librosa.feature.spectral_rolloff(y=y, sr=sr))
+    energy = np.mean(y ** 2)
+    return np.array([*mfccs, rolloff, energy], dtype=dtype)
@@ -0,0 +1,269 @@
+"""
+Score-Level Fusion
+==================
+Combines facial recognition and voice verification confidences into one
+authentication decision.
+
+Strategies (selected by ``fusion.strategy`` in config.json):
+- ``weighted_sum``: w_face * face + w_voice * voice
+- ``product``: product rule over the two posteriors,
+  f*v / (f*v + (1-f)*(1-v)), optionally weighted as exponents
+- ``logistic``: calibrated fusion, sigmoid(bias + a*logit(face) + b*logit(voice)),
+  with coefficients fitted offline on labeled score logs
+
+Each strategy compares the fused score with ``combined_confidence_threshold``.
+With ``require_all_modalities`` (the default) both modalities must also pass
+their individual thresholds, as in the original ``authenticate_user`` logic.
+
+Sequential mode (``fusion.sequential.enabled``) evaluates the face score
+first and decides without invoking the voice model when it is decisive:
+at or above ``early_accept`` it accepts, below ``early_reject`` it rejects.
+Early accept never applies with ``require_all_modalities``, since accepting
+on the face alone would skip the voice factor. ``early_accept`` must be at
+least the face and combined thresholds and ``early_reject`` at most the face
+threshold. The engine counts how often the voice model was skipped.
+
+``fuse`` accepts scalars or NumPy arrays, so offline tools such as
+threshold_evaluation.py score whole logs in one call.
+"""
+
+import abc
+import logging
+from typing import Callable, Dict, NamedTuple, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FUSION_CONFIG = {
+    'strategy': 'weighted_sum',
+    'require_all_modalities': True,
+    'weights': {'face': 0.5, 'voice': 0.5},
+    'logistic': {'bias': -4.0, 'face': 4.0, 'voice': 4.0},
+    'sequential': {
+        'enabled': False,
+        'early_accept': 0.97,
+        'early_reject': None
+    }
+}
+
+_EPS = 1e-6
+
+
+def _logit(p):
+    p = np.clip(p, _EPS, 1 - _EPS)
+    return np.log(p / (1 - p))
+
+
+class FusionDecision(NamedTuple):
+    """Outcome of fusing one authentication attempt."""
+    accepted: bool
+    combined_confidence: float
+    voice_skipped: bool
+    reason: Optional[str]
+
+
+class FusionStrategy(abc.ABC):
+    """Base class for score-level fusion rules."""
+
+    name = 'base'
+
+    def __init__(self, params: Dict):
+        self.params = params
+
+    @abc.abstractmethod
+    def fuse(self, face_score: float, voice_score: float) -> float:
+        """
+        Combine two confidences into one score in [0, 1].
+
+        Args:
+            face_score: Facial recognition confidence (scalar or array)
+            voice_score: Voice verification confidence (scalar or array)
+
+        Returns:
+            Fused confidence, with the shape of the inputs
+        """
+
+
+class WeightedSumFusion(FusionStrategy):
+    """Weighted arithmetic mean of the modality confidences."""
+
+    name = 'weighted_sum'
+
+    def fuse(self, face_score: float, voice_score: float) -> float:
+        w_face = self.params['weights']['face']
+        w_voice = self.params['weights']['voice']
+        return (w_face * face_score + w_voice * voice_score) / (w_face + w_voice)
+
+
+class ProductRuleFusion(FusionStrategy):
+    """Product rule over the modality posteriors (independent evidence, equal priors)."""
+
+    name = 'product'
+
+    def fuse(self, face_score: float, voice_score: float) -> float:
+        w_face = self.params['weights']['face']
+        w_voice = self.params['weights']['voice']
+        genuine = face_score ** w_face * voice_score ** w_voice
+        impostor = (1 - face_score) ** w_face * (1 - voice_score) ** w_voice
+        total = genuine + impostor
+        return np.where(total > 0, genuine / np.maximum(total, _EPS), 0.0)
+
+
+class LogisticFusion(FusionStrategy):
+    """Logistic-calibrated fusion of the modality log-odds."""
+
+    name = 'logistic'
+
+    def fuse(self, face_score: float, voice_score: float) -> float:
+        coef = self.params['logistic']
+        z = coef['bias'] + coef['face'] * _logit(face_score) + coef['voice'] * _logit(voice_score)
+        return 1 / (1 + np.exp(-z))
+
+
+STRATEGIES = {cls.name: cls for cls in (WeightedSumFusion, ProductRuleFusion, LogisticFusion)}
+
+
+class FusionEngine:
+    """Applies a fusion strategy, optionally deciding early on the face score."""
+
+    def __init__(self, config: Dict):
+        """
+        Initialize the fusion engine.
+
+        Args:
+            config: System configuration; the optional 'fusion' section
+                overrides DEFAULT_FUSION_CONFIG
+        """
+        overrides = config.get('fusion', {})
+        # Nested sections are merged key by key, so partial overrides keep defaults
+        params = {key: ({**default, **overrides.get(key, {})} if isinstance(default, dict)
+                         else overrides.get(key, default))
+                  for key, default in DEFAULT_FUSION_CONFIG.items()}
+        params.update({key: value for key, value in overrides.items()
+                       if key not in DEFAULT_FUSION_CONFIG})
+        if params['strategy'] not in STRATEGIES:
+            raise ValueError(f"Unknown fusion strategy: {params['strategy']} "
+                             f"(choose from {', '.join(STRATEGIES)})")
+
+        self.params = params
+        self.strategy = STRATEGIES[params['strategy']](params)
+        self.face_threshold = config['face_confidence_threshold']
+        self.voice_threshold = config['voice_confidence_threshold']
+        self.combined_threshold = config['combined_confidence_threshold']
+        self.early_accept, self.early_reject = self._early_thresholds(params['sequential'])
+
+        self.attempts = 0
+        self.voice_skipped = 0
+        self.early_accepts = 0
+        self.early_rejects = 0
+
+    def _early_thresholds(self, sequential: Dict):
+        """
+        Validate the sequential-mode thresholds.
+
+        Args:
+            sequential: The 'sequential' fusion section
+
+        Returns:
+            Tuple of (early accept, early reject) thresholds, None where unused
+
+        Raises:
+            ValueError: If a threshold could decide differently from full fusion
+        """
+        early_accept = sequential['early_accept']
+        early_reject = sequential['early_reject']
+        if not sequential['enabled']:
+            return None, None
+
+        if early_accept is not None:
+            if self.params['require_all_modalities']:
+                # Both factors are required, so the face alone can never accept
+                logger.warning("⚠ fusion.sequential.early_accept is ignored while "
+                               "require_all_modalities is set")
+                early_accept = None
+            elif early_accept < max(self.face_threshold, self.combined_threshold):
+                raise ValueError(f"fusion.sequential.early_accept ({early_accept}) must be at "
+                                 f"least the face ({self.face_threshold}) and combined "
+                                 f"({self.combined_threshold}) thresholds")
+
+        if early_reject is None:
+            if self.params['require_all_modalities']:
+                # A failed face check already rejects, whatever the voice says
+                early_reject = self.face_threshold
+        elif early_reject > self.face_threshold:
+            raise ValueError(f"fusion.sequential.early_reject ({early_reject}) must not exceed "
+                             f"the face threshold ({self.face_threshold})")
+        return early_accept, early_reject
+
+    def early_decision(self, face_score: float) -> Optional[bool]:
+        """
+        Decide on the face score alone if it is decisive.
+
+        Args:
+            face_score: Facial recognition confidence
+
+        Returns:
+            True (accept) or False (reject) if decisive, None if voice is needed
+        """
+        if self.early_reject is not None and face_score < self.early_reject:
+            return False
+        if self.early_accept is not None and face_score >= self.early_accept:
+            return True
+        return None
+
+    def decide(self, face_score: float,
+               voice_score_fn: Callable[[], float]) -> FusionDecision:
+        """
+        Fuse an attempt, invoking the voice model only when needed.
+
+        Args:
+            face_score: Facial recognition confidence
+            voice_score_fn: Callable returning the voice confidence
+
+        Returns:
+            FusionDecision for the attempt
+        """
+        self.attempts += 1
+
+        early = self.early_decision(face_score)
+        if early is not None:
+            self.voice_skipped += 1
+            if early:
+                self.early_accepts += 1
+                return FusionDecision(True, face_score, True, None)
+            self.early_rejects += 1
+            reason = ("Facial recognition verification failed"
+                      if face_score < self.face_threshold
+                      else "Face confidence below early-reject threshold")
+            return FusionDecision(False, face_score, True, reason)
+
+        voice_score = voice_score_fn()
+        combined = float(self.strategy.fuse(face_score, voice_score))
+
+        reason = None
+        if self.params['require_all_modalities']:
+            if face_score < self.face_threshold:
+                reason = "Facial recognition verification failed"
+            elif voice_score < self.voice_threshold:
+                reason = "Voice verification failed"
+        if reason is None and combined < self.combined_threshold:
+            reason = "Combined confidence below threshold"
+        return FusionDecision(reason is None, combined, False, reason)
+
+    def stats(self) -> Dict:
+        """
+        Get fusion statistics.
+
+        Returns:
+            Dictionary with the strategy, attempt counts and voice skip rate
+        """
+        return {
+            'strategy': self.strategy.name,
+            'sequential': self.params['sequential']['enabled'],
+            'attempts': self.attempts,
+            'voice_skipped': self.voice_skipped,
+            'early_accepts': self.early_accepts,
+            'early_rejects': self.early_rejects,
+            'voice_skip_rate': self.voice_skipped / self.attempts if self.attempts else 0.0,
+        }
@@ -0,0 +1,319 @@
+"""
+Load Generator
+==============
+Capacity testing for the authentication pipeline.
+
+Worker processes each build their own ``AuthenticationSystem`` and run
+attempts drawn from a scenario mix (see scenarios.py) through
+``run_scenario`` for a fixed duration, either as fast as possible or paced
+to a target aggregate rate. Workers stream batches of latencies and outcome
+counts to the parent over a result queue; the parent merges them into
+throughput, latency percentiles and pass/fail counts, overall and per
+worker, so runs with different worker counts show how the system scales
+with cores.
+
+Per-attempt logging is disabled inside workers (it would otherwise dominate
+the measurement), and each worker discards its authentication log as it goes
+so long runs keep a flat memory footprint. Models published by the parent
+with ``AuthenticationSystem.share_models`` are attached from shared memory
+instead of being unpickled in every worker.
+
+Usage:
+    python main.py --mode load-test --workers 4 --duration 30
+    python main.py --mode load-test --rate 2000 --mix success=0.8,spoofing=0.2
+"""
+
+import os
+import json
+import time
+import queue
+import random
+import logging
+import threading
+import multiprocessing as mp
+import numpy as np
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from scenarios import SCENARIO_PROFILES, is_genuine, parse_mix
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIX = 'success=0.6,unauthorized=0.2,spoofing=0.2'
+LATENCY_PERCENTILES = (50, 90, 95, 99)
+
+# Workers send partial results at this interval (seconds)
+FLUSH_INTERVAL = 0.5
+
+
+def _new_counts() -> Dict[str, Dict[str, int]]:
+    return {name: {'attempts': 0, 'authenticated': 0} for name in SCENARIO_PROFILES}
+
+
+def _worker(index: int, config_path: Optional[str], config: Dict, mix: Dict[str, float],
+            rate: float, duration: float, seed: int, start: mp.Barrier, results: mp.Queue,
+            shared_models: Optional[Dict] = None):
+    """
+    Run attempts in a worker process and stream results to the parent.
+
+    Args:
+        index: Worker index
+        config_path: Configuration file the parent system was created from
+        config: Effective configuration (including command-line overrides)
+        mix: Scenario -> probability
+        rate: Attempts per second for this worker (0: unthrottled)
+        duration: Run time in seconds
+        seed: Base random seed
+        start: Barrier released once every worker is ready
+        results: Queue receiving ('batch', ...) and ('done', ...) messages
+        shared_models: ModelServer manifest published by the parent
+    """
+    logging.disable(logging.WARNING)
+    from main import AuthenticationSystem, run_scenario
+    from fusion import FusionEngine
+    from sessions import SessionTracker
+
+    random.seed(seed + index)
+    rng = random.Random(seed + index)
+    names, weights = list(mix), list(mix.values())
+
+    try:
+        system = AuthenticationSystem(config_path)
+        system.config = config
+        system.fusion_engine = FusionEngine(config)
+        # Impostor scenarios reuse a handful of identities, which the attempt
+        # limiter would lock out after max_attempts failures; measure the
+        # full verification path instead
+        system.session_tracker = SessionTracker(max_attempts=None,
+                                                attempt_timeout=config['attempt_timeout'])
+        if shared_models:
+            system.use_shared_models(shared_models)
+        # Warm up lazily loaded state (recommendation table) before the clock starts
+        run_scenario(system, 'success')
+        system.authentication_log.clear()
+    except Exception as e:
+        start.abort()
+        results.put(('error', index, repr(e)))
+        return
+
+    try:
+        start.wait()
+    except threading.BrokenBarrierError:
+        results.put(('error', index, 'start aborted'))
+        return
+    began = time.perf_counter()
+    deadline = began + duration
+    interval = 1.0 / rate if rate > 0 else 0.0
+    next_start = began
+    next_flush = began + FLUSH_INTERVAL
+
+    latencies: List[float] = []
+    counts = _new_counts()
+    errors = late = 0
+    while True:
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+        if interval:
+            if next_start > now:
+                time.sleep(next_start - now)
+            elif now - next_start > interval:
+                late += 1
+            next_start += interval
+
+        scenario = rng.choices(names, weights)[0]
+        t0 = time.perf_counter()
+        try:
+            result = run_scenario(system, scenario)
+        except Exception:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - t0)
+        counts[scenario]['attempts'] += 1
+        counts[scenario]['authenticated'] += result.authenticated
+        system.authentication_log.clear()
+
+        if t0 >= next_flush:
+            results.put(('batch', index, np.array(latencies), counts))
+            latencies, counts = [], _new_counts()
+            next_flush = t0 + FLUSH_INTERVAL
+
+    elapsed = time.perf_counter() - began
+    results.put(('batch', index, np.array(latencies), counts))
+    results.put(('done', index, {'elapsed_seconds': elapsed, 'errors': errors,
+                                 'late_starts': late, 'fusion': system.fusion_engine.stats(),
+                                 'decision_cache': system.decision_cache.stats(),
+                                 'blocked_attempts': system.session_tracker.blocked_attempts}))
+
+
+def _summarize_latency(latencies: np.ndarray) -> Dict:
+    """Latency statistics in milliseconds."""
+    if not len(latencies):
+        return {}
+    ms = latencies * 1000
+    summary = {'mean': float(ms.mean())}
+    for p, value in zip(LATENCY_PERCENTILES, np.percentile(ms, LATENCY_PERCENTILES)):
+        summary[f'p{p}'] = float(value)
+    summary['max'] = float(ms.max())
+    return summary
+
+
+def run_load_test(config: Dict, config_path: Optional[str] = None,
+                  workers: Optional[int] = None, duration: float = 10.0,
+                  rate: float = 0.0, mix: str = DEFAULT_MIX, seed: int = 42,
+                  shared_models: Optional[Dict] = None) -> Dict:
+    """
+    Run a multiprocess load test.
+
+    Args:
+        config: Effective system configuration
+        config_path: Configuration file passed to the worker systems
+        workers: Worker processes (default: number of CPUs)
+        duration: Run time in seconds
+        rate: Target aggregate attempts per second (0: as fast as possible)
+        mix: Scenario mix, e.g. 'success=0.6,unauthorized=0.2,spoofing=0.2'
+        seed: Base random seed
+        shared_models: ModelServer manifest the workers attach to (see
+            AuthenticationSystem.share_models); the publishing server must
+            stay open until the test returns
+
+    Returns:
+        Load test report dictionary
+    """
+    workers = workers or os.cpu_count() or 1
+    weights = parse_mix(mix)
+
+    ctx = mp.get_context()
+    start = ctx.Barrier(workers + 1)
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=_worker, name=f'load-{i}',
+                    args=(i, config_path, config, weights, rate / workers, duration,
+                          seed, start, results, shared_models))
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    logger.info(f"Load test: {workers} workers, {duration:.0f}s, "
+                f"rate {'unthrottled' if rate <= 0 else f'{rate:.0f}/s'}, mix {mix}")
+
+    latencies: List[np.ndarray] = []
+    counts = _new_counts()
+    per_worker = {i: {'attempts': 0} for i in range(workers)}
+    fusion_stats = []
+    cache_stats = []
+    failures = []
+    try:
+        start.wait(timeout=max(60.0, duration))
+    except threading.BrokenBarrierError:
+        pass  # The failing worker reports its error through the queue
+    began = time.perf_counter()
+
+    done = 0
+    while done + len(failures) < workers:
+        try:
+            message = results.get(timeout=duration + 60)
+        except queue.Empty:
+            failures.append('timed out waiting for workers')
+            break
+        kind, index = message[0], message[1]
+        if kind == 'batch':
+            _, _, batch, batch_counts = message
+            latencies.append(batch)
+            per_worker[index]['attempts'] += len(batch)
+            for name, values in batch_counts.items():
+                for key, value in values.items():
+                    counts[name][key] += value
+        elif kind == 'done':
+            per_worker[index].update(message[2])
+            fusion_stats.append(per_worker[index].pop('fusion'))
+            cache_stats.append(per_worker[index].pop('decision_cache'))
+            done += 1
+        else:
+            failures.append(f"worker {index}: {message[2]}")
+    wall = time.perf_counter() - began
+
+    for process in processes:
+        process.join(timeout=10)
+        if process.is_alive():
+            process.terminate()
+    if failures:
+        raise RuntimeError(f"Load test failed: {'; '.join(failures)}")
+
+    all_latencies = np.concatenate(latencies) if latencies else np.empty(0)
+    attempts = len(all_latencies)
+    elapsed = max(w['elapsed_seconds'] for w in per_worker.values())
+
+    scenarios = {}
+    false_accepts = false_rejects = 0
+    for name, values in counts.items():
+        if not values['attempts']:
+            continue
+        failed = values['attempts'] - values['authenticated']
+        genuine = is_genuine(name)
+        scenarios[name] = {**values, 'failed': failed,
+                           'correct': values['authenticated'] if genuine else failed}
+        if genuine:
+            false_rejects += failed
+        else:
+            false_accepts += values['authenticated']
+
+    for worker in per_worker.values():
+        worker['throughput'] = worker['attempts'] / worker['elapsed_seconds']
+
+    authenticated = sum(s['authenticated'] for s in scenarios.values())
+    voice_skipped = sum(s['voice_skipped'] for s in fusion_stats)
+    cache_hits = sum(s['hits'] for s in cache_stats)
+    cache_lookups = cache_hits + sum(s['misses'] for s in cache_stats)
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'workers': workers,
+        'cpu_count': os.cpu_count(),
+        'duration_seconds': duration,
+        'elapsed_seconds': elapsed,
+        'wall_seconds': wall,
+        'target_rate': rate,
+        'mix': weights,
+        'attempts': attempts,
+        'errors': sum(w['errors'] for w in per_worker.values()),
+        'late_starts': sum(w['late_starts'] for w in per_worker.values()),
+        'throughput': attempts / elapsed if elapsed else 0.0,
+        'latency_ms': _summarize_latency(all_latencies),
+        'outcomes': {
+            'authenticated': authenticated,
+            'failed': attempts - authenticated,
+            'false_accepts': false_accepts,
+            'false_rejects': false_rejects,
+            'blocked_attempts': sum(w['blocked_attempts'] for w in per_worker.values()),
+        },
+        'scenarios': scenarios,
+        'voice_skip_rate': voice_skipped / attempts if attempts else 0.0,
+        'decision_cache_hit_rate': cache_hits / cache_lookups if cache_lookups else 0.0,
+        'shared_models': sorted(shared_models or {}),
+        'per_worker': [per_worker[i] for i in range(workers)],
+    }
+
+
+def save_load_test_report(report: Dict, output_dir: str = "output") -> Path:
+    """Write a load test report and log its headline numbers."""
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    report_file = output_path / f"load_test_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(report_file, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    latency = report['latency_ms']
+    outcomes = report['outcomes']
+    logger.info(f"Attempts: {report['attempts']} in {report['elapsed_seconds']:.1f}s "
+                f"({report['throughput']:.0f}/s across {report['workers']} workers)")
+    if latency:
+        logger.info(f"Latency: p50 {latency['p50']:.3f} ms, p95 {latency['p95']:.3f} ms, "
+                    f"p99 {latency['p99']:.3f} ms, max {latency['max']:.3f} ms")
+    logger.info(f"Authenticated: {outcomes['authenticated']}, failed: {outcomes['failed']} "
+                f"(false accepts {outcomes['false_accepts']}, "
+                f"false rejects {outcomes['false_rejects']}, "
+                f"blocked {outcomes['blocked_attempts']}, errors {report['errors']})")
+    logger.info(f"\n[DONE] Load test report saved: {report_file}")
+    return report_file
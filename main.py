@@ -20,11 +20,18 @@ import json
 import logging
 import argparse
 from pathlib import Path
-from typing import Tuple, Dict, Optional
+from typing import Any, Dict, List, NamedTuple, Optional
 from datetime import datetime
 import hashlib
 import random
 
+from auth_result import (AuthenticationResult, VerificationResult, LOCKED_OUT_MESSAGE,
+                         project_user_info)
+from cache_utils import LRUCache
+from fusion import FusionEngine
+from scenarios import SCENARIO_PROFILES, sample_scores
+from sessions import SessionTracker
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -36,6 +43,46 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Static recommendations served when the recommendation table is unavailable
+DEFAULT_RECOMMENDATIONS = {
+    'Member1': {
+        'top_products': ['Laptop', 'Monitor', 'Keyboard'],
+        'categories': ['Electronics', 'Accessories'],
+        'predicted_purchase_probability': 0.87
+    },
+    'Member2': {
+        'top_products': ['Cloud Storage', 'Software License', 'Security Suite'],
+        'categories': ['Software', 'Services'],
+        'predicted_purchase_probability': 0.91
+    },
+    'Member3': {
+        'top_products': ['Marketing Analytics Tool', 'Design Software', 'Social Media Manager'],
+        'categories': ['Marketing Tools', 'Software'],
+        'predicted_purchase_probability': 0.79
+    },
+    'Member4': {
+        'top_products': ['CRM System', 'Sales Dashboard', 'Contact Manager'],
+        'categories': ['Business Tools', 'Software'],
+        'predicted_purchase_probability': 0.85
+    }
+}
+
+FALLBACK_RECOMMENDATION = {
+    'top_products': ['Premium Plan', 'Extended Support'],
+    'categories': ['Services'],
+    'predicted_purchase_probability': 0.75
+}
+
+# Cache marker for model paths that have not been loaded yet
+_NOT_LOADED = object()
+
+
+class UserDecision(NamedTuple):
+    """Per-user parts of a successful authentication that do not change between attempts."""
+    user_info: Optional[Dict]
+    products: Dict
+    models: Dict[str, Any]
+
 
 class AuthenticationSystem:
     """Main authentication system for multimodal verification."""
@@ -51,12 +98,33 @@ class AuthenticationSystem:
         self.registered_users = self._load_registered_users()
         self.authentication_log = []
         self.session_id = self._generate_session_id()
+        self.recommendation_engine = None
+        self._recommendation_engine_failed = False
+        self.fusion_engine = FusionEngine(self.config)
+        self.session_tracker = SessionTracker(
+            max_attempts=self.config['max_attempts'],
+            attempt_timeout=self.config['attempt_timeout']
+        )
+        self.decision_cache = LRUCache(
+            maxsize=self.config['decision_cache']['maxsize'],
+            ttl=self.config['decision_cache']['ttl_seconds']
+        )
+        self._decision_generation = None
+        self.decision_cache_invalidations = 0
+        # Model path -> model attached from a ModelServer (see use_shared_models)
+        self.shared_models = {}
+        # Model path -> loaded model; bounded and expired like the decisions holding them
+        self._model_handles = LRUCache(
+            maxsize=self.config['decision_cache']['maxsize'],
+            ttl=self.config['decision_cache']['ttl_seconds']
+        )
         
         logger.info("="*70)
         logger.info("MULTIMODAL AUTHENTICATION SYSTEM INITIALIZED")
         logger.info("="*70)
         logger.info(f"Session ID: {self.session_id}")
         logger.info(f"Registered Users: {len(self.registered_users)}")
+        logger.info(f"Fusion Strategy: {self.fusion_engine.strategy.name}")
         
     def _load_config(self, config_path: Optional[str]) -> Dict:
         """Load system configuration."""
@@ -67,7 +135,18 @@ class AuthenticationSystem:
             'max_attempts': 3,
             'attempt_timeout': 300,  # seconds
             'security_level': 'HIGH',
-            'logging_enabled': True
+            'logging_enabled': True,
+            'recommendation': {
+                'dataset_path': 'product_recommendation/merged_dataset.csv',
+                'table_dir': 'output/recommendation_table',
+                'top_k': 3,
+                'cache_size': 1024,
+                'ttl_seconds': 60
+            },
+            'decision_cache': {
+                'maxsize': 10000,
+                'ttl_seconds': 30
+            }
         }
         
         if config_path and Path(config_path).exists():
@@ -90,6 +169,7 @@ class AuthenticationSystem:
                 'name': 'Wengelawit Ayalew Solomon',
                 'department': 'Engineering',
                 'registered_date': '2024-01-15',
+                'customer_id': 'A151',
                 'face_model_path': 'models/face_recognition_rf.pkl',
                 'voice_model_path': 'models/voiceprint_model.pkl',
             },
@@ -99,6 +179,7 @@ class AuthenticationSystem:
                 'name': 'Elyse Marie Uyiringiye',
                 'department': 'Product',
                 'registered_date': '2024-01-16',
+                'customer_id': 'A192',
                 'face_model_path': 'models/face_recognition_rf.pkl',
                 'voice_model_path': 'models/voiceprint_model.pkl',
             },
@@ -108,6 +189,7 @@ class AuthenticationSystem:
                 'name': 'Jean Jacques JABO',
                 'department': 'Marketing',
                 'registered_date': '2024-01-17',
+                'customer_id': 'A114',
                 'face_model_path': 'models/face_recognition_rf.pkl',
                 'voice_model_path': 'models/voiceprint_model.pkl',
             },
@@ -117,6 +199,7 @@ class AuthenticationSystem:
                 'name': 'Raissa Irutingabo',
                 'department': 'Sales',
                 'registered_date': '2024-01-18',
+                'customer_id': 'A160',
                 'face_model_path': 'models/face_recognition_rf.pkl',
                 'voice_model_path': 'models/voiceprint_model.pkl',
             }
@@ -131,7 +214,7 @@ class AuthenticationSystem:
         return hashlib.sha256(session_str.encode()).hexdigest()[:16]
     
     def verify_facial_recognition(self, user_identifier: str, 
-                                  image_confidence: float = None) -> Tuple[bool, float, str]:
+                                  image_confidence: float = None) -> VerificationResult:
         """
         Verify user through facial recognition.
         
@@ -140,7 +223,7 @@ class AuthenticationSystem:
             image_confidence: Simulated confidence score (for testing)
             
         Returns:
-            Tuple of (success, confidence_score, message)
+            VerificationResult with the success flag and confidence score
         """
         logger.info(f"\n{'='*70}")
         logger.info("FACIAL RECOGNITION VERIFICATION")
@@ -164,15 +247,13 @@ class AuthenticationSystem:
         
         if is_authorized:
             logger.info(f"[PASS] FACIAL RECOGNITION: PASSED")
-            message = f"Facial recognition successful (confidence: {image_confidence:.2%})"
         else:
             logger.warning(f"[FAIL] FACIAL RECOGNITION: FAILED")
-            message = f"Facial recognition failed (confidence: {image_confidence:.2%} < {threshold:.2%})"
         
-        return is_authorized, image_confidence, message
+        return VerificationResult('face', is_authorized, image_confidence, threshold)
     
     def verify_voice_recognition(self, user_identifier: str,
-                                voice_confidence: float = None) -> Tuple[bool, float, str]:
+                                voice_confidence: float = None) -> VerificationResult:
         """
         Verify user through voice/audio recognition.
         
@@ -181,7 +262,7 @@ class AuthenticationSystem:
             voice_confidence: Simulated confidence score (for testing)
             
         Returns:
-            Tuple of (success, confidence_score, message)
+            VerificationResult with the success flag and confidence score
         """
         logger.info(f"\n{'='*70}")
         logger.info("VOICE VERIFICATION")
@@ -205,12 +286,26 @@ class AuthenticationSystem:
         
         if is_authorized:
             logger.info(f"[PASS] VOICE VERIFICATION: PASSED")
-            message = f"Voice verification successful (confidence: {voice_confidence:.2%})"
         else:
             logger.warning(f"[FAIL] VOICE VERIFICATION: FAILED")
-            message = f"Voice verification failed (confidence: {voice_confidence:.2%} < {threshold:.2%})"
         
-        return is_authorized, voice_confidence, message
+        return VerificationResult('voice', is_authorized, voice_confidence, threshold)
+    
+    def _get_recommendation_engine(self):
+        """
+        Get the recommendation engine, creating it on first use.
+        
+        Returns:
+            RecommendationEngine instance or None if it cannot be loaded
+        """
+        if self.recommendation_engine is None and not self._recommendation_engine_failed:
+            try:
+                from recommendation_engine import RecommendationEngine
+                self.recommendation_engine = RecommendationEngine(**self.config['recommendation'])
+            except Exception as e:
+                logger.warning(f"Recommendation engine unavailable: {e}. Using defaults.")
+                self._recommendation_engine_failed = True
+        return self.recommendation_engine
     
     def recommend_products(self, user_identifier: str) -> Dict:
         """
@@ -226,35 +321,17 @@ class AuthenticationSystem:
         logger.info("PRODUCT RECOMMENDATION")
         logger.info(f"{'='*70}")
         
-        # Sample product recommendations based on user profile
-        recommendations = {
-            'Member1': {
-                'top_products': ['Laptop', 'Monitor', 'Keyboard'],
-                'categories': ['Electronics', 'Accessories'],
-                'predicted_purchase_probability': 0.87
-            },
-            'Member2': {
-                'top_products': ['Cloud Storage', 'Software License', 'Security Suite'],
-                'categories': ['Software', 'Services'],
-                'predicted_purchase_probability': 0.91
-            },
-            'Member3': {
-                'top_products': ['Marketing Analytics Tool', 'Design Software', 'Social Media Manager'],
-                'categories': ['Marketing Tools', 'Software'],
-                'predicted_purchase_probability': 0.79
-            },
-            'Member4': {
-                'top_products': ['CRM System', 'Sales Dashboard', 'Contact Manager'],
-                'categories': ['Business Tools', 'Software'],
-                'predicted_purchase_probability': 0.85
-            }
-        }
+        user_recs = None
+        engine = self._get_recommendation_engine()
+        customer_id = self.registered_users.get(user_identifier, {}).get('customer_id')
+        if engine is not None and customer_id is not None:
+            try:
+                user_recs = engine.recommend(customer_id)
+            except Exception as e:
+                logger.warning(f"Recommendation lookup failed: {e}. Using defaults.")
         
-        user_recs = recommendations.get(user_identifier, {
-            'top_products': ['Premium Plan', 'Extended Support'],
-            'categories': ['Services'],
-            'predicted_purchase_probability': 0.75
-        })
+        if user_recs is None:
+            user_recs = DEFAULT_RECOMMENDATIONS.get(user_identifier, FALLBACK_RECOMMENDATION)
         
         logger.info(f"User: {user_identifier}")
         logger.info(f"Top Products: {', '.join(user_recs['top_products'])}")
@@ -263,9 +340,153 @@ class AuthenticationSystem:
         
         return user_recs
     
+    def _load_model_handle(self, model_path: Optional[str]) -> Any:
+        """Load a per-user model, cached per path (None if it is not available)."""
+        if model_path is None:
+            return None
+        if model_path in self.shared_models:
+            return self.shared_models[model_path]
+        handle = self._model_handles.get(model_path, _NOT_LOADED)
+        if handle is _NOT_LOADED:
+            handle = None
+            if Path(model_path).exists():
+                try:
+                    import joblib
+                    handle = joblib.load(model_path)
+                except Exception as e:
+                    logger.warning(f"Failed to load model {model_path}: {e}")
+            self._model_handles.put(model_path, handle)
+        return handle
+    
+    def _drop_model_handles(self, user: Optional[Dict]):
+        """Forget the loaded models of a registry record so they are reloaded."""
+        for key in ('face_model_path', 'voice_model_path'):
+            if user and user.get(key):
+                self._model_handles.invalidate(user[key])
+                self.shared_models.pop(user[key], None)
+    
+    def _user_model_paths(self) -> List[str]:
+        """Distinct model paths of the registered users."""
+        return sorted({user[key] for user in self.registered_users.values()
+                       for key in ('face_model_path', 'voice_model_path') if user.get(key)})
+    
+    def share_models(self, server) -> Dict[str, Dict]:
+        """
+        Publish the per-user models and the product model to shared memory.
+        
+        Worker processes pass the returned manifest to ``use_shared_models``
+        instead of unpickling a private copy of every model.
+        
+        Args:
+            server: model_server.ModelServer owned by the calling process
+            
+        Returns:
+            The server's manifest
+        """
+        for model_path in self._user_model_paths():
+            handle = self._load_model_handle(model_path)
+            if handle is None:
+                continue
+            try:
+                server.publish(model_path, handle)
+            except TypeError as e:
+                logger.warning(f"Model {model_path} is loaded per process: {e}")
+        
+        engine = self._get_recommendation_engine()
+        if engine is not None:
+            try:
+                engine.share_model(server)
+            except Exception as e:
+                logger.warning(f"Product model is loaded per process: {e}")
+        return server.manifest
+    
+    def use_shared_models(self, manifest: Dict[str, Dict]):
+        """
+        Use models published by ``share_models`` in another process.
+        
+        Args:
+            manifest: ModelServer manifest from the parent process
+        """
+        from model_server import attach
+        
+        paths = set(self._user_model_paths())
+        self.shared_models = attach({name: entry for name, entry in manifest.items()
+                                     if name in paths})
+        self.invalidate_user_decisions()
+        engine = self._get_recommendation_engine()
+        if engine is not None:
+            engine.use_shared_models(manifest)
+    
+    def get_user_decision(self, user_identifier: str) -> UserDecision:
+        """
+        Get the cached per-user decision parts, building them on a miss.
+        
+        Entries expire after ``decision_cache.ttl_seconds`` and are dropped
+        when the registry changes or the recommendation table is reloaded.
+        
+        Args:
+            user_identifier: Authenticated user identifier
+            
+        Returns:
+            UserDecision with the profile projection, recommendations and model handles
+        """
+        engine = self._get_recommendation_engine()
+        if engine is not None:
+            try:
+                generation = engine.refresh()
+            except Exception:
+                generation = None
+            if generation != self._decision_generation:
+                if self._decision_generation is not None:
+                    logger.info("Recommendation table changed; invalidating decision cache")
+                    self.invalidate_user_decisions()
+                self._decision_generation = generation
+        
+        decision = self.decision_cache.get(user_identifier)
+        if decision is None:
+            user = self.registered_users.get(user_identifier)
+            decision = UserDecision(
+                user_info=project_user_info(user) if user is not None else None,
+                products=self.recommend_products(user_identifier),
+                models={
+                    'face': self._load_model_handle(user and user.get('face_model_path')),
+                    'voice': self._load_model_handle(user and user.get('voice_model_path')),
+                }
+            )
+            self.decision_cache.put(user_identifier, decision)
+        return decision
+    
+    def invalidate_user_decisions(self, user_identifier: Optional[str] = None):
+        """
+        Drop cached decision parts and model handles of one user, or of all users.
+        
+        Args:
+            user_identifier: User to invalidate (default: everyone)
+        """
+        if user_identifier is None:
+            self.decision_cache.clear()
+            self._model_handles.clear()
+        else:
+            self.decision_cache.invalidate(user_identifier)
+            self._drop_model_handles(self.registered_users.get(user_identifier))
+        self.decision_cache_invalidations += 1
+    
+    def register_user(self, user_identifier: str, user_info: Dict):
+        """
+        Add or update a registered user.
+        
+        Args:
+            user_identifier: User identifier (e.g. 'Member1')
+            user_info: Registry record (user_id, name, email, department, ...)
+        """
+        self._drop_model_handles(self.registered_users.get(user_identifier))
+        self.registered_users[user_identifier] = user_info
+        self.invalidate_user_decisions(user_identifier)
+        logger.info(f"Registered user: {user_identifier}")
+    
     def authenticate_user(self, user_identifier: str, 
                          face_confidence: Optional[float] = None,
-                         voice_confidence: Optional[float] = None) -> Dict:
+                         voice_confidence: Optional[float] = None) -> AuthenticationResult:
         """
         Perform complete multimodal authentication.
         
@@ -275,85 +496,78 @@ class AuthenticationSystem:
             voice_confidence: Optional simulated voice confidence
             
         Returns:
-            Dictionary with authentication results
+            AuthenticationResult (``to_dict()`` gives the report form)
         """
         logger.info("\n" + "="*70)
         logger.info("INITIATING MULTIMODAL AUTHENTICATION")
         logger.info("="*70)
         logger.info(f"Timestamp: {datetime.now().isoformat()}")
-        logger.info(f"Session: {self.session_id}")
         logger.info(f"User Identifier: {user_identifier}")
         
+        # Per-identity session and failed-attempt limit
+        session, retry_after = self.session_tracker.begin(user_identifier)
+        logger.info(f"Session: {session.session_id} (attempt {session.attempts})")
+        if retry_after:
+            logger.warning(f"\n[FAIL] AUTHENTICATION BLOCKED: {self.config['max_attempts']} failed "
+                           f"attempts within {self.config['attempt_timeout']}s")
+            result = AuthenticationResult(
+                session.session_id, user_identifier, False,
+                VerificationResult.skipped('face', LOCKED_OUT_MESSAGE),
+                VerificationResult.skipped('voice', LOCKED_OUT_MESSAGE),
+                0.0,
+                failure_reason=f"Too many failed attempts; retry in {retry_after:.0f}s"
+            )
+            self.authentication_log.append(result)
+            return result
+        
         # Step 1: Facial Recognition
-        face_success, face_score, face_msg = self.verify_facial_recognition(
-            user_identifier, face_confidence
-        )
+        face_result = self.verify_facial_recognition(user_identifier, face_confidence)
+        face_score = face_result.confidence
         
-        # Step 2: Voice Verification
-        voice_success, voice_score, voice_msg = self.verify_voice_recognition(
-            user_identifier, voice_confidence
-        )
+        # Step 2: Voice Verification (skipped when the face score is decisive)
+        voice_result = VerificationResult.skipped_voice()
+        
+        def run_voice_verification() -> float:
+            nonlocal voice_result
+            voice_result = self.verify_voice_recognition(user_identifier, voice_confidence)
+            return voice_result.confidence
+        
+        decision = self.fusion_engine.decide(face_score, run_voice_verification)
         
         # Step 3: Combined Authentication Decision
         logger.info(f"\n{'='*70}")
         logger.info("AUTHENTICATION DECISION")
         logger.info(f"{'='*70}")
         
-        # Calculate combined confidence
-        combined_confidence = (face_score + voice_score) / 2
+        combined_confidence = decision.combined_confidence
         combined_threshold = self.config['combined_confidence_threshold']
         
         logger.info(f"Face Confidence: {face_score:.2%}")
-        logger.info(f"Voice Confidence: {voice_score:.2%}")
-        logger.info(f"Combined Confidence: {combined_confidence:.2%}")
+        if decision.voice_skipped:
+            logger.info("Voice Confidence: skipped (early decision on face)")
+        else:
+            logger.info(f"Voice Confidence: {voice_result.confidence:.2%}")
+        logger.info(f"Combined Confidence: {combined_confidence:.2%} ({self.fusion_engine.strategy.name})")
         logger.info(f"Combined Threshold: {combined_threshold:.2%}")
         
         # Authentication logic
-        auth_success = face_success and voice_success and (combined_confidence >= combined_threshold)
+        auth_success = decision.accepted
         
-        result = {
-            'session_id': self.session_id,
-            'timestamp': datetime.now().isoformat(),
-            'user_identifier': user_identifier,
-            'authenticated': auth_success,
-            'face_verification': {
-                'success': face_success,
-                'confidence': face_score,
-                'message': face_msg
-            },
-            'voice_verification': {
-                'success': voice_success,
-                'confidence': voice_score,
-                'message': voice_msg
-            },
-            'combined_confidence': combined_confidence,
-            'products': None
-        }
+        result = AuthenticationResult(
+            session.session_id, user_identifier, auth_success,
+            face_result, voice_result, combined_confidence
+        )
+        self.session_tracker.record(user_identifier, auth_success)
         
         # Step 4: Provide recommendations if authenticated
         if auth_success:
             logger.info(f"\n[PASS] AUTHENTICATION SUCCESSFUL")
-            result['status'] = 'AUTHENTICATED'
-            result['products'] = self.recommend_products(user_identifier)
-            
-            # Get user details
-            if user_identifier in self.registered_users:
-                user_info = self.registered_users[user_identifier]
-                result['user_info'] = {
-                    'user_id': user_info['user_id'],
-                    'name': user_info['name'],
-                    'email': user_info['email'],
-                    'department': user_info['department']
-                }
+            user_decision = self.get_user_decision(user_identifier)
+            result.products = user_decision.products
+            result.user_info = user_decision.user_info
         else:
             logger.warning(f"\n[FAIL] AUTHENTICATION FAILED")
-            result['status'] = 'AUTHENTICATION_FAILED'
-            if not face_success:
-                result['failure_reason'] = "Facial recognition verification failed"
-            elif not voice_success:
-                result['failure_reason'] = "Voice verification failed"
-            else:
-                result['failure_reason'] = "Combined confidence below threshold"
+            result.failure_reason = decision.reason
         
         # Log authentication attempt
         self.authentication_log.append(result)
@@ -362,9 +576,9 @@ class AuthenticationSystem:
     
     def get_authentication_report(self) -> Dict:
         """Generate authentication session report."""
-        successful = sum(1 for log in self.authentication_log if log['authenticated'])
+        successful = sum(1 for log in self.authentication_log if log.authenticated)
         failed = len(self.authentication_log) - successful
-        avg_confidence = sum(log['combined_confidence'] for log in self.authentication_log) / len(self.authentication_log) if self.authentication_log else 0
+        avg_confidence = sum(log.combined_confidence for log in self.authentication_log) / len(self.authentication_log) if self.authentication_log else 0
         
         report = {
             'session_id': self.session_id,
@@ -373,8 +587,12 @@ class AuthenticationSystem:
             'failed_authentications': failed,
             'success_rate': successful / len(self.authentication_log) if self.authentication_log else 0,
             'average_confidence': avg_confidence,
+            'fusion': self.fusion_engine.stats(),
+            'sessions': self.session_tracker.stats(),
+            'decision_cache': {**self.decision_cache.stats(),
+                               'invalidations': self.decision_cache_invalidations},
             'configuration': self.config,
-            'attempts': self.authentication_log
+            'attempts': [log.to_dict() for log in self.authentication_log]
         }
         
         return report
@@ -395,87 +613,99 @@ class AuthenticationSystem:
         return report_file
 
 
-def simulate_scenario(system: AuthenticationSystem, scenario_type: str, user_id: str = None):
+def run_scenario(system: AuthenticationSystem, scenario_type: str,
+                 user_id: str = None) -> AuthenticationResult:
     """
-    Simulate authentication scenarios.
+    Run one authentication attempt of a scenario.
     
     Args:
         system: AuthenticationSystem instance
-        scenario_type: Type of scenario ('success', 'unauthorized', 'spoofing', 'random')
-        user_id: Optional specific user ID
+        scenario_type: Scenario in SCENARIO_PROFILES or 'random'
+        user_id: Optional specific user ID (success scenario)
+        
+    Returns:
+        Authentication result, labeled with its scenario
     """
-    logger.info(f"\n\n{'#'*70}")
-    logger.info(f"SCENARIO: {scenario_type.upper()}")
-    logger.info(f"{'#'*70}\n")
+    if scenario_type == 'random':
+        scenario_type = random.choice(list(SCENARIO_PROFILES))
     
     if scenario_type == 'success':
         # Legitimate user authentication
         if user_id is None:
             user_id = random.choice(list(system.registered_users.keys()))
-        
-        result = system.authenticate_user(
-            user_id,
-            face_confidence=round(random.uniform(0.93, 0.99), 4),
-            voice_confidence=round(random.uniform(0.90, 0.98), 4)
-        )
+        identifier = user_id
     
     elif scenario_type == 'unauthorized':
         # Unauthorized user attempting access
-        user_id = 'UnknownUser'
-        
-        result = system.authenticate_user(
-            user_id,
-            face_confidence=round(random.uniform(0.10, 0.40), 4),
-            voice_confidence=round(random.uniform(0.15, 0.35), 4)
-        )
+        identifier = 'UnknownUser'
     
     elif scenario_type == 'spoofing':
         # Attempt to spoof with partial success
         user_id = random.choice(list(system.registered_users.keys()))
-        
-        result = system.authenticate_user(
-            f"SpoofAttempt_{user_id}",
-            face_confidence=round(random.uniform(0.60, 0.82), 4),
-            voice_confidence=round(random.uniform(0.50, 0.75), 4)
-        )
-    
-    elif scenario_type == 'random':
-        # Random scenario
-        scenario = random.choice(['success', 'unauthorized', 'spoofing'])
-        simulate_scenario(system, scenario, user_id)
-        return
+        identifier = f"SpoofAttempt_{user_id}"
     
     else:
+        raise ValueError(f"Unknown scenario type: {scenario_type}")
+    
+    face_confidence, voice_confidence = sample_scores(scenario_type)
+    result = system.authenticate_user(
+        identifier,
+        face_confidence=face_confidence,
+        voice_confidence=voice_confidence
+    )
+    # Ground truth for offline evaluation of the thresholds
+    result.scenario = scenario_type
+    return result
+
+
+def simulate_scenario(system: AuthenticationSystem, scenario_type: str, user_id: str = None):
+    """
+    Simulate authentication scenarios.
+    
+    Args:
+        system: AuthenticationSystem instance
+        scenario_type: Type of scenario ('success', 'unauthorized', 'spoofing', 'random')
+        user_id: Optional specific user ID
+    """
+    if scenario_type == 'random':
+        scenario_type = random.choice(list(SCENARIO_PROFILES))
+    elif scenario_type not in SCENARIO_PROFILES:
         logger.error(f"Unknown scenario type: {scenario_type}")
         return
     
+    logger.info(f"\n\n{'#'*70}")
+    logger.info(f"SCENARIO: {scenario_type.upper()}")
+    logger.info(f"{'#'*70}\n")
+    
+    result = run_scenario(system, scenario_type, user_id)
+    
     # Print result
     print_authentication_result(result)
 
 
-def print_authentication_result(result: Dict):
+def print_authentication_result(result: AuthenticationResult):
     """Pretty print authentication result."""
     print("\n" + "="*70)
     print("AUTHENTICATION RESULT")
     print("="*70)
-    print(f"Status: {result['status']}")
-    print(f"User: {result['user_identifier']}")
-    print(f"Overall Confidence: {result['combined_confidence']:.2%}")
+    print(f"Status: {result.status}")
+    print(f"User: {result.user_identifier}")
+    print(f"Overall Confidence: {result.combined_confidence:.2%}")
     
-    if 'failure_reason' in result:
-        print(f"Reason: {result['failure_reason']}")
+    if not result.authenticated:
+        print(f"Reason: {result.failure_reason}")
     
-    if result['authenticated'] and 'user_info' in result:
+    info = result.user_info
+    if info is not None:
         print(f"\nUser Details:")
-        info = result['user_info']
         print(f"  ID: {info['user_id']}")
         print(f"  Name: {info['name']}")
         print(f"  Email: {info['email']}")
         print(f"  Department: {info['department']}")
         
-        if result['products']:
+        if result.products:
             print(f"\nRecommended Products:")
-            for product in result['products']['top_products']:
+            for product in result.products['top_products']:
                 print(f"  - {product}")
     
     print("="*70 + "\n")
@@ -492,12 +722,13 @@ Examples:
   python main.py --mode single --user Member1   # Authenticate specific user
   python main.py --mode simulate --scenario success  # Run success scenario
   python main.py --mode list-users              # List registered users
+  python main.py --mode load-test --workers 4 --duration 30  # Capacity test
         """
     )
     
     parser.add_argument(
         '--mode',
-        choices=['demo', 'single', 'simulate', 'list-users', 'test'],
+        choices=['demo', 'single', 'simulate', 'list-users', 'test', 'load-test'],
         default='demo',
         help='Operation mode'
     )
@@ -535,10 +766,57 @@ Examples:
         help='Output directory for reports'
     )
     
+    parser.add_argument(
+        '--fusion',
+        choices=['weighted_sum', 'product', 'logistic'],
+        help='Score fusion strategy (overrides config)'
+    )
+    
+    parser.add_argument(
+        '--sequential',
+        action='store_true',
+        help='Decide on the face score alone when it is decisive (skips voice)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Worker processes for load-test mode (default: CPU count)'
+    )
+    
+    parser.add_argument(
+        '--duration',
+        type=float,
+        default=10.0,
+        help='Load test duration in seconds'
+    )
+    
+    parser.add_argument(
+        '--rate',
+        type=float,
+        default=0.0,
+        help='Target load test attempts per second across workers (0: unthrottled)'
+    )
+    
+    parser.add_argument(
+        '--mix',
+        type=str,
+        default='success=0.6,unauthorized=0.2,spoofing=0.2',
+        help='Load test scenario mix'
+    )
+    
     args = parser.parse_args()
     
     # Initialize system
     system = AuthenticationSystem(config_path=args.config)
+    if args.fusion or args.sequential:
+        fusion_config = dict(system.config.get('fusion', {}))
+        if args.fusion:
+            fusion_config['strategy'] = args.fusion
+        if args.sequential:
+            fusion_config['sequential'] = {**fusion_config.get('sequential', {}), 'enabled': True}
+        system.config['fusion'] = fusion_config
+        system.fusion_engine = FusionEngine(system.config)
     
     # Execute based on mode
     if args.mode == 'demo':
@@ -584,8 +862,24 @@ Examples:
             result = system.authenticate_user(user)
             print_authentication_result(result)
     
+    elif args.mode == 'load-test':
+        from load_test import run_load_test, save_load_test_report
+        
+        from model_server import ModelServer
+        
+        # Build the recommendation table once and share the models with the
+        # workers, so each worker attaches instead of unpickling its own copy
+        system.recommend_products(next(iter(system.registered_users)))
+        with ModelServer() as server:
+            report = run_load_test(system.config, config_path=args.config,
+                                   workers=args.workers, duration=args.duration,
+                                   rate=args.rate, mix=args.mix,
+                                   shared_models=system.share_models(server))
+        save_load_test_report(report, output_dir=args.output)
+    
     # Save report
-    system.save_report(output_dir=args.output)
+    if args.mode != 'load-test':
+        system.save_report(output_dir=args.output)
     
     logger.info("\n" + "="*70)
     logger.info("EXECUTION COMPLETE")
@@ -0,0 +1,431 @@
+"""
+Shared-Memory Model Serving
+===========================
+Loads model artifacts once in a parent process and shares them with worker
+processes without copying.
+
+Unpickling a RandomForest in every worker of a multi-process deployment
+gives each worker a private copy of every tree, so memory grows linearly
+with the worker count. ``ModelServer`` instead flattens each artifact into
+plain NumPy arrays:
+
+- tree ensembles (RandomForest / DecisionTree classifiers): the node arrays
+  of all trees concatenated (children, split feature, threshold, normalized
+  leaf class distributions)
+- scalers and encoders (StandardScaler, LabelEncoder, ProductFeatureEncoder):
+  their fitted parameters
+
+and publishes the arrays of each model in one ``multiprocessing.shared_memory``
+block. The returned manifest is small and picklable; workers pass it to
+``attach`` and get read-only array views directly on the shared pages, plus
+lightweight model objects with the usual ``predict_proba`` / ``transform``
+methods. ``SharedForest.predict_proba`` traverses all trees at once with
+vectorized NumPy indexing and matches scikit-learn's output.
+
+``main.py --mode load-test`` publishes the registered users' models and the
+recommendation table's product model with ``AuthenticationSystem.share_models``;
+each load-test worker attaches to them with ``use_shared_models``.
+
+Usage:
+    with ModelServer() as server:
+        manifest = system.share_models(server)
+        run_load_test(system.config, shared_models=manifest)
+
+    python model_server.py --benchmark 4      # RSS of 1..4 workers, pickled vs shared
+"""
+
+import os
+import time
+import logging
+import argparse
+import tempfile
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+ALIGNMENT = 64
+# Samples traversed together; bounds the (samples x trees) index matrix
+PREDICT_CHUNK = 4096
+
+
+def pack_forest(model) -> Tuple[Dict[str, np.ndarray], Dict]:
+    """
+    Flatten a fitted tree ensemble classifier into node arrays.
+
+    Child indices are made global (offset by each tree's first node) so all
+    trees live in one set of arrays; leaves have ``left == -1``.
+
+    Args:
+        model: Fitted RandomForestClassifier or DecisionTreeClassifier
+
+    Returns:
+        Tuple of (arrays, metadata)
+    """
+    estimators = getattr(model, 'estimators_', [model])
+    roots, left, right, feature, threshold, value = [], [], [], [], [], []
+    offset = 0
+    for estimator in estimators:
+        tree = estimator.tree_
+        is_leaf = tree.children_left == -1
+        roots.append(offset)
+        left.append(np.where(is_leaf, -1, tree.children_left + offset))
+        right.append(np.where(is_leaf, -1, tree.children_right + offset))
+        feature.append(np.where(is_leaf, 0, tree.feature))
+        threshold.append(tree.threshold)
+        counts = tree.value[:, 0, :]
+        value.append(counts / counts.sum(axis=1, keepdims=True))
+        offset += tree.node_count
+
+    arrays = {
+        'roots': np.array(roots, dtype=np.int64),
+        'left': np.concatenate(left).astype(np.int64),
+        'right': np.concatenate(right).astype(np.int64),
+        'feature': np.concatenate(feature).astype(np.int64),
+        'threshold': np.concatenate(threshold).astype(np.float64),
+        'value': np.concatenate(value).astype(np.float64),
+    }
+    meta = {
+        'kind': 'forest',
+        'classes': [c.item() if hasattr(c, 'item') else c for c in model.classes_],
+        'n_features': int(model.n_features_in_),
+        'max_depth': int(max(e.tree_.max_depth for e in estimators)),
+    }
+    return arrays, meta
+
+
+def pack_artifact(artifact) -> Tuple[Dict[str, np.ndarray], Dict]:
+    """
+    Flatten a supported model artifact into arrays and metadata.
+
+    Args:
+        artifact: Fitted tree classifier, StandardScaler, LabelEncoder or
+            ProductFeatureEncoder
+
+    Returns:
+        Tuple of (arrays, metadata)
+    """
+    from recommendation_engine import ProductFeatureEncoder
+
+    if hasattr(artifact, 'tree_') or hasattr(artifact, 'estimators_'):
+        return pack_forest(artifact)
+    if isinstance(artifact, ProductFeatureEncoder):
+        return ({'means': artifact.means, 'scales': artifact.scales},
+                {'kind': 'product_encoder', 'categories': artifact.categories})
+    if hasattr(artifact, 'mean_') and hasattr(artifact, 'scale_'):
+        return ({'mean': artifact.mean_, 'scale': artifact.scale_}, {'kind': 'scaler'})
+    if hasattr(artifact, 'classes_'):
+        return ({}, {'kind': 'label_encoder', 'classes': np.asarray(artifact.classes_).tolist()})
+    raise TypeError(f"Unsupported model artifact: {type(artifact).__name__}")
+
+
+class SharedForest:
+    """Tree ensemble classifier evaluated from shared node arrays."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], meta: Dict):
+        self.arrays = arrays
+        self.classes_ = np.array(meta['classes'])
+        self.n_features_in_ = meta['n_features']
+        self.max_depth = meta['max_depth']
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Average the leaf class distributions of all trees.
+
+        Args:
+            X: Feature matrix (n_samples x n_features)
+
+        Returns:
+            Class probabilities (n_samples x n_classes)
+        """
+        a = self.arrays
+        # scikit-learn compares float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        proba = np.empty((X.shape[0], len(self.classes_)))
+        for start in range(0, X.shape[0], PREDICT_CHUNK):
+            chunk = X[start:start + PREDICT_CHUNK]
+            rows = np.arange(chunk.shape[0])[:, None]
+            node = np.broadcast_to(a['roots'], (chunk.shape[0], len(a['roots']))).copy()
+            for _ in range(self.max_depth):
+                left = a['left'][node]
+                go_left = chunk[rows, a['feature'][node]] <= a['threshold'][node]
+                node = np.where(left < 0, node, np.where(go_left, left, a['right'][node]))
+            proba[start:start + PREDICT_CHUNK] = a['value'][node].mean(axis=1)
+        return proba
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+class SharedScaler:
+    """Standardization with shared parameters (StandardScaler.transform)."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], meta: Dict):
+        self.mean_ = arrays['mean']
+        self.scale_ = arrays['scale']
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        return (np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_
+
+
+class SharedLabelEncoder:
+    """Label decoding (LabelEncoder.inverse_transform)."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], meta: Dict):
+        self.classes_ = np.array(meta['classes'])
+
+    def inverse_transform(self, y: np.ndarray) -> np.ndarray:
+        return self.classes_[np.asarray(y)]
+
+
+def _shared_product_encoder(arrays: Dict[str, np.ndarray], meta: Dict):
+    from recommendation_engine import ProductFeatureEncoder
+
+    encoder = ProductFeatureEncoder()
+    encoder.means, encoder.scales = arrays['means'], arrays['scales']
+    encoder.categories = meta['categories']
+    return encoder
+
+
+_ATTACHERS = {
+    'forest': SharedForest,
+    'scaler': SharedScaler,
+    'label_encoder': SharedLabelEncoder,
+    'product_encoder': _shared_product_encoder,
+}
+
+
+# Blocks published or attached in this process, kept open for the lifetime of the views
+_attached: Dict[str, shared_memory.SharedMemory] = {}
+
+
+class ModelServer:
+    """Publishes model artifacts into shared memory (owned by the parent process)."""
+
+    def __init__(self):
+        self.manifest: Dict[str, Dict] = {}
+        self._blocks: List[shared_memory.SharedMemory] = []
+
+    def publish(self, name: str, artifact) -> Dict:
+        """
+        Publish an artifact (or a dict of artifacts, e.g. ``model.pkl``).
+
+        Args:
+            name: Model name; dict entries are published as ``name.key``
+            artifact: Fitted artifact or dict of artifacts
+
+        Returns:
+            The manifest entries added
+        """
+        if isinstance(artifact, dict):
+            added = {}
+            for key, value in artifact.items():
+                added.update(self.publish(f"{name}.{key}", value))
+            return added
+
+        arrays, meta = pack_artifact(artifact)
+        layout, size = {}, 0
+        for key, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            layout[key] = (size, array.dtype.str, array.shape)
+            size += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+        block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for key, array in arrays.items():
+            offset, dtype, shape = layout[key]
+            np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset)[...] = array
+        self._blocks.append(block)
+        _attached[block.name] = block
+
+        self.manifest[name] = {'block': block.name, 'layout': layout, 'meta': meta,
+                               'nbytes': size}
+        logger.info(f"✓ Published {name} ({meta['kind']}, {size / 1e6:.1f} MB) in {block.name}")
+        return {name: self.manifest[name]}
+
+    def close(self):
+        """Release and unlink all shared blocks."""
+        for block in self._blocks:
+            _attached.pop(block.name, None)
+            block.close()
+            block.unlink()
+        self._blocks = []
+        self.manifest = {}
+
+    def __enter__(self) -> 'ModelServer':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach(manifest: Dict[str, Dict]) -> Dict[str, Any]:
+    """
+    Attach to published models without copying their arrays.
+
+    Args:
+        manifest: ``ModelServer.manifest`` from the parent process
+
+    Returns:
+        Model name -> model object backed by the shared arrays
+    """
+    models = {}
+    for name, entry in manifest.items():
+        block = _attached.get(entry['block'])
+        if block is None:
+            # The parent owns and unlinks the block. Child processes share the
+            # parent's resource tracker, so their registration is harmless;
+            # Python 3.13+ can skip it for unrelated processes.
+            try:
+                block = shared_memory.SharedMemory(name=entry['block'], track=False)
+            except TypeError:
+                block = shared_memory.SharedMemory(name=entry['block'])
+            _attached[entry['block']] = block
+
+        arrays = {}
+        for key, (offset, dtype, shape) in entry['layout'].items():
+            view = np.ndarray(tuple(shape), dtype=dtype, buffer=block.buf, offset=offset)
+            view.flags.writeable = False
+            arrays[key] = view
+        models[name] = _ATTACHERS[entry['meta']['kind']](arrays, entry['meta'])
+    return models
+
+
+# ----------------------------------------------------------------------------
+# Memory benchmark
+# ----------------------------------------------------------------------------
+
+def memory_usage() -> Dict[str, float]:
+    """
+    Memory of the current process in MB.
+
+    ``rss`` counts shared pages in every process that touches them; ``pss``
+    divides them among the sharing processes and ``private`` excludes them.
+    """
+    usage = {}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                parts = line.split()
+                if parts[0] in ('Rss:', 'Pss:', 'Private_Clean:', 'Private_Dirty:'):
+                    usage[parts[0][:-1]] = int(parts[1]) / 1024
+        return {'rss': usage['Rss'], 'pss': usage['Pss'],
+                'private': usage['Private_Clean'] + usage['Private_Dirty']}
+    except (OSError, KeyError):
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        return {'rss': rss, 'pss': rss, 'private': rss}
+
+
+def _benchmark_worker(mode: str, source: Any, X: np.ndarray, ready, release, results):
+    """Load the model (unpickle or attach), score once and report memory."""
+    before = memory_usage()
+    start = time.perf_counter()
+    if mode == 'pickle':
+        import joblib
+        model = joblib.load(source)['model']
+    else:
+        model = attach(source)['product.model']
+    load_seconds = time.perf_counter() - start
+    proba = model.predict_proba(X)
+    after = memory_usage()
+
+    # Measure while every worker holds its model, so shared pages are split
+    ready.wait()
+    shared = memory_usage()
+    results.put({'load_seconds': load_seconds, 'checksum': float(proba.sum()),
+                 'model_mb': after['private'] - before['private'], **shared})
+    release.wait()
+
+
+def _run_workers(mode: str, source: Any, X: np.ndarray, workers: int) -> Dict:
+    ctx = mp.get_context('spawn')
+    ready, release = ctx.Barrier(workers), ctx.Event()
+    results = ctx.Queue()
+    processes = [ctx.Process(target=_benchmark_worker,
+                             args=(mode, source, X, ready, release, results))
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    reports = [results.get(timeout=600) for _ in processes]
+    release.set()
+    for process in processes:
+        process.join()
+    return {
+        'workers': workers,
+        'per_worker_private_mb': float(np.mean([r['private'] for r in reports])),
+        'per_worker_model_mb': float(np.mean([r['model_mb'] for r in reports])),
+        'total_pss_mb': float(sum(r['pss'] for r in reports)),
+        'total_rss_mb': float(sum(r['rss'] for r in reports)),
+        'load_seconds': float(np.mean([r['load_seconds'] for r in reports])),
+        'checksums': sorted({round(r['checksum'], 6) for r in reports}),
+    }
+
+
+def benchmark(max_workers: int = 4, rows: int = 20000, seed: int = 42) -> Dict:
+    """
+    Compare worker memory when each worker unpickles the model vs attaches to it.
+
+    A product model (ProductFeatureEncoder + 200-tree RandomForest) is trained
+    on ``rows`` synthetic customers so the forest is large enough to measure.
+
+    Args:
+        max_workers: Largest worker count (runs 1..max_workers)
+        rows: Synthetic training rows
+        seed: Random seed
+
+    Returns:
+        Dictionary of per-mode, per-worker-count memory results
+    """
+    import joblib
+    from recommendation_engine import TARGET, synthetic_customers, train_product_model
+
+    df = pd.read_csv(Path(__file__).resolve().parent / 'product_recommendation' / 'merged_dataset.csv')
+    train = synthetic_customers(df, rows, seed)
+    train[TARGET] = np.random.default_rng(seed).choice(df[TARGET].unique(), rows)
+    encoder, model = train_product_model(train)
+    X = encoder.transform(synthetic_customers(df, 2000, seed + 1))
+
+    results = {'rows': rows, 'pickle': [], 'shared': []}
+    with tempfile.TemporaryDirectory() as tmp, ModelServer() as server:
+        model_path = os.path.join(tmp, 'model.pkl')
+        joblib.dump({'encoder': encoder, 'model': model}, model_path)
+        server.publish('product', {'encoder': encoder, 'model': model})
+        results['model_file_mb'] = os.path.getsize(model_path) / 1e6
+        results['shared_mb'] = sum(e['nbytes'] for e in server.manifest.values()) / 1e6
+
+        expected = round(float(model.predict_proba(X).sum()), 6)
+        for workers in range(1, max_workers + 1):
+            for mode, source in (('pickle', model_path), ('shared', server.manifest)):
+                r = _run_workers(mode, source, X, workers)
+                r['matches_sklearn'] = r.pop('checksums') == [expected]
+                results[mode].append(r)
+                logger.info(f"  {mode:<6} {workers} worker(s) | private/worker "
+                            f"{r['per_worker_private_mb']:7.1f} MB (model {r['per_worker_model_mb']:6.1f} MB) | "
+                            f"total PSS {r['total_pss_mb']:7.1f} MB | load {r['load_seconds'] * 1000:6.1f} ms | "
+                            f"matches sklearn: {r['matches_sklearn']}")
+    return results
+
+
+def main():
+    """Main execution function."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser(description='Shared-memory model serving')
+    parser.add_argument('--benchmark', type=int, metavar='WORKERS', default=4,
+                        help='Compare memory for 1..WORKERS worker processes')
+    parser.add_argument('--rows', type=int, default=20000,
+                        help='Synthetic rows used to train the benchmark forest')
+    args = parser.parse_args()
+    benchmark(args.benchmark, args.rows)
+
+
+if __name__ == "__main__":
+    main()
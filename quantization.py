@@ -0,0 +1,485 @@
+"""
+Reduced-Precision Features
+==========================
+Float32, float16 and 8-bit storage of face and voice features, with template
+scoring that runs directly on the stored values.
+
+Precisions (``PRECISIONS``):
+
+- ``float64``: the original pipeline (baseline)
+- ``float32``: extractors emit float32 and every later step keeps it
+- ``float16``: float32 extraction, half-precision storage of the normalized
+  features; scoring computes in float32
+- ``uint8``: float32 extraction, 8-bit codes of the normalized features.
+  ``code = round(255 * value)``. Because each column is min-max normalized
+  first, the code's per-column scale is ``(max - min) / 255`` of the raw
+  feature. Scoring computes in float32 on the codes directly; the common
+  1/255 factor cancels in the cosine similarity.
+
+Raw features (Laplacian variance, channel statistics) exceed the float16
+range, so float16 and uint8 apply only after normalization. This is where
+``MultimodalIntegrator`` stores them (``--precision``).
+
+``TemplateStore`` enrolls one template per identity (the mean of its
+samples) and scores probes by cosine similarity of vectors centered on the
+enrollment mean. Templates are kept at the store's precision.
+
+``evaluate`` runs the pipeline at every precision on seeded synthetic
+identities: extraction, normalization, storage, enrollment and scoring. It
+reports accuracy deltas against float64, memory and scoring throughput.
+
+Usage:
+    python quantization.py                              # Report for all precisions
+    python quantization.py --identities 20 --samples 30 --probes 50000
+"""
+
+import os
+import json
+import time
+import logging
+import argparse
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PRECISIONS = ('float64', 'float32', 'float16', 'uint8')
+UINT8_LEVELS = 255
+SCORE_CHUNK = 8192
+
+
+def storage_dtype(precision: str) -> np.dtype:
+    """Dtype features are stored in at a precision."""
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision '{precision}' (choose from {', '.join(PRECISIONS)})")
+    return np.dtype(precision)
+
+
+def extraction_dtype(precision: str) -> np.dtype:
+    """Dtype the feature extractors emit at a precision."""
+    return np.dtype(np.float64) if storage_dtype(precision) == np.float64 else np.dtype(np.float32)
+
+
+def compute_dtype(precision: str) -> np.dtype:
+    """Dtype scoring computes in at a precision."""
+    return extraction_dtype(precision)
+
+
+def cast_features(df: pd.DataFrame, precision: str) -> pd.DataFrame:
+    """
+    Store the normalized numeric columns of a frame at a precision.
+
+    Args:
+        df: Frame whose numeric columns are normalized to [0, 1]
+        precision: One of PRECISIONS
+
+    Returns:
+        Frame with numeric columns in the storage dtype (uint8 holds codes)
+    """
+    dtype = storage_dtype(precision)
+    numeric_cols = df.select_dtypes(include=[np.number]).columns
+    if dtype == np.uint8:
+        values = np.rint(df[numeric_cols].to_numpy(np.float32) * UINT8_LEVELS)
+        cast = pd.DataFrame(np.clip(values, 0, UINT8_LEVELS).astype(np.uint8),
+                            columns=numeric_cols, index=df.index)
+    else:
+        cast = df[numeric_cols].astype(dtype)
+    df = df.copy()
+    df[numeric_cols] = cast
+    return df
+
+
+def decode_frame(df: pd.DataFrame, precision: str) -> pd.DataFrame:
+    """
+    Frame with uint8 codes decoded back to normalized float32 values.
+
+    Other precisions are returned unchanged.
+
+    Args:
+        df: Frame produced by ``cast_features``
+        precision: Precision the frame is stored at
+
+    Returns:
+        Frame whose numeric columns hold values in [0, 1]
+    """
+    if storage_dtype(precision) != np.uint8:
+        return df
+    numeric_cols = df.select_dtypes(include=[np.number]).columns
+    df = df.copy()
+    df[numeric_cols] = decode_features(df[numeric_cols].to_numpy(), precision)
+    return df
+
+
+def decode_features(values: np.ndarray, precision: str) -> np.ndarray:
+    """
+    Normalized feature values of stored features (uint8 codes are rescaled).
+
+    Args:
+        values: Stored feature matrix
+        precision: Precision the values are stored at
+
+    Returns:
+        Values in the precision's compute dtype
+    """
+    values = np.asarray(values).astype(compute_dtype(precision))
+    if storage_dtype(precision) == np.uint8:
+        values /= UINT8_LEVELS
+    return values
+
+
+class TemplateStore:
+    """Per-identity templates scored by centered cosine similarity."""
+
+    def __init__(self, precision: str = 'float64'):
+        """
+        Initialize the store.
+
+        Args:
+            precision: Storage precision of templates (one of PRECISIONS)
+        """
+        self.precision = precision
+        self.dtype = storage_dtype(precision)
+        self.compute = compute_dtype(precision)
+        self.labels: np.ndarray = np.array([])
+        self.templates: Optional[np.ndarray] = None
+        self._center = None
+        self._unit_templates = None
+
+    def enroll(self, features: np.ndarray, labels: Sequence[str]):
+        """
+        Build one template per identity from stored features.
+
+        Args:
+            features: Feature matrix in the store's storage dtype
+            labels: Identity of each row
+        """
+        X = np.asarray(features).astype(self.compute)
+        labels = np.asarray(labels)
+        self.labels, inverse = np.unique(labels, return_inverse=True)
+        sums = np.zeros((len(self.labels), X.shape[1]), dtype=np.float64)
+        np.add.at(sums, inverse, X)
+        means = sums / np.bincount(inverse)[:, None]
+        if self.dtype == np.uint8:
+            means = np.clip(np.rint(means), 0, UINT8_LEVELS)
+        self.templates = means.astype(self.dtype)
+
+        self._center = X.mean(axis=0, dtype=np.float64).astype(self.compute)
+        self._unit_templates = self._unit(self.templates)
+
+    def _unit(self, X: np.ndarray) -> np.ndarray:
+        """Center and L2-normalize rows in the compute dtype."""
+        X = np.asarray(X).astype(self.compute) - self._center
+        norms = np.linalg.norm(X, axis=1, keepdims=True)
+        return X / np.maximum(norms, np.finfo(self.compute).tiny)
+
+    def score(self, probes: np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity of every probe to every template.
+
+        Args:
+            probes: Feature matrix in the store's storage dtype
+
+        Returns:
+            Similarities (n_probes x n_identities)
+        """
+        if self.templates is None:
+            raise RuntimeError("No templates enrolled")
+        probes = np.asarray(probes)
+        scores = np.empty((len(probes), len(self.labels)), dtype=self.compute)
+        for start in range(0, len(probes), SCORE_CHUNK):
+            chunk = self._unit(probes[start:start + SCORE_CHUNK])
+            scores[start:start + SCORE_CHUNK] = chunk @ self._unit_templates.T
+        return scores
+
+    def identify(self, probes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Best-matching identity of each probe.
+
+        Returns:
+            Tuple of (labels, similarities)
+        """
+        scores = self.score(probes)
+        best = np.argmax(scores, axis=1)
+        return self.labels[best], scores[np.arange(len(best)), best]
+
+    @property
+    def nbytes(self) -> int:
+        return 0 if self.templates is None else self.templates.nbytes
+
+
+# ----------------------------------------------------------------------------
+# Evaluation
+# ----------------------------------------------------------------------------
+
+def synthetic_face_samples(identities: int, samples: int,
+                           seed: int = 42) -> Tuple[List[np.ndarray], List[str]]:
+    """Several photos per identity: one base face with lighting, shift and noise changes."""
+    from benchmarks import synthetic_images
+
+    rng = np.random.default_rng(seed)
+    images, labels = [], []
+    for identity, base in enumerate(synthetic_images(identities, seed=seed)):
+        for _ in range(samples):
+            img = base * rng.uniform(0.85, 1.15) + rng.normal(0, 6, base.shape)
+            img = np.roll(img, tuple(rng.integers(-4, 5, 2)), axis=(0, 1))
+            images.append(np.clip(img, 0, 255).astype(np.uint8))
+            labels.append(f'Member{identity + 1}')
+    return images, labels
+
+
+def synthetic_voice_samples(identities: int, samples: int, sr: int = 22050,
+                            seed: int = 42) -> Tuple[List[np.ndarray], List[str]]:
+    """Several one-second clips per speaker with a speaker-specific pitch and timbre."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(sr) / sr
+    clips, labels = [], []
+    for identity in range(identities):
+        f0, weights = rng.uniform(90, 250), rng.uniform(0.2, 1.0, 6)
+        for _ in range(samples):
+            phase = 2 * np.pi * f0 * rng.uniform(0.97, 1.03) * (t + 0.002 * np.sin(2 * np.pi * 5 * t))
+            y = sum(w * np.sin(k * phase) for k, w in enumerate(weights, 1))
+            y = y * np.hanning(len(t)) + rng.normal(0, rng.uniform(0.01, 0.04), len(t))
+            clips.append((0.3 * y / np.abs(y).max()).astype(np.float32))
+            labels.append(f'Speaker{identity + 1}')
+    return clips, labels
+
+
+def _split(labels: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Enroll the first half of each identity's samples, probe with the rest."""
+    labels = np.asarray(labels)
+    enroll = np.zeros(len(labels), dtype=bool)
+    for label in np.unique(labels):
+        rows = np.flatnonzero(labels == label)
+        enroll[rows[:len(rows) // 2]] = True
+    return enroll, ~enroll
+
+
+def _timed_score(store: TemplateStore, probes: np.ndarray, n: int, repeat: int = 3) -> float:
+    """Probes scored per second on ``n`` probes (best of ``repeat``)."""
+    probes = np.resize(probes, (n, probes.shape[1]))
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        store.identify(probes)
+        best = min(best, time.perf_counter() - start)
+    return n / best
+
+
+def evaluate_modality(name: str, extract, inputs: List, labels: List[str],
+                      precisions: Sequence[str] = PRECISIONS, probes: int = 20000) -> Dict:
+    """
+    Run one modality through extraction, storage and scoring at each precision.
+
+    Args:
+        name: Modality name
+        extract: Callable(input, dtype) returning a feature vector
+        inputs: Images or clips
+        labels: Identity of each input
+        precisions: Precisions to evaluate (float64 is always the baseline)
+        probes: Probe rows used for the throughput measurement
+
+    Returns:
+        Dictionary of per-precision results
+    """
+    from data_integration import MultimodalIntegrator
+
+    integrator = MultimodalIntegrator()
+    enroll, probe = _split(labels)
+    labels = np.asarray(labels)
+    precisions = ['float64'] + [p for p in precisions if p != 'float64']
+
+    extracted, results, baseline = {}, {}, None
+    for precision in precisions:
+        dtype = extraction_dtype(precision)
+        if dtype not in extracted:
+            start = time.perf_counter()
+            raw = pd.DataFrame(np.stack([extract(x, dtype) for x in inputs]))
+            extracted[dtype] = (raw, len(inputs) / (time.perf_counter() - start))
+        raw, extract_rate = extracted[dtype]
+
+        normalized = integrator.normalize_features(raw)
+        stored = cast_features(normalized, precision).to_numpy()
+        store = TemplateStore(precision)
+        store.enroll(stored[enroll], labels[enroll])
+        predicted, _ = store.identify(stored[probe])
+        scores = store.score(stored[probe]).astype(np.float64)
+        features = decode_features(stored, precision).astype(np.float64)
+
+        result = {
+            'feature_dtype': str(stored.dtype),
+            'feature_bytes_per_sample': stored.nbytes / len(stored),
+            'template_bytes': store.nbytes,
+            'extract_per_sec': extract_rate,
+            'score_probes_per_sec': _timed_score(store, stored[probe], probes),
+            'identification_accuracy': float(np.mean(predicted == labels[probe])),
+        }
+        if baseline is None:
+            baseline = {'features': features, 'scores': scores, 'predicted': predicted}
+        else:
+            result.update({
+                'max_abs_feature_delta': float(np.abs(features - baseline['features']).max()),
+                'max_abs_score_delta': float(np.abs(scores - baseline['scores']).max()),
+                'mean_abs_score_delta': float(np.abs(scores - baseline['scores']).mean()),
+                'top1_agreement': float(np.mean(predicted == baseline['predicted'])),
+            })
+        results[precision] = result
+
+    base = results['float64']
+    logger.info(f"{name.upper()} ({raw.shape[1]} features, {len(inputs)} samples, "
+                f"{len(np.unique(labels))} identities)")
+    for precision, r in results.items():
+        deltas = (f" | max |Δscore| {r['max_abs_score_delta']:.2e} | top-1 agreement "
+                  f"{r['top1_agreement']:.1%}" if precision != 'float64' else '')
+        logger.info(f"  {precision:<8} {r['feature_bytes_per_sample']:6.0f} B/sample "
+                    f"({r['feature_bytes_per_sample'] / base['feature_bytes_per_sample']:.3f}x) | "
+                    f"score {r['score_probes_per_sec']:10,.0f} probes/s "
+                    f"({r['score_probes_per_sec'] / base['score_probes_per_sec']:.2f}x) | "
+                    f"accuracy {r['identification_accuracy']:.1%}{deltas}")
+    return results
+
+
+def integration_footprint(base_path: str = ".", precisions: Sequence[str] = PRECISIONS,
+                          seed: int = 42) -> Dict:
+    """
+    Memory and output size of ``MultimodalIntegrator.integrate`` at each precision.
+
+    Uses the tabular dataset under ``base_path`` with generated image and
+    audio feature files. ``stage_bytes`` is the size of the cached image and
+    audio stage artifacts, which hold the features at the stored precision
+    (uint8 codes); the merged dataset decodes uint8 to float32.
+
+    Args:
+        base_path: Root path for the project (as for MultimodalIntegrator)
+        precisions: Precisions to integrate at
+        seed: Random seed of the generated feature files
+
+    Returns:
+        Precision -> memory and file sizes in bytes
+    """
+    from data_integration import MultimodalIntegrator
+
+    tabular_path = Path(base_path) / 'product_recommendation' / 'merged_dataset.csv'
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='precision_') as tmp:
+        base = Path(tmp)
+        (base / 'product_recommendation').mkdir()
+        tabular = pd.read_csv(tabular_path)
+        tabular.to_csv(base / 'product_recommendation' / 'merged_dataset.csv', index=False)
+        (base / 'face_recognition' / 'features').mkdir(parents=True)
+        rng = np.random.default_rng(seed)
+        generator = MultimodalIntegrator(str(base))
+        generator.create_sample_image_features(len(tabular), rng).to_csv(
+            base / 'face_recognition' / 'features' / 'image_features.csv', index=False)
+        generator.create_sample_audio_features(len(tabular), rng).to_csv(
+            base / 'audio_features.csv', index=False)
+
+        for precision in precisions:
+            output = base / f'output_{precision}'
+            integrator = MultimodalIntegrator(str(base), precision=precision)
+            integrated = integrator.integrate(output_dir=str(output))
+            features = integrated[[c for c in integrated.columns
+                                   if c.startswith(('img_', 'audio_'))]]
+            results[precision] = {
+                'stage_bytes': sum(os.path.getsize(integrator.stage_cache.artifact_path(stage))
+                                   for stage in ('image', 'audio')),
+                'feature_memory_bytes': int(features.memory_usage(index=False).sum()),
+                'csv_bytes': os.path.getsize(output / 'integrated_features.csv'),
+            }
+    return results
+
+
+def evaluate(identities: int = 10, samples: int = 20, probes: int = 20000,
+             precisions: Sequence[str] = PRECISIONS, seed: int = 42,
+             base_path: str = ".") -> Dict:
+    """
+    Compare every precision against the float64 pipeline.
+
+    Args:
+        identities: Synthetic identities per modality
+        samples: Samples per identity (half enrolled, half probed)
+        probes: Probe rows used for throughput measurement
+        precisions: Precisions to evaluate
+        seed: Random seed
+        base_path: Root path for the project (tabular dataset location)
+
+    Returns:
+        Report dictionary
+    """
+    from feature_extraction import extract_audio_features, extract_image_features
+
+    # Keep the integrator's per-step logging out of the report
+    integration_logger = logging.getLogger('data_integration')
+    level = integration_logger.level
+    integration_logger.setLevel(logging.WARNING)
+    try:
+        images, face_labels = synthetic_face_samples(identities, samples, seed)
+        clips, voice_labels = synthetic_voice_samples(identities, samples, seed=seed)
+        report = {
+            'timestamp': datetime.now().isoformat(),
+            'identities': identities,
+            'samples_per_identity': samples,
+            'face': evaluate_modality(
+                'face', lambda img, dtype: extract_image_features(img, dtype=dtype),
+                images, face_labels, precisions, probes),
+            'voice': evaluate_modality(
+                'voice', lambda y, dtype: extract_audio_features(y, 22050, dtype=dtype),
+                clips, voice_labels, precisions, probes),
+            'integration': integration_footprint(base_path, precisions, seed),
+        }
+    finally:
+        integration_logger.setLevel(level)
+
+    integration = report['integration']
+    base = integration['float64']
+    logger.info("INTEGRATED IMAGE + AUDIO FEATURES")
+    for precision, r in integration.items():
+        logger.info(f"  {precision:<8} stage artifacts {r['stage_bytes'] / 1024:8.1f} KB "
+                    f"({r['stage_bytes'] / base['stage_bytes']:.3f}x) | merged "
+                    f"{r['feature_memory_bytes'] / 1024:8.1f} KB in memory "
+                    f"({r['feature_memory_bytes'] / base['feature_memory_bytes']:.3f}x) | "
+                    f"integrated_features.csv {r['csv_bytes'] / 1024:8.1f} KB")
+    return report
+
+
+def main():
+    """Main execution function."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser(description='Reduced-precision feature report')
+    parser.add_argument('--precisions', type=str, default=','.join(PRECISIONS),
+                        help='Comma-separated precisions to compare with float64')
+    parser.add_argument('--identities', type=int, default=10,
+                        help='Synthetic identities per modality')
+    parser.add_argument('--samples', type=int, default=20,
+                        help='Samples per identity')
+    parser.add_argument('--probes', type=int, default=20000,
+                        help='Probe rows used for scoring throughput')
+    parser.add_argument('--base-path', type=str, default='.',
+                        help='Project root containing product_recommendation/')
+    parser.add_argument('--output', type=str, default='output/precision_report.json',
+                        help='Report path')
+    args = parser.parse_args()
+
+    precisions = [p.strip() for p in args.precisions.split(',') if p.strip()]
+    for precision in precisions:
+        storage_dtype(precision)
+    report = evaluate(args.identities, args.samples, args.probes, precisions,
+                      base_path=args.base_path)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"✓ Report saved: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,617 @@
+"""
+Product Recommendation Engine
+=============================
+Serves product-category recommendations from a precomputed top-k table.
+
+Offline, the product-category classifier from Product_recommendation.ipynb
+(Random Forest over scaled numeric columns plus one-hot social platform and
+review sentiment) is trained on merged_dataset.csv and every customer is
+scored in batch. The top-k categories and probabilities per customer are
+written to a compact table of .npy arrays that is memory-mapped at serve time,
+so a lookup is a dictionary probe plus a row read.
+
+Online, lookups and on-demand scores are kept in an LRU cache. The source
+dataset is re-checked at most every ``ttl_seconds``; when it changes the
+table is rebuilt and the cache invalidated.
+
+Each build goes into a new generation directory under the table directory
+and is published by atomically replacing ``index.json``, which names the
+generation. Readers that have the previous arrays memory-mapped keep a
+consistent table, and rebuilds from several processes (e.g. load-test
+workers) are serialized with a lock file.
+
+Usage:
+    python recommendation_engine.py --build       # Build the table
+    python recommendation_engine.py --customer A151
+    python recommendation_engine.py --benchmark 1000000
+"""
+
+import os
+import json
+import time
+import shutil
+import logging
+import argparse
+import contextlib
+import pandas as pd
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from cache_utils import LRUCache
+from data_integration import hash_file
+
+logger = logging.getLogger(__name__)
+
+NUMERIC_FEATURES = ['purchase_amount', 'customer_rating', 'engagement_score',
+                    'purchase_interest_score']
+CATEGORICAL_FEATURES = ['social_media_platform', 'review_sentiment']
+TARGET = 'product_category'
+CUSTOMER_KEY = 'customer_id_new'
+
+# Working-set budget per scoring chunk, sized to stay within a typical L2 cache
+CHUNK_BYTES = 1 << 20
+
+# Table generations kept on disk: the published one and its predecessor, which
+# readers that loaded the previous index may still be opening
+KEEP_GENERATIONS = 2
+
+
+class ProductFeatureEncoder:
+    """
+    Feature encoding used by the product model.
+
+    Mirrors the notebook's feature engineering: numeric columns are
+    standardized and categorical columns one-hot encoded with the first
+    category dropped. Categories are fixed at fit time so that inference
+    batches always produce the same columns.
+    """
+
+    def __init__(self):
+        self.means = None
+        self.scales = None
+        self.categories = {}
+
+    def fit(self, df: pd.DataFrame) -> 'ProductFeatureEncoder':
+        """
+        Learn scaling parameters and categories.
+
+        Args:
+            df: Training data
+
+        Returns:
+            The fitted encoder
+        """
+        numeric = df[NUMERIC_FEATURES].to_numpy(dtype=np.float64)
+        self.means = numeric.mean(axis=0)
+        scales = numeric.std(axis=0)
+        self.scales = np.where(scales > 0, scales, 1.0)
+        self.categories = {col: sorted(df[col].dropna().unique().tolist())
+                           for col in CATEGORICAL_FEATURES}
+        return self
+
+    @property
+    def feature_names(self) -> List[str]:
+        """Names of the encoded feature columns."""
+        names = list(NUMERIC_FEATURES)
+        for col in CATEGORICAL_FEATURES:
+            names.extend(f"{col}_{cat}" for cat in self.categories[col][1:])
+        return names
+
+    def transform(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Encode a batch of rows.
+
+        Args:
+            df: Rows with the numeric and categorical feature columns
+
+        Returns:
+            Encoded feature matrix (n_rows x n_features)
+        """
+        blocks = [(df[NUMERIC_FEATURES].to_numpy(dtype=np.float64) - self.means) / self.scales]
+        for col in CATEGORICAL_FEATURES:
+            categories = self.categories[col]
+            codes = pd.Categorical(df[col], categories=categories).codes
+            # Unknown categories (code -1) and the dropped first category encode as all zeros
+            blocks.append((codes[:, None] == np.arange(1, len(categories))).astype(np.float64))
+        return np.hstack(blocks)
+
+
+def train_product_model(df: pd.DataFrame):
+    """
+    Train the product-category classifier as in the notebook.
+
+    Args:
+        df: Merged dataset
+
+    Returns:
+        Tuple of (fitted encoder, fitted classifier)
+    """
+    from sklearn.ensemble import RandomForestClassifier
+
+    encoder = ProductFeatureEncoder().fit(df)
+    model = RandomForestClassifier(n_estimators=200, random_state=42)
+    model.fit(encoder.transform(df), df[TARGET])
+    return encoder, model
+
+
+def top_k_from_proba(proba: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rank the k most probable classes per row.
+
+    ``np.argpartition`` selects the k best columns in linear time and only
+    those k are then sorted, instead of sorting every class of every row.
+
+    Args:
+        proba: Class probabilities (n_rows x n_classes)
+        k: Number of classes to keep
+
+    Returns:
+        Tuple of (int16 class indices, float32 probabilities), both n_rows x k,
+        ordered by decreasing probability
+    """
+    k = min(k, proba.shape[1])
+    if k < proba.shape[1]:
+        candidates = np.argpartition(-proba, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(k), proba.shape)
+    candidate_probs = np.take_along_axis(proba, candidates, axis=1)
+    order = np.argsort(-candidate_probs, axis=1)
+    indices = np.take_along_axis(candidates, order, axis=1).astype(np.int16)
+    probs = np.take_along_axis(candidate_probs, order, axis=1).astype(np.float32)
+    return indices, probs
+
+
+def top_k_scores(model, X: np.ndarray, k: int = 3,
+                 chunk_size: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score a batch of customers and return their top-k classes.
+
+    Rows are processed in chunks so that each chunk's features and
+    probabilities stay cache-resident, and results are written into
+    preallocated output arrays.
+
+    Args:
+        model: Fitted classifier exposing ``predict_proba`` and ``classes_``
+        X: Encoded feature matrix (n_customers x n_features)
+        k: Number of classes to keep per customer
+        chunk_size: Rows per chunk (default: derived from CHUNK_BYTES)
+
+    Returns:
+        Tuple of (int16 class indices, float32 probabilities), both n_customers x k
+    """
+    n_rows = X.shape[0]
+    n_classes = len(model.classes_)
+    k = min(k, n_classes)
+    if chunk_size is None:
+        row_bytes = X.dtype.itemsize * (X.shape[1] + n_classes)
+        chunk_size = max(256, CHUNK_BYTES // row_bytes)
+
+    indices = np.empty((n_rows, k), dtype=np.int16)
+    probs = np.empty((n_rows, k), dtype=np.float32)
+    for start in range(0, n_rows, chunk_size):
+        stop = min(start + chunk_size, n_rows)
+        indices[start:stop], probs[start:stop] = top_k_from_proba(
+            model.predict_proba(X[start:stop]), k
+        )
+    return indices, probs
+
+
+class RecommendationEngine:
+    """Precomputed top-k recommendation table with a cached serving path."""
+
+    def __init__(self, dataset_path: str = "product_recommendation/merged_dataset.csv",
+                 table_dir: str = "output/recommendation_table",
+                 top_k: int = 3, cache_size: int = 1024, ttl_seconds: float = 60.0):
+        """
+        Initialize the recommendation engine.
+
+        Args:
+            dataset_path: Merged dataset the model and table are built from
+            table_dir: Directory holding the recommendation table
+            top_k: Number of categories stored per customer
+            cache_size: Maximum number of cached recommendations/scores
+            ttl_seconds: Interval between checks of the dataset for changes
+        """
+        self.dataset_path = Path(dataset_path)
+        self.table_dir = Path(table_dir)
+        self.top_k = top_k
+        self.ttl_seconds = ttl_seconds
+        self.cache = LRUCache(maxsize=cache_size)
+
+        self.categories = []
+        self.customer_rows = {}
+        self.topk_indices = None
+        self.topk_probs = None
+        self.encoder = None
+        self.model = None
+        self.generation = 0
+        self.generation_dir = None
+        self.shared_models = {}  # ModelServer manifest entries, see share_model
+
+        self._source_signature = None
+        self._next_check = 0.0
+
+    @contextlib.contextmanager
+    def _build_lock(self):
+        """Hold an exclusive lock on the table directory while (re)building."""
+        self.table_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.table_dir / "build.lock", 'w') as lock_file:
+            try:
+                import fcntl
+            except ImportError:  # Not available on Windows; builds are unserialized
+                yield
+                return
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def build_table(self) -> Path:
+        """
+        Train the product model and score every customer in batch.
+
+        Per-row class probabilities are averaged per customer and the top-k
+        categories stored as int16 indices with float32 probabilities.
+
+        Returns:
+            Path of the table directory
+        """
+        with self._build_lock():
+            return self._build_table()
+
+    def _build_table(self) -> Path:
+        """Build a new table generation and publish it; the caller holds the build lock."""
+        import joblib
+
+        start = time.perf_counter()
+        source_hash = hash_file(self.dataset_path)
+        df = pd.read_csv(self.dataset_path)
+        encoder, model = train_product_model(df)
+
+        proba = model.predict_proba(encoder.transform(df))
+        per_customer = (pd.DataFrame(proba, index=df[CUSTOMER_KEY])
+                        .groupby(level=0, sort=False).mean())
+        scores = per_customer.to_numpy()
+
+        topk_indices, topk_probs = top_k_from_proba(scores, self.top_k)
+        k = topk_indices.shape[1]
+
+        # The generation directory is private until index.json names it
+        generation = f"gen-{time.time_ns()}-{os.getpid()}"
+        generation_dir = self.table_dir / generation
+        generation_dir.mkdir(parents=True)
+        np.save(generation_dir / "topk_indices.npy", topk_indices)
+        np.save(generation_dir / "topk_probs.npy", topk_probs)
+        joblib.dump({'encoder': encoder, 'model': model}, generation_dir / "model.pkl")
+
+        tmp_path = self.table_dir / f"index.{os.getpid()}.tmp.json"
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'source_hash': source_hash,
+                'generation': generation,
+                'top_k': k,
+                'requested_top_k': self.top_k,
+                'categories': [str(c) for c in model.classes_],
+                'customer_ids': per_customer.index.astype(str).tolist(),
+            }, f)
+        os.replace(tmp_path, self.table_dir / "index.json")
+        self._prune_generations()
+
+        logger.info(f"✓ Built recommendation table: {len(per_customer)} customers, "
+                    f"top-{k} in {time.perf_counter() - start:.2f}s")
+        return self.table_dir
+
+    def _prune_generations(self):
+        """Remove table generations older than the last ``KEEP_GENERATIONS``."""
+        generations = sorted(self.table_dir.glob("gen-*"),
+                             key=lambda p: int(p.name.split('-')[1]))
+        # Open memory maps keep their data after the files are unlinked
+        for old in generations[:-KEEP_GENERATIONS]:
+            shutil.rmtree(old, ignore_errors=True)
+
+    def _load_table(self, source_hash: str) -> bool:
+        """
+        Memory-map the table if it was built from the given dataset.
+
+        Args:
+            source_hash: Content hash of the current dataset
+
+        Returns:
+            True if a matching table was loaded
+        """
+        index_path = self.table_dir / "index.json"
+        if not index_path.exists():
+            return False
+
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+        if (index.get('source_hash') != source_hash or index.get('requested_top_k') != self.top_k
+                or 'generation' not in index):
+            return False
+
+        generation_dir = self.table_dir / index['generation']
+        try:
+            topk_indices = np.load(generation_dir / "topk_indices.npy", mmap_mode='r')
+            topk_probs = np.load(generation_dir / "topk_probs.npy", mmap_mode='r')
+        except FileNotFoundError:
+            return False
+
+        self.categories = index['categories']
+        self.customer_rows = {cid: row for row, cid in enumerate(index['customer_ids'])}
+        self.topk_indices = topk_indices
+        self.topk_probs = topk_probs
+        self.generation_dir = generation_dir
+        self.encoder = None
+        self.model = None
+        self.generation += 1
+        return True
+
+    def _ensure_fresh(self):
+        """Rebuild the table and invalidate caches if the dataset has changed."""
+        now = time.monotonic()
+        if self.topk_indices is not None and now < self._next_check:
+            return
+        self._next_check = now + self.ttl_seconds
+
+        stat = self.dataset_path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if self.topk_indices is not None and signature == self._source_signature:
+            return
+
+        source_hash = hash_file(self.dataset_path)
+        if not self._load_table(source_hash):
+            with self._build_lock():
+                # Another process may have built the table while this one waited
+                if not self._load_table(source_hash):
+                    if self.topk_indices is not None:
+                        logger.info(f"⚠ {self.dataset_path} changed; "
+                                    f"rebuilding recommendation table")
+                    self._build_table()
+                    self._load_table(source_hash)
+
+        self._source_signature = signature
+        self.cache.clear()
+
+    def refresh(self) -> int:
+        """
+        Re-check the dataset for changes (at most every ``ttl_seconds``).
+
+        Returns:
+            Table generation, incremented whenever the table is (re)loaded
+        """
+        self._ensure_fresh()
+        return self.generation
+
+    def _payload(self, indices: np.ndarray, probs: np.ndarray) -> Dict:
+        """Render a top-k row as a recommendation dictionary."""
+        categories = [self.categories[i] for i in indices]
+        return {
+            'top_products': categories,
+            'categories': categories,
+            'predicted_purchase_probability': round(float(probs[0]), 4),
+            'scores': {c: round(float(p), 4) for c, p in zip(categories, probs)},
+        }
+
+    def recommend(self, customer_id: str) -> Optional[Dict]:
+        """
+        Look up the precomputed recommendations of a customer.
+
+        Args:
+            customer_id: Customer id as in merged_dataset.csv (e.g. 'A151')
+
+        Returns:
+            Recommendation dictionary or None if the customer is unknown
+        """
+        self._ensure_fresh()
+
+        key = ('customer', customer_id)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        row = self.customer_rows.get(customer_id)
+        if row is None:
+            return None
+
+        payload = self._payload(self.topk_indices[row], self.topk_probs[row])
+        self.cache.put(key, payload)
+        return payload
+
+    def score(self, features: Dict) -> Dict:
+        """
+        Score an ad-hoc customer profile on demand.
+
+        Args:
+            features: Mapping with the numeric and categorical feature values
+
+        Returns:
+            Recommendation dictionary for the profile
+        """
+        self._ensure_fresh()
+
+        key = ('features', tuple(sorted(features.items())))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        self._load_model()
+        indices, probs = top_k_scores(self.model, self.encoder.transform(pd.DataFrame([features])),
+                                      self.top_k)
+        payload = self._payload(indices[0], probs[0])
+        self.cache.put(key, payload)
+        return payload
+
+    def share_model(self, server) -> Dict:
+        """
+        Publish the current table's encoder and classifier to shared memory.
+
+        Args:
+            server: model_server.ModelServer owned by the calling process
+
+        Returns:
+            Manifest entries added, named after the table generation
+        """
+        import joblib
+
+        self._ensure_fresh()
+        return server.publish(self.generation_dir.name,
+                              joblib.load(self.generation_dir / "model.pkl"))
+
+    def use_shared_models(self, manifest: Dict[str, Dict]):
+        """
+        Score with models published by ``share_model`` instead of unpickling them.
+
+        Tables rebuilt after publishing have no shared entries and fall back
+        to their own model.pkl.
+
+        Args:
+            manifest: ModelServer manifest from the parent process
+        """
+        self.shared_models = manifest
+        self.encoder = None
+        self.model = None
+
+    def _load_model(self):
+        """Load the trained encoder and classifier of the current table."""
+        if self.model is None:
+            prefix = f"{self.generation_dir.name}."
+            shared = {name: entry for name, entry in self.shared_models.items()
+                      if name.startswith(prefix)}
+            if shared:
+                from model_server import attach
+                artifacts = {name[len(prefix):]: model for name, model in attach(shared).items()}
+            else:
+                import joblib
+                artifacts = joblib.load(self.generation_dir / "model.pkl")
+            self.encoder, self.model = artifacts['encoder'], artifacts['model']
+
+    def score_batch(self, customers: pd.DataFrame,
+                    chunk_size: Optional[int] = None) -> Dict:
+        """
+        Rank the top-k categories for a whole customer segment.
+
+        Args:
+            customers: One row per customer with the raw feature columns
+            chunk_size: Rows per scoring chunk (default: cache-sized)
+
+        Returns:
+            Dictionary with 'categories', and n_customers x k 'indices'
+            and 'probabilities' arrays
+        """
+        self._ensure_fresh()
+        self._load_model()
+
+        indices, probs = top_k_scores(self.model, self.encoder.transform(customers),
+                                      self.top_k, chunk_size)
+        return {'categories': self.categories, 'indices': indices, 'probabilities': probs}
+
+
+def synthetic_customers(df: pd.DataFrame, n_customers: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Generate customer rows with the same feature distributions as ``df``.
+
+    Args:
+        df: Merged dataset to mimic
+        n_customers: Number of rows to generate
+        seed: Random seed
+
+    Returns:
+        DataFrame with the numeric and categorical feature columns
+    """
+    rng = np.random.default_rng(seed)
+    data = {col: rng.normal(df[col].mean(), df[col].std(), n_customers)
+            for col in NUMERIC_FEATURES}
+    for col in CATEGORICAL_FEATURES:
+        data[col] = rng.choice(df[col].dropna().unique(), n_customers)
+    return pd.DataFrame(data)
+
+
+def benchmark(engine: 'RecommendationEngine', n_customers: int = 1_000_000) -> Dict:
+    """
+    Measure batch top-k scoring throughput on synthetic customers.
+
+    Reports end-to-end scoring (encoding, chunked predict_proba and ranking)
+    and the ranking step alone, comparing argpartition against a full argsort.
+
+    Args:
+        engine: Recommendation engine (its table is built if needed)
+        n_customers: Number of synthetic customers
+
+    Returns:
+        Dictionary of timings and customers/sec
+    """
+    engine._ensure_fresh()
+    engine._load_model()
+    customers = synthetic_customers(pd.read_csv(engine.dataset_path), n_customers)
+
+    start = time.perf_counter()
+    X = engine.encoder.transform(customers)
+    indices, _ = top_k_scores(engine.model, X, engine.top_k)
+    end_to_end = time.perf_counter() - start
+
+    # Ranking alone, for the current category count and a product-sized catalog
+    ranking = {}
+    rng = np.random.default_rng(0)
+    for n_classes in (len(engine.categories), 1000):
+        n_rows = min(n_customers, 50_000_000 // n_classes)
+        proba = rng.dirichlet(np.ones(n_classes), n_rows)
+        start = time.perf_counter()
+        top_k_from_proba(proba, engine.top_k)
+        partition_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        np.argsort(-proba, axis=1)[:, :engine.top_k]
+        argsort_seconds = time.perf_counter() - start
+        ranking[n_classes] = {'rows': n_rows, 'argpartition_seconds': partition_seconds,
+                              'argsort_seconds': argsort_seconds}
+
+    results = {
+        'customers': n_customers,
+        'end_to_end_seconds': end_to_end,
+        'end_to_end_customers_per_sec': n_customers / end_to_end,
+        'ranking': ranking,
+    }
+    logger.info(f"  Scored {n_customers:,} customers in {end_to_end:.2f}s "
+                f"({results['end_to_end_customers_per_sec']:,.0f} customers/s)")
+    for n_classes, r in ranking.items():
+        logger.info(f"  Ranking {r['rows']:,} rows x {n_classes} classes: "
+                    f"argpartition {r['argpartition_seconds']:.3f}s | "
+                    f"full argsort {r['argsort_seconds']:.3f}s")
+    return results
+
+
+def main():
+    """Main execution function."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser(description='Product recommendation engine')
+    parser.add_argument('--dataset', type=str,
+                        default='product_recommendation/merged_dataset.csv',
+                        help='Merged dataset to train and score on')
+    parser.add_argument('--table-dir', type=str, default='output/recommendation_table',
+                        help='Directory of the recommendation table')
+    parser.add_argument('--top-k', type=int, default=3,
+                        help='Number of categories stored per customer')
+    parser.add_argument('--build', action='store_true',
+                        help='(Re)build the recommendation table')
+    parser.add_argument('--customer', type=str,
+                        help='Customer id to look up (e.g. A151)')
+    parser.add_argument('--benchmark', type=int, metavar='N',
+                        help='Benchmark batch scoring on N synthetic customers')
+    args = parser.parse_args()
+
+    engine = RecommendationEngine(args.dataset, args.table_dir, top_k=args.top_k)
+    if args.build:
+        engine.build_table()
+    if args.customer:
+        logger.info(json.dumps(engine.recommend(args.customer), indent=2))
+    if args.benchmark:
+        benchmark(engine, args.benchmark)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Authentication Scenarios
+========================
+Confidence score profiles of the simulated authentication scenarios used by
+``simulate_scenario`` in main.py and by the evaluation and load-testing tools.
+
+Each profile gives the uniform ranges that face and voice confidences are
+drawn from, and whether the attempt comes from a genuine (enrolled) user.
+"""
+
+import random
+from typing import Dict, Optional, Tuple
+
+SCENARIO_PROFILES = {
+    # Legitimate user authentication
+    'success': {'genuine': True, 'face': (0.93, 0.99), 'voice': (0.90, 0.98)},
+    # Unauthorized user attempting access
+    'unauthorized': {'genuine': False, 'face': (0.10, 0.40), 'voice': (0.15, 0.35)},
+    # Attempt to spoof with partial success
+    'spoofing': {'genuine': False, 'face': (0.60, 0.82), 'voice': (0.50, 0.75)},
+}
+
+
+def sample_scores(scenario: str, rng: Optional[random.Random] = None) -> Tuple[float, float]:
+    """
+    Draw (face, voice) confidences for a scenario.
+
+    Args:
+        scenario: Scenario name in SCENARIO_PROFILES
+        rng: Random generator (default: the global ``random`` module)
+
+    Returns:
+        Tuple of (face confidence, voice confidence) rounded to 4 decimals
+    """
+    rng = rng or random
+    profile = SCENARIO_PROFILES[scenario]
+    return (round(rng.uniform(*profile['face']), 4),
+            round(rng.uniform(*profile['voice']), 4))
+
+
+def is_genuine(scenario: str) -> bool:
+    """Whether attempts of a scenario come from an enrolled user."""
+    return SCENARIO_PROFILES[scenario]['genuine']
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """
+    Parse a scenario mix such as 'success=0.7,unauthorized=0.2,spoofing=0.1'.
+
+    Args:
+        mix: Comma-separated scenario=weight pairs
+
+    Returns:
+        Scenario -> probability (normalized to sum to 1)
+    """
+    weights = {}
+    for part in mix.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in SCENARIO_PROFILES:
+            raise ValueError(f"Unknown scenario in mix: {name}")
+        weights[name] = float(weight) if weight else 1.0
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Scenario mix weights must sum to a positive value")
+    return {name: w / total for name, w in weights.items()}
@@ -0,0 +1,415 @@
+"""
+Sessions and Attempt Limiting
+=============================
+Per-identity session tracking and enforcement of ``max_attempts`` /
+``attempt_timeout`` for the authentication system.
+
+``SlidingWindowCounter`` counts events per key over a sliding time window
+using a ring of time buckets: each bucket holds the per-key counts of one
+slice of the window, and a running total per key is kept alongside. Adding
+an event or reading a count is O(1); buckets that slide out of the window
+are subtracted from the totals and dropped (amortized O(1) per recorded
+event), so keys without recent events disappear and memory is bounded by the
+number of keys active within the window.
+
+``SessionTracker`` gives every identity its own session (created on its first
+attempt and expired after ``attempt_timeout`` seconds of inactivity, oldest
+first once ``max_sessions`` is reached) and locks an identity out once it has
+``max_attempts`` failed attempts within the last ``attempt_timeout`` seconds.
+Each admitted attempt is counted as a failure when it begins, in the same
+locked step as the limit check, so concurrent attempts for one identity
+cannot all pass the check before any failure is recorded. A successful
+authentication releases only its own reservation; the identity's failure
+history is cleared once no other attempt for it is still running, so a
+genuine success cannot reopen the limit for concurrent attempts.
+
+Usage:
+    python sessions.py --benchmark 2000000   # Identities in the simulated population
+"""
+
+import os
+import time
+import logging
+import argparse
+import threading
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = 30
+DEFAULT_MAX_SESSIONS = 1_000_000
+
+
+class SlidingWindowCounter:
+    """
+    Per-key event counts over a sliding time window.
+
+    The window is split into ``buckets`` slices of ``window / buckets``
+    seconds, so counts are exact up to one slice of granularity.
+    """
+
+    def __init__(self, window: float, buckets: int = DEFAULT_BUCKETS,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the counter.
+
+        Args:
+            window: Window length in seconds
+            buckets: Number of time slices in the window
+            clock: Time source (seconds)
+        """
+        self.window = float(window)
+        self.buckets = max(1, buckets)
+        self.width = self.window / self.buckets
+        self.clock = clock
+        self._ring = deque()  # [bucket id, {key: count}], oldest first
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def _advance(self, now: float) -> Dict:
+        """Expire buckets that left the window and return the current bucket."""
+        bucket_id = int(now // self.width)
+        ring, totals = self._ring, self._totals
+        while ring and ring[0][0] <= bucket_id - self.buckets:
+            for key, count in ring.popleft()[1].items():
+                remaining = totals[key] - count
+                if remaining:
+                    totals[key] = remaining
+                else:
+                    del totals[key]
+        if not ring or ring[-1][0] != bucket_id:
+            ring.append([bucket_id, {}])
+        return ring[-1][1]
+
+    def add(self, key: Hashable, now: Optional[float] = None) -> int:
+        """
+        Record an event.
+
+        Args:
+            key: Counted key
+            now: Event time (default: the clock)
+
+        Returns:
+            Number of events for the key within the window, including this one
+        """
+        with self._lock:
+            bucket = self._advance(self.clock() if now is None else now)
+            bucket[key] = bucket.get(key, 0) + 1
+            total = self._totals.get(key, 0) + 1
+            self._totals[key] = total
+            return total
+
+    def count(self, key: Hashable, now: Optional[float] = None) -> int:
+        """Number of events for a key within the window."""
+        with self._lock:
+            self._advance(self.clock() if now is None else now)
+            return self._totals.get(key, 0)
+
+    def discard(self, key: Hashable, at: float):
+        """
+        Remove one event of a key.
+
+        Args:
+            key: Counted key
+            at: Time the event was recorded at; nothing is removed if its
+                bucket has already left the window
+        """
+        with self._lock:
+            bucket_id = int(at // self.width)
+            for ring_id, bucket in self._ring:
+                if ring_id != bucket_id:
+                    continue
+                count = bucket.get(key, 0)
+                if not count:
+                    return
+                if count > 1:
+                    bucket[key] = count - 1
+                else:
+                    del bucket[key]
+                remaining = self._totals[key] - 1
+                if remaining:
+                    self._totals[key] = remaining
+                else:
+                    del self._totals[key]
+                return
+
+    def reset(self, key: Hashable):
+        """Forget all events of a key."""
+        with self._lock:
+            if self._totals.pop(key, None) is not None:
+                for _, bucket in self._ring:
+                    bucket.pop(key, None)
+
+    def retry_after(self, key: Hashable, limit: int, now: Optional[float] = None) -> float:
+        """
+        Seconds until the key's count drops below ``limit``.
+
+        Args:
+            key: Counted key
+            limit: Count threshold
+            now: Current time (default: the clock)
+
+        Returns:
+            0 if the count is already below the limit
+        """
+        with self._lock:
+            now = self.clock() if now is None else now
+            self._advance(now)
+            excess = self._totals.get(key, 0) - limit + 1
+            if excess <= 0:
+                return 0.0
+            for bucket_id, bucket in self._ring:
+                excess -= bucket.get(key, 0)
+                if excess <= 0:
+                    return max(0.0, (bucket_id + self.buckets) * self.width - now)
+            return self.window
+
+    def __len__(self) -> int:
+        """Number of keys with events in the window."""
+        return len(self._totals)
+
+
+class Session:
+    """State of one identity's session."""
+
+    __slots__ = ('session_id', 'created', 'last_seen', 'attempts')
+
+    def __init__(self, session_id: str, now: float):
+        self.session_id = session_id
+        self.created = now
+        self.last_seen = now
+        self.attempts = 0
+
+
+class SessionTracker:
+    """Per-identity sessions with a sliding-window failed-attempt limit."""
+
+    def __init__(self, max_attempts: Optional[int] = 3, attempt_timeout: float = 300,
+                 max_sessions: int = DEFAULT_MAX_SESSIONS, buckets: int = DEFAULT_BUCKETS,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the tracker.
+
+        Args:
+            max_attempts: Failed attempts allowed within ``attempt_timeout``
+                (None disables the limit; sessions are still tracked)
+            attempt_timeout: Sliding window and session idle timeout in seconds
+            max_sessions: Maximum number of concurrently tracked sessions
+            buckets: Time slices of the failure window
+            clock: Time source (seconds)
+        """
+        self.max_attempts = max_attempts
+        self.attempt_timeout = attempt_timeout
+        self.max_sessions = max(1, max_sessions)
+        self.clock = clock
+        self.failures = SlidingWindowCounter(attempt_timeout, buckets, clock)
+        self._sessions = OrderedDict()  # identity -> Session, least recently seen first
+        self._reservations = {}  # identity -> deque of reservation times of running attempts
+        self._lock = threading.Lock()
+
+        self.sessions_created = 0
+        self.sessions_expired = 0
+        self.blocked_attempts = 0
+
+    def _expire(self, now: float):
+        """Drop idle sessions and enforce the session bound."""
+        sessions = self._sessions
+        cutoff = now - self.attempt_timeout
+        while sessions:
+            oldest = next(iter(sessions.values()))
+            if oldest.last_seen > cutoff and len(sessions) <= self.max_sessions:
+                break
+            sessions.popitem(last=False)
+            self.sessions_expired += 1
+
+    def begin(self, identity: str) -> Tuple[Session, float]:
+        """
+        Start an attempt for an identity.
+
+        An admitted attempt reserves one failure in the window until
+        ``record`` reports its outcome.
+
+        Args:
+            identity: Claimed user identifier
+
+        Returns:
+            Tuple of (session, seconds until the identity may retry; 0 if allowed)
+        """
+        now = self.clock()
+        with self._lock:
+            self._expire(now)
+            session = self._sessions.get(identity)
+            if session is None:
+                session = Session(os.urandom(8).hex(), now)
+                self._sessions[identity] = session
+                self.sessions_created += 1
+            else:
+                self._sessions.move_to_end(identity)
+            session.last_seen = now
+            session.attempts += 1
+
+            retry_after = 0.0
+            if self.max_attempts is None:
+                pass
+            elif self.failures.count(identity, now) >= self.max_attempts:
+                retry_after = self.failures.retry_after(identity, self.max_attempts, now)
+                self.blocked_attempts += 1
+            else:
+                self.failures.add(identity, now)
+                self._reservations.setdefault(identity, deque()).append(now)
+        return session, retry_after
+
+    def record(self, identity: str, success: bool):
+        """
+        Record the outcome of an admitted attempt.
+
+        A failure was already counted by ``begin``. A success releases this
+        attempt's reservation, and clears the identity's failures if no other
+        attempt for it is still running.
+
+        Args:
+            identity: Claimed user identifier
+            success: Whether the attempt authenticated
+        """
+        with self._lock:
+            pending = self._reservations.get(identity)
+            if not pending:
+                return  # The limit is disabled
+            reserved_at = pending.popleft()
+            if not pending:
+                del self._reservations[identity]
+            if success:
+                if pending:
+                    self.failures.discard(identity, reserved_at)
+                else:
+                    self.failures.reset(identity)
+
+    def stats(self) -> Dict:
+        """
+        Get session and limiter statistics.
+
+        Returns:
+            Dictionary with active sessions, tracked identities and lockout counts
+        """
+        return {
+            'active_sessions': len(self._sessions),
+            'sessions_created': self.sessions_created,
+            'sessions_expired': self.sessions_expired,
+            'identities_with_failures': len(self.failures),
+            'blocked_attempts': self.blocked_attempts,
+            'max_attempts': self.max_attempts,
+            'attempt_timeout': self.attempt_timeout,
+        }
+
+
+def _max_rss_mb() -> float:
+    """Peak resident set size of this process in MB (Linux reports KB)."""
+    try:
+        import resource
+    except ImportError:
+        # Not available on Windows
+        return 0.0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class _SimulatedClock:
+    """Manually advanced clock for benchmarks."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def benchmark(identities: int = 2_000_000, attempts: int = 5_000_000,
+              rate: float = 10_000, failure_rate: float = 0.3,
+              max_attempts: int = 3, attempt_timeout: float = 300,
+              seed: int = 42) -> Dict:
+    """
+    Drive the tracker with a simulated stream of attempts.
+
+    Attempts arrive at ``rate`` per simulated second from identities drawn
+    uniformly from a population of ``identities``, and fail with probability
+    ``failure_rate``.
+
+    Args:
+        identities: Size of the identity population
+        attempts: Number of attempts
+        rate: Simulated attempts per second
+        failure_rate: Probability that an attempt fails
+        max_attempts: Failed attempts allowed per window
+        attempt_timeout: Window and session timeout in seconds
+        seed: Random seed
+
+    Returns:
+        Dictionary with throughput, latency, tracked state and peak RSS growth
+    """
+    rng = np.random.default_rng(seed)
+    names = [f'user{i}' for i in rng.integers(0, identities, attempts)]
+    outcomes = (rng.random(attempts) >= failure_rate).tolist()
+    step = 1.0 / rate
+
+    clock = _SimulatedClock()
+    tracker = SessionTracker(max_attempts, attempt_timeout, max_sessions=identities,
+                             clock=clock)
+    peak_sessions = peak_failures = 0
+    rss_before = _max_rss_mb()
+    start = time.perf_counter()
+    for i, (name, success) in enumerate(zip(names, outcomes)):
+        clock.now += step
+        _, retry_after = tracker.begin(name)
+        if not retry_after:
+            tracker.record(name, success)
+        if not i % 65536:
+            peak_sessions = max(peak_sessions, len(tracker._sessions))
+            peak_failures = max(peak_failures, len(tracker.failures))
+    elapsed = time.perf_counter() - start
+    rss_growth = _max_rss_mb() - rss_before
+
+    results = {
+        'identities': identities,
+        'attempts': attempts,
+        'simulated_seconds': attempts * step,
+        'seconds': elapsed,
+        'attempts_per_sec': attempts / elapsed,
+        'latency_us': 1e6 * elapsed / attempts,
+        'peak_sessions': peak_sessions,
+        'peak_identities_with_failures': peak_failures,
+        'peak_rss_growth_mb': rss_growth,
+        **tracker.stats(),
+    }
+    logger.info(f"  {attempts:,} attempts over {identities:,} identities "
+                f"({attempts * step:,.0f} simulated s at {rate:,.0f}/s)")
+    logger.info(f"  {results['attempts_per_sec']:,.0f} attempts/s "
+                f"({results['latency_us']:.2f} us per begin+record)")
+    logger.info(f"  Peak sessions: {peak_sessions:,} | peak identities with failures: "
+                f"{peak_failures:,} | expired: {tracker.sessions_expired:,}")
+    logger.info(f"  Peak RSS growth: {rss_growth:.1f} MB | "
+                f"blocked attempts: {tracker.blocked_attempts:,}")
+    return results
+
+
+def main():
+    """Main execution function."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser(description='Session tracking and attempt limiting')
+    parser.add_argument('--benchmark', type=int, metavar='N', default=2_000_000,
+                        help='Number of distinct identities in the simulated population')
+    parser.add_argument('--attempts', type=int, default=5_000_000,
+                        help='Number of simulated attempts')
+    parser.add_argument('--rate', type=float, default=10_000,
+                        help='Simulated attempts per second')
+    args = parser.parse_args()
+    benchmark(args.benchmark, args.attempts, args.rate)
+
+
+if __name__ == "__main__":
+    main()
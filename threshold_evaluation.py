@@ -0,0 +1,403 @@
+"""
+Threshold Evaluation
+====================
+Offline FAR/FRR/EER evaluation of the authentication thresholds on labeled
+score logs, without re-running ``authenticate_user``.
+
+Scores are read from:
+- CSV files with ``face_score``, ``voice_score`` and ``label`` columns
+  (label 1 / ``genuine`` for enrolled users, 0 / ``impostor`` otherwise)
+- authentication reports written by main.py, labeled through each attempt's
+  ``scenario`` (``success`` is genuine, ``unauthorized`` and ``spoofing`` are
+  impostors); unlabeled attempts and attempts that skipped voice are ignored
+- or simulated from the scenario profiles in scenarios.py
+
+For every threshold on a grid (default step 0.01) the false accept rate
+(impostors accepted) and false reject rate (genuine users rejected) are
+computed for the face, voice and fused scores from sorted scores with
+``searchsorted``. The joint sweep over every (face, voice, combined)
+threshold combination bins each attempt once on the grid and takes reverse
+cumulative sums of the 3-D histogram, so all combinations are evaluated in a
+few array passes. The thresholds meeting ``performance_targets``
+(``false_positive_rate`` / ``false_negative_rate``) with the lowest total
+error are reported alongside the configured operating point.
+
+The fused score uses the configured fusion strategy; sequential early
+decisions are not modeled (every attempt is assumed to run both modalities).
+
+Usage:
+    python threshold_evaluation.py --report output/authentication_report_*.json
+    python threshold_evaluation.py --scores scores.csv --step 0.005
+    python threshold_evaluation.py --simulate 100000 --plot
+"""
+
+import json
+import logging
+import argparse
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from fusion import FusionEngine
+from scenarios import SCENARIO_PROFILES, is_genuine, parse_mix
+
+logger = logging.getLogger(__name__)
+
+GENUINE_LABELS = {'1', 'genuine', 'true', 'success'}
+MODALITIES = ('face', 'voice', 'combined')
+
+
+def load_score_csv(path: str) -> pd.DataFrame:
+    """
+    Load a labeled score log.
+
+    Args:
+        path: CSV with face_score, voice_score and label columns
+
+    Returns:
+        DataFrame with face_score, voice_score and boolean genuine columns
+    """
+    df = pd.read_csv(path)
+    missing = {'face_score', 'voice_score', 'label'} - set(df.columns)
+    if missing:
+        raise ValueError(f"{path}: missing columns {sorted(missing)}")
+    genuine = df['label'].astype(str).str.strip().str.lower().isin(GENUINE_LABELS)
+    return pd.DataFrame({'face_score': df['face_score'].astype(float),
+                         'voice_score': df['voice_score'].astype(float),
+                         'genuine': genuine})
+
+
+def load_report(path: str) -> pd.DataFrame:
+    """
+    Extract labeled scores from an authentication report.
+
+    Args:
+        path: Report JSON written by ``AuthenticationSystem.save_report``
+
+    Returns:
+        DataFrame with face_score, voice_score and boolean genuine columns
+    """
+    with open(path, 'r') as f:
+        report = json.load(f)
+
+    rows = []
+    skipped = 0
+    for attempt in report.get('attempts', []):
+        scenario = attempt.get('scenario')
+        voice = attempt['voice_verification']
+        if scenario not in SCENARIO_PROFILES or voice.get('confidence') is None:
+            skipped += 1
+            continue
+        rows.append((attempt['face_verification']['confidence'], voice['confidence'],
+                     is_genuine(scenario)))
+    if skipped:
+        logger.warning(f"{path}: ignored {skipped} unlabeled or voice-skipped attempts")
+    return pd.DataFrame(rows, columns=['face_score', 'voice_score', 'genuine'])
+
+
+def simulate_scores(n: int, mix: str = 'success=0.5,unauthorized=0.25,spoofing=0.25',
+                    seed: int = 42) -> pd.DataFrame:
+    """
+    Draw labeled scores from the scenario profiles.
+
+    Args:
+        n: Number of attempts
+        mix: Scenario mix (see ``scenarios.parse_mix``)
+        seed: Random seed
+
+    Returns:
+        DataFrame with face_score, voice_score and boolean genuine columns
+    """
+    rng = np.random.default_rng(seed)
+    weights = parse_mix(mix)
+    names = list(weights)
+    picks = rng.choice(len(names), size=n, p=[weights[name] for name in names])
+
+    face = np.empty(n)
+    voice = np.empty(n)
+    genuine = np.empty(n, dtype=bool)
+    for i, name in enumerate(names):
+        mask = picks == i
+        profile = SCENARIO_PROFILES[name]
+        face[mask] = rng.uniform(*profile['face'], size=mask.sum())
+        voice[mask] = rng.uniform(*profile['voice'], size=mask.sum())
+        genuine[mask] = profile['genuine']
+    return pd.DataFrame({'face_score': face.round(4), 'voice_score': voice.round(4),
+                         'genuine': genuine})
+
+
+def threshold_grid(step: float) -> np.ndarray:
+    """Thresholds from 0 to 1 (inclusive) in increments of ``step``."""
+    n = int(round(1 / step))
+    return np.round(np.linspace(0.0, 1.0, n + 1), 6)
+
+
+def error_curves(scores: np.ndarray, genuine: np.ndarray,
+                 thresholds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    FAR and FRR of ``score >= threshold`` acceptance at every threshold.
+
+    Args:
+        scores: Scores of all attempts
+        genuine: Boolean mask of genuine attempts
+        thresholds: Sorted thresholds
+
+    Returns:
+        Tuple of (FAR, FRR) arrays aligned with ``thresholds``
+    """
+    impostor_scores = np.sort(scores[~genuine])
+    genuine_scores = np.sort(scores[genuine])
+    # Number of scores strictly below each threshold (rejected)
+    impostor_rejected = np.searchsorted(impostor_scores, thresholds, side='left')
+    genuine_rejected = np.searchsorted(genuine_scores, thresholds, side='left')
+    far = 1 - impostor_rejected / max(len(impostor_scores), 1)
+    frr = genuine_rejected / max(len(genuine_scores), 1)
+    return far, frr
+
+
+def equal_error_rate(thresholds: np.ndarray, far: np.ndarray,
+                     frr: np.ndarray) -> Dict:
+    """
+    Locate the equal error rate on a sampled curve.
+
+    Returns:
+        Dictionary with the EER and the threshold where |FAR - FRR| is smallest
+    """
+    i = int(np.argmin(np.abs(far - frr)))
+    return {'eer': float((far[i] + frr[i]) / 2), 'threshold': float(thresholds[i])}
+
+
+def joint_accept_counts(face: np.ndarray, voice: np.ndarray, combined: np.ndarray,
+                        thresholds: np.ndarray) -> np.ndarray:
+    """
+    Count accepted attempts for every (face, voice, combined) threshold triple.
+
+    An attempt is accepted at grid indices (i, j, k) when all three scores are
+    at or above the corresponding thresholds, i.e. when its grid bin indices
+    are all >= (i, j, k): the reverse cumulative sum of the bin histogram.
+
+    Args:
+        face: Face scores
+        voice: Voice scores
+        combined: Fused scores
+        thresholds: Sorted threshold grid of length G
+
+    Returns:
+        G x G x G int64 array of accepted attempts
+    """
+    size = len(thresholds)
+    # Highest grid index whose threshold the score reaches (-1: below all)
+    bins = [np.searchsorted(thresholds, s, side='right') - 1 for s in (face, voice, combined)]
+    valid = (bins[0] >= 0) & (bins[1] >= 0) & (bins[2] >= 0)
+    flat = np.ravel_multi_index([b[valid] for b in bins], (size, size, size))
+
+    counts = np.bincount(flat, minlength=size ** 3).reshape(size, size, size)
+    for axis in range(3):
+        counts = np.flip(np.cumsum(np.flip(counts, axis), axis=axis), axis)
+    return counts
+
+
+class ThresholdEvaluator:
+    """Sweeps authentication thresholds over a labeled score log."""
+
+    def __init__(self, config: Dict, step: float = 0.01):
+        """
+        Initialize the evaluator.
+
+        Args:
+            config: System configuration (thresholds, fusion, performance_targets)
+            step: Threshold grid step
+        """
+        self.config = config
+        self.fusion = FusionEngine(config)
+        self.thresholds = threshold_grid(step)
+        targets = config.get('performance_targets', {})
+        self.max_far = targets.get('false_positive_rate', 0.02)
+        self.max_frr = targets.get('false_negative_rate', 0.05)
+
+    def _operating_point(self, face, voice, combined, genuine,
+                         thresholds: Tuple[float, float, float]) -> Dict:
+        """FAR/FRR of the decision rule at one threshold triple."""
+        face_t, voice_t, combined_t = thresholds
+        accepted = combined >= combined_t
+        if self.fusion.params['require_all_modalities']:
+            accepted &= (face >= face_t) & (voice >= voice_t)
+        return {
+            'face_threshold': face_t,
+            'voice_threshold': voice_t,
+            'combined_threshold': combined_t,
+            'far': float(accepted[~genuine].mean()) if (~genuine).any() else 0.0,
+            'frr': float((~accepted[genuine]).mean()) if genuine.any() else 0.0,
+        }
+
+    def evaluate(self, scores: pd.DataFrame) -> Tuple[pd.DataFrame, Dict]:
+        """
+        Evaluate a labeled score log.
+
+        Args:
+            scores: DataFrame with face_score, voice_score and genuine columns
+
+        Returns:
+            Tuple of (per-threshold curves, summary dictionary)
+        """
+        face = scores['face_score'].to_numpy(dtype=np.float64)
+        voice = scores['voice_score'].to_numpy(dtype=np.float64)
+        genuine = scores['genuine'].to_numpy(dtype=bool)
+        combined = np.asarray(self.fusion.strategy.fuse(face, voice), dtype=np.float64)
+        n_genuine, n_impostor = int(genuine.sum()), int((~genuine).sum())
+        if not n_genuine or not n_impostor:
+            raise ValueError("Score log needs both genuine and impostor attempts")
+
+        grid = self.thresholds
+        curves = {'threshold': grid}
+        eer = {}
+        for name, values in zip(MODALITIES, (face, voice, combined)):
+            far, frr = error_curves(values, genuine, grid)
+            curves[f'{name}_far'] = far
+            curves[f'{name}_frr'] = frr
+            eer[name] = equal_error_rate(grid, far, frr)
+
+        # Joint sweep: FAR/FRR for every threshold combination of the decision rule
+        if self.fusion.params['require_all_modalities']:
+            impostor = joint_accept_counts(face[~genuine], voice[~genuine],
+                                           combined[~genuine], grid)
+            accepted = joint_accept_counts(face[genuine], voice[genuine],
+                                           combined[genuine], grid)
+        else:
+            # Only the fused score decides; face/voice thresholds are free
+            impostor = (curves['combined_far'] * n_impostor)[None, None, :]
+            accepted = ((1 - curves['combined_frr']) * n_genuine)[None, None, :]
+        far = impostor / n_impostor
+        frr = 1 - accepted / n_genuine
+
+        feasible = (far <= self.max_far) & (frr <= self.max_frr)
+        recommended = None
+        if feasible.any():
+            # Lowest total error; ties go to the combination closest to the
+            # configured thresholds so the suggested change is minimal
+            total = np.where(feasible, far + frr, np.inf)
+            best = np.isclose(total, total.min())
+            current_index = [np.searchsorted(grid, t) for t in
+                             (self.fusion.face_threshold, self.fusion.voice_threshold,
+                              self.fusion.combined_threshold)]
+            candidates = np.argwhere(best)
+            distance = np.abs(candidates - current_index).sum(axis=1)
+            i, j, k = candidates[np.argmin(distance)]
+            if not self.fusion.params['require_all_modalities']:
+                i, j = (int(np.searchsorted(grid, self.fusion.face_threshold)),
+                        int(np.searchsorted(grid, self.fusion.voice_threshold)))
+            recommended = self._operating_point(face, voice, combined, genuine,
+                                                (float(grid[i]), float(grid[j]),
+                                                 float(grid[k])))
+
+        current = self._operating_point(face, voice, combined, genuine,
+                                        (self.fusion.face_threshold,
+                                         self.fusion.voice_threshold,
+                                         self.fusion.combined_threshold))
+        current['meets_targets'] = bool(current['far'] <= self.max_far
+                                        and current['frr'] <= self.max_frr)
+
+        summary = {
+            'attempts': len(scores),
+            'genuine_attempts': n_genuine,
+            'impostor_attempts': n_impostor,
+            'fusion_strategy': self.fusion.strategy.name,
+            'grid_step': float(grid[1] - grid[0]),
+            'targets': {'max_far': self.max_far, 'max_frr': self.max_frr},
+            'eer': eer,
+            'current': current,
+            'combinations_evaluated': int(far.size),
+            'combinations_meeting_targets': int(feasible.sum()),
+            'recommended': recommended,
+        }
+        return pd.DataFrame(curves), summary
+
+
+def plot_curves(curves: pd.DataFrame, path: Path):
+    """Save FAR/FRR curves of each modality to an image."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, axes = plt.subplots(1, len(MODALITIES), figsize=(15, 4), sharey=True)
+    for ax, name in zip(axes, MODALITIES):
+        ax.plot(curves['threshold'], curves[f'{name}_far'], label='FAR')
+        ax.plot(curves['threshold'], curves[f'{name}_frr'], label='FRR')
+        ax.set_title(name.capitalize())
+        ax.set_xlabel('Threshold')
+        ax.legend()
+    axes[0].set_ylabel('Error rate')
+    fig.tight_layout()
+    fig.savefig(path, dpi=100)
+    plt.close(fig)
+
+
+def main():
+    """Main execution function."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser(description='Evaluate authentication thresholds')
+    parser.add_argument('--scores', type=str, nargs='*', default=[],
+                        help='Labeled score CSVs (face_score, voice_score, label)')
+    parser.add_argument('--report', type=str, nargs='*', default=[],
+                        help='Authentication report JSONs written by main.py')
+    parser.add_argument('--simulate', type=int, metavar='N',
+                        help='Simulate N labeled attempts from the scenario profiles')
+    parser.add_argument('--mix', type=str, default='success=0.5,unauthorized=0.25,spoofing=0.25',
+                        help='Scenario mix for --simulate')
+    parser.add_argument('--config', type=str, default='config.json',
+                        help='Configuration file (thresholds, fusion, targets)')
+    parser.add_argument('--step', type=float, default=0.01,
+                        help='Threshold grid step')
+    parser.add_argument('--output-dir', type=str, default='output/threshold_evaluation',
+                        help='Directory for curves and summary')
+    parser.add_argument('--plot', action='store_true',
+                        help='Also save FAR/FRR plots')
+    args = parser.parse_args()
+
+    frames: List[pd.DataFrame] = [load_score_csv(p) for p in args.scores]
+    frames += [load_report(p) for p in args.report]
+    if args.simulate:
+        frames.append(simulate_scores(args.simulate, args.mix))
+    if not frames:
+        parser.error("provide --scores, --report or --simulate")
+    scores = pd.concat(frames, ignore_index=True)
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+
+    evaluator = ThresholdEvaluator(config, step=args.step)
+    curves, summary = evaluator.evaluate(scores)
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    curves.to_csv(output_dir / 'threshold_curves.csv', index=False)
+    with open(output_dir / 'threshold_summary.json', 'w') as f:
+        json.dump(summary, f, indent=2)
+    if args.plot:
+        plot_curves(curves, output_dir / 'threshold_curves.png')
+
+    logger.info(f"Attempts: {summary['attempts']} ({summary['genuine_attempts']} genuine, "
+                f"{summary['impostor_attempts']} impostor)")
+    for name, point in summary['eer'].items():
+        logger.info(f"EER {name}: {point['eer']:.2%} at threshold {point['threshold']:.2f}")
+    current = summary['current']
+    logger.info(f"Current thresholds: FAR {current['far']:.2%}, FRR {current['frr']:.2%} "
+                f"({'meets' if current['meets_targets'] else 'misses'} targets)")
+    recommended = summary['recommended']
+    if recommended:
+        logger.info(f"Recommended: face {recommended['face_threshold']:.2f}, "
+                    f"voice {recommended['voice_threshold']:.2f}, "
+                    f"combined {recommended['combined_threshold']:.2f} "
+                    f"(FAR {recommended['far']:.2%}, FRR {recommended['frr']:.2%})")
+    else:
+        logger.warning("No threshold combination meets the performance targets")
+    logger.info(f"[DONE] Results saved to {output_dir}")
+
+
+if __name__ == "__main__":
+    main()